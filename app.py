@@ -3,15 +3,37 @@ Aplicación Streamlit para Generación de Actas de Reunión v3.0
 Transcripción automática + Notas manuales + Análisis con IA + Documento Word
 """
 import streamlit as st
-import os
-from datetime import datetime
 import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 
 # Importar utilidades
-from utils.transcription import transcribe_audio, get_transcription_with_timestamps
-from utils.analysis import analyze_with_phi4
-from utils.document_gen import generate_word_document, save_document
+from utils.transcription import get_transcription_with_timestamps, format_timestamp
+from utils.segments import SegmentStore, splice_segments
+from utils.compression import compress_transcript
+from utils.analysis import MAX_NEW_TOKENS
+from utils.document_gen import (
+    generate_word_document, render_document_bytes, iter_annex_paragraphs, acta_filename, TEMPLATE_PATH
+)
+from utils.attendees import parse_attendee_csv, parse_attendee_text, merge_attendees
+from utils.artifacts import artifact_key, get_artifact, put_artifact, new_store
+from utils.audio_io import spool_upload, probe_duration, remove_file
+from utils.audio_store import SPAN_LEAD_SECONDS, SPAN_SECONDS, get_archived_audio, ingest_audio, read_span, save_segments
+from utils.workers import run_job
+from utils.calibration import (
+    AUTO_MODEL, WHISPER_MODELS, TARGET_MINUTES, WHISPER_SHARE, select_whisper_model, select_max_new_tokens
+)
+from utils.refinement import (
+    DRAFT_MODEL, REFINE_MODEL, plan_windows, start_refinement, get_refinement, cancel_refinement,
+    agenda_texts, changed_agenda_items
+)
+from utils.quality import REASONS, flag_segments, larger_model, redecode_flagged
+from utils.progress import ProgressTracker, throttled
+from utils.checkpoints import (
+    new_meeting_id, save_checkpoint, load_checkpoint, list_meetings, describe_meeting
+)
 
 
 # Configuración de página
@@ -26,6 +48,8 @@ st.set_page_config(
 def main():
     """Función principal de la aplicación"""
     
+    init_session_state()
+    
     # Título principal
     st.title("📝 Generador de Actas de Reunión")
     st.markdown("### Con o sin audio • Análisis con IA • Documento Word profesional")
@@ -58,11 +82,23 @@ def main():
         st.header("⚙️ Configuración")
         whisper_model = st.selectbox(
             "Modelo Whisper",
-            ["tiny", "base", "small", "medium"],
-            index=1,
-            help="Solo se usa si subes audio"
+            [AUTO_MODEL] + WHISPER_MODELS,
+            index=2,
+            help="Solo se usa si subes audio. 'automático' elige el modelo más grande que cumple el plazo"
         )
         
+        target_seconds = None
+        if whisper_model == AUTO_MODEL:
+            target_minutes = st.number_input(
+                "Plazo para tener el acta (minutos)",
+                min_value=1.0,
+                value=TARGET_MINUTES,
+                step=5.0,
+                help="Se mide la velocidad de cada modelo en esta máquina (una vez) y se elige "
+                     "el modelo de transcripción y la extensión del análisis que caben en el plazo"
+            )
+            target_seconds = target_minutes * 60
+        
         include_transcription = st.checkbox(
             "Incluir transcripción/notas en el acta",
             value=False,
@@ -74,6 +110,45 @@ def main():
             value=False,
             help="Muestra tiempos en la transcripción"
         )
+        
+        progressive = st.checkbox(
+            "Transcripción progresiva",
+            value=False,
+            help=f"Primero un borrador rápido ('{DRAFT_MODEL}') para empezar a revisar y analizar; "
+                 "el modelo elegido lo refina por tramos en segundo plano"
+        )
+        
+        compress = st.checkbox(
+            "Limpiar transcripción antes de analizar",
+            value=True,
+            help="Quita muletillas y repeticiones para acortar el análisis (solo audio)"
+        )
+        compression_config = None
+        if compress:
+            with st.expander("Opciones de limpieza"):
+                compression_config = {
+                    "remove_fillers": st.checkbox("Quitar muletillas (eh, o sea, este...)", value=True),
+                    "collapse_repetitions": st.checkbox("Colapsar palabras repetidas", value=True),
+                    "remove_loops": st.checkbox("Quitar bucles de Whisper", value=True)
+                }
+        
+        st.markdown("---")
+        
+        # Reanudar una reunión guardada
+        st.header("🔄 Reanudar reunión")
+        meetings = list_meetings()
+        if meetings:
+            selected = st.selectbox(
+                "Reuniones guardadas",
+                meetings,
+                format_func=describe_meeting,
+                help="Restaura el último estado guardado sin volver a transcribir ni analizar"
+            )
+            if st.button("🔄 Reanudar", use_container_width=True):
+                restore_meeting(selected["meeting_id"])
+                st.rerun()
+        else:
+            st.caption("No hay reuniones guardadas")
     
     # Área principal - 4 pestañas
     tab1, tab2, tab3, tab4 = st.tabs([
@@ -90,124 +165,63 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
-            meeting_number = st.text_input(
+            st.text_input(
                 "Número de Acta *",
-                placeholder="Ej: 10"
+                placeholder="Ej: 10",
+                key="info_numero_acta"
             )
             
-            committee_name = st.text_input(
+            st.text_input(
                 "Nombre del Comité *",
-                placeholder="Ej: JEIF - Junta de Evaluación"
+                placeholder="Ej: JEIF - Junta de Evaluación",
+                key="info_comite"
             )
             
-            area_convoca = st.text_input(
+            st.text_input(
                 "Área que Convoca *",
-                placeholder="Ej: Vicerrectoría de Investigación"
+                placeholder="Ej: Vicerrectoría de Investigación",
+                key="info_area_convoca"
             )
             
-            meeting_date = st.date_input(
+            st.date_input(
                 "Fecha de Realización *",
-                value=datetime.now()
+                key="info_fecha"
             )
         
         with col2:
-            start_time = st.time_input(
+            st.time_input(
                 "Hora de Inicio *",
-                value=datetime.now().replace(hour=14, minute=0)
+                key="info_hora_inicio"
             )
             
-            end_time = st.time_input(
+            st.time_input(
                 "Hora de Finalización *",
-                value=datetime.now().replace(hour=16, minute=0)
+                key="info_hora_fin"
             )
             
-            meeting_place = st.text_input(
+            st.text_input(
                 "Lugar *",
-                placeholder="Sala de Juntas / Virtual - Teams"
+                placeholder="Sala de Juntas / Virtual - Teams",
+                key="info_lugar"
             )
             
-            notetaker = st.text_input(
+            st.text_input(
                 "Notas Tomadas Por *",
-                placeholder="Ej: María García - Secretaria"
+                placeholder="Ej: María García - Secretaria",
+                key="info_notas_por"
             )
         
         st.markdown("---")
         
-        # Asistentes
-        st.subheader("👥 Asistentes")
-        st.info("💡 Agrega los asistentes uno por uno")
-        
-        if 'asistentes' not in st.session_state:
-            st.session_state.asistentes = []
-        
-        col_asist1, col_asist2, col_asist3 = st.columns([2, 2, 1])
-        
-        with col_asist1:
-            asistente_nombre = st.text_input(
-                "Nombre Completo",
-                key="input_nombre",
-                placeholder="Dr. Juan Pérez González"
-            )
-        
-        with col_asist2:
-            asistente_cargo = st.text_input(
-                "Cargo/Rol",
-                key="input_cargo",
-                placeholder="Director de Departamento"
-            )
-        
-        with col_asist3:
-            st.write("")
-            st.write("")
-            if st.button("➕ Agregar", type="primary"):
-                if asistente_nombre and asistente_cargo:
-                    st.session_state.asistentes.append({
-                        "nombre": asistente_nombre,
-                        "cargo": asistente_cargo
-                    })
-                    st.success(f"✅ Agregado")
-                    st.rerun()
-                else:
-                    st.warning("⚠️ Completa ambos campos")
-        
-        # Mostrar lista
-        if st.session_state.asistentes:
-            st.markdown("##### 📋 Lista de Asistentes:")
-            for idx, asist in enumerate(st.session_state.asistentes):
-                c1, c2, c3 = st.columns([2, 2, 1])
-                with c1:
-                    st.text(asist["nombre"])
-                with c2:
-                    st.text(asist["cargo"])
-                with c3:
-                    if st.button("🗑️", key=f"del_{idx}"):
-                        st.session_state.asistentes.pop(idx)
-                        st.rerun()
+        # Asistentes y agenda se editan en fragmentos: cada cambio re-ejecuta
+        # solo su bloque, no la app completa
+        attendee_editor()
         
         st.markdown("---")
         
-        # Agenda
-        st.subheader("📝 Agenda")
-        agenda = st.text_area(
-            "Agenda de la reunión (un punto por línea) *",
-            placeholder="1. Aprobación del acta anterior\n2. Presentación de proyectos\n3. Discusión presupuesto\n4. Varios",
-            height=120
-        )
+        agenda_editor()
         
-        # Guardar en session state
-        st.session_state.meeting_info = {
-            "numero_acta": meeting_number,
-            "comite": committee_name,
-            "area_convoca": area_convoca,
-            "fecha": meeting_date.strftime("%d/%m/%Y"),
-            "hora_inicio": start_time.strftime("%H:%M"),
-            "hora_fin": end_time.strftime("%H:%M"),
-            "lugar": meeting_place,
-            "notas_por": notetaker,
-            "asistentes": st.session_state.asistentes,
-            "agenda": agenda
-        }
-        st.session_state.manual_notes = agenda
+        update_meeting_info()
     
     # ==================== TAB 2: CONTENIDO ====================
     with tab2:
@@ -224,25 +238,52 @@ def main():
         
         if method == "🎤 Transcribir audio":
             st.info("""
-            📌 **Formatos**: MP3, WAV, M4A, OGG  
+            📌 **Formatos**: MP3, WAV, M4A, OGG (máx. 200 MB; grabaciones largas en MP3/M4A)  
             💡 **Tips**: Buena calidad, sin ruido, volumen adecuado
             """)
             
+            # La clave cambia al restaurar una reunión: el archivo que quedara en
+            # el selector pertenece a la reunión anterior y no debe reemplazar
+            # la grabación restaurada
             uploaded_file = st.file_uploader(
                 "Archivo de audio",
-                type=["mp3", "wav", "m4a", "ogg"]
+                type=["mp3", "wav", "m4a", "ogg"],
+                key=f"audio_file_{st.session_state.get('uploader_generation', 0)}"
             )
             
             if uploaded_file:
+                audio = prepare_uploaded_audio(uploaded_file)
                 st.success(f"✅ {uploaded_file.name}")
-                st.audio(uploaded_file)
+                if audio["preview"]:
+                    st.audio(audio["preview"], format="audio/ogg")
+                    archive = audio["archive"]
+                    if archive.get("original_bytes"):
+                        st.caption(
+                            f"📦 Archivado: {archive['bytes'] / 1e6:.1f} MB "
+                            f"(original {archive['original_bytes'] / 1e6:.1f} MB, "
+                            f"{archive['original_bytes'] / max(archive['bytes'], 1):.0f}× menos)"
+                        )
+                else:
+                    st.caption("🔇 Vista previa no disponible (requiere ffmpeg)")
                 
                 col1, col2, col3 = st.columns([1, 2, 1])
                 with col2:
                     if st.button("🚀 Transcribir", type="primary", use_container_width=True):
-                        transcribe_audio_file(uploaded_file, whisper_model, include_timestamps)
+                        transcribe_audio_file(audio["path"], whisper_model, include_timestamps, target_seconds, progressive)
             else:
+                release_uploaded_audio()
                 st.warning("⚠️ Sube un archivo de audio")
+            
+            refining = False
+            if st.session_state.get("refinement"):
+                if st.session_state.refinement.get("finished"):
+                    show_refinement_status()
+                else:
+                    refinement_panel()
+                    refining = True
+            
+            if st.session_state.get("segments") and not st.session_state.get("using_manual_notes") and not refining:
+                show_quality_review(include_timestamps)
         
         else:  # Notas manuales
             st.info("""
@@ -255,46 +296,7 @@ def main():
             - Responsables y fechas límite
             """)
             
-            notas_manuales = st.text_area(
-                "Notas de la reunión *",
-                placeholder="""Ejemplo:
-
-**Punto 1 - Aprobación del acta anterior:**
-Se presentó el acta No. 9. El Dr. Pérez solicitó corregir la fecha del proyecto X. Se aprobó por unanimidad con la corrección.
-
-**Punto 2 - Presentación de proyectos:**
-La Dra. García presentó "Sistema de IA para análisis de datos". Presupuesto: $50,000. 
-
-Discusión sobre:
-- Viabilidad técnica
-- Cronograma 
-- Recursos necesarios
-
-Decisión: Aprobar condicionado a cronograma detallado en próxima reunión.
-
-**Punto 3 - Tareas asignadas:**
-- Dr. Pérez: Revisar propuesta técnica → 15/03/2024
-- Dra. García: Cronograma detallado → 10/03/2024
-- Ing. Martínez: Evaluar costos → 12/03/2024
-
-Próxima reunión: 20/03/2024
-""",
-                height=450,
-                key="notas_text"
-            )
-            
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                if st.button("✅ Usar estas notas", type="primary", use_container_width=True):
-                    if notas_manuales and len(notas_manuales.strip()) >= 50:
-                        st.session_state.transcription = notas_manuales
-                        st.session_state.transcription_display = notas_manuales
-                        st.session_state.using_manual_notes = True
-                        st.success("✅ ¡Notas guardadas!")
-                        st.balloons()
-                        st.info("👉 Continúa en 'Análisis'")
-                    else:
-                        st.error("⚠️ Escribe al menos 50 caracteres")
+            manual_notes_editor()
     
     # ==================== TAB 3: ANÁLISIS ====================
     with tab3:
@@ -310,6 +312,8 @@ Próxima reunión: 20/03/2024
             
             # Mostrar contenido
             with st.expander("📄 Ver Contenido Completo", expanded=False):
+                if st.session_state.get("refinement"):
+                    show_refinement_legend(st.session_state.refinement)
                 st.text_area(
                     "Contenido",
                     value=st.session_state.transcription_display,
@@ -323,9 +327,24 @@ Próxima reunión: 20/03/2024
             col1, col2, col3 = st.columns([1, 2, 1])
             with col2:
                 if st.button("🔍 Analizar con Phi-4", type="primary", use_container_width=True):
-                    analyze_meeting()
+                    analyze_meeting(compression_config, target_seconds)
             
             # Mostrar resultado
+            stats = st.session_state.get("analysis_stats")
+            if stats and 'analysis' in st.session_state:
+                caption = f"⏱️ Análisis en {stats['seconds']:.0f} s"
+                if stats.get("tokens_before"):
+                    caption = (
+                        f"✂️ Limpieza: {stats['tokens_before']:,} → {stats['tokens_after']:,} tokens "
+                        f"(-{stats['reduction']:.0%}) • " + caption
+                    )
+                if stats.get("max_new_tokens"):
+                    caption += f" • 🎯 hasta {stats['max_new_tokens']:,} tokens por el plazo"
+                st.caption(caption)
+            
+            if st.session_state.get("analysis_basis"):
+                offer_reanalysis(compression_config, target_seconds)
+            
             if 'analysis' in st.session_state and st.session_state.analysis:
                 display_analysis(st.session_state.analysis)
         
@@ -366,34 +385,489 @@ Próxima reunión: 20/03/2024
             col1, col2, col3 = st.columns([1, 2, 1])
             with col2:
                 if st.button("📥 Generar Acta", type="primary", use_container_width=True):
-                    generate_acta(include_transcription)
+                    generate_acta(include_transcription, include_timestamps)
         
         else:
             st.info("ℹ️ Primero completa el análisis en la pestaña anterior")
 
 
-def transcribe_audio_file(uploaded_file, model_size, show_timestamps):
-    """Transcribe el archivo de audio"""
+def init_session_state():
+    """Inicializa el estado de la sesión y los valores por defecto de los campos"""
     
-    with st.spinner("🎤 Transcribiendo... Puede tardar unos minutos"):
-        try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp:
-                tmp.write(uploaded_file.getvalue())
-                tmp_path = tmp.name
+    if 'meeting_id' not in st.session_state:
+        st.session_state.meeting_id = new_meeting_id()
+    
+    if 'asistentes' not in st.session_state:
+        st.session_state.asistentes = []
+    
+    # Valores por defecto de los campos con key (restaurables desde checkpoint)
+    now = datetime.now()
+    st.session_state.setdefault("info_fecha", now.date())
+    st.session_state.setdefault("info_hora_inicio", now.replace(hour=14, minute=0).time())
+    st.session_state.setdefault("info_hora_fin", now.replace(hour=16, minute=0).time())
+
+
+@st.fragment
+def attendee_editor():
+    """
+    Editor de la lista de asistentes
+    
+    Agregar, quitar o importar asistentes re-ejecuta solo este fragmento;
+    meeting_info se actualiza aquí mismo porque main() no vuelve a correr.
+    """
+    
+    st.subheader("👥 Asistentes")
+    st.info("💡 Agrega los asistentes uno por uno o impórtalos en bloque")
+    
+    col_asist1, col_asist2, col_asist3 = st.columns([2, 2, 1])
+    
+    with col_asist1:
+        asistente_nombre = st.text_input(
+            "Nombre Completo",
+            key="input_nombre",
+            placeholder="Dr. Juan Pérez González"
+        )
+    
+    with col_asist2:
+        asistente_cargo = st.text_input(
+            "Cargo/Rol",
+            key="input_cargo",
+            placeholder="Director de Departamento"
+        )
+    
+    with col_asist3:
+        st.write("")
+        st.write("")
+        if st.button("➕ Agregar", type="primary"):
+            if asistente_nombre and asistente_cargo:
+                st.session_state.asistentes.append({
+                    "nombre": asistente_nombre,
+                    "cargo": asistente_cargo
+                })
+                update_meeting_info()
+                st.success(f"✅ Agregado")
+            else:
+                st.warning("⚠️ Completa ambos campos")
+    
+    with st.expander("📥 Importar lista de asistentes"):
+        st.caption("Un asistente por línea: `Nombre, Cargo` (también con `;` o tabulador), o un CSV con columnas nombre y cargo")
+        csv_file = st.file_uploader("Archivo CSV", type=["csv", "txt"], key="import_csv")
+        pasted = st.text_area("O pega la lista", height=150, key="import_text")
+        
+        if st.button("📥 Importar asistentes"):
+            imported = []
+            if csv_file is not None:
+                imported += parse_attendee_csv(csv_file.getvalue())
+            if pasted:
+                imported += parse_attendee_text(pasted)
             
-            result = transcribe_audio(tmp_path, model_size=model_size, language="es")
-            os.unlink(tmp_path)
+            if imported:
+                added, skipped = merge_attendees(st.session_state.asistentes, imported)
+                update_meeting_info()
+                message = f"✅ {added} asistentes importados"
+                if skipped:
+                    message += f" ({skipped} repetidos omitidos)"
+                st.success(message)
+            else:
+                st.warning("⚠️ No se encontraron asistentes para importar")
+    
+    # Mostrar lista
+    if st.session_state.asistentes:
+        st.markdown(f"##### 📋 Lista de Asistentes ({len(st.session_state.asistentes)}):")
+        for idx, asist in enumerate(st.session_state.asistentes):
+            c1, c2, c3 = st.columns([2, 2, 1])
+            with c1:
+                st.text(asist["nombre"])
+            with c2:
+                st.text(asist["cargo"])
+            with c3:
+                st.button("🗑️", key=f"del_{idx}", on_click=remove_attendee, args=(idx,))
+
+
+def remove_attendee(idx):
+    """Quita un asistente (callback: corre antes de redibujar la lista)"""
+    
+    st.session_state.asistentes.pop(idx)
+    update_meeting_info()
+
+
+@st.fragment
+def agenda_editor():
+    """Editor de la agenda (se re-ejecuta sin recargar las demás pestañas)"""
+    
+    st.subheader("📝 Agenda")
+    st.text_area(
+        "Agenda de la reunión (un punto por línea) *",
+        placeholder="1. Aprobación del acta anterior\n2. Presentación de proyectos\n3. Discusión presupuesto\n4. Varios",
+        height=120,
+        key="info_agenda",
+        on_change=update_meeting_info
+    )
+
+
+def update_meeting_info():
+    """
+    Arma meeting_info desde los campos del formulario y lo guarda si cambió
+    
+    Lee los valores de session_state (no de los widgets) para poder
+    llamarse desde los fragmentos y sus callbacks.
+    """
+    
+    state = st.session_state
+    state.meeting_info = {
+        "numero_acta": state.get("info_numero_acta", ""),
+        "comite": state.get("info_comite", ""),
+        "area_convoca": state.get("info_area_convoca", ""),
+        "fecha": state.info_fecha.strftime("%d/%m/%Y"),
+        "hora_inicio": state.info_hora_inicio.strftime("%H:%M"),
+        "hora_fin": state.info_hora_fin.strftime("%H:%M"),
+        "lugar": state.get("info_lugar", ""),
+        "notas_por": state.get("info_notas_por", ""),
+        "asistentes": state.asistentes,
+        "agenda": state.get("info_agenda", "")
+    }
+    state.manual_notes = state.meeting_info["agenda"]
+    checkpoint_meeting_info(state.meeting_info)
+
+
+@st.fragment
+def manual_notes_editor():
+    """Editor de notas manuales (se re-ejecuta sin recargar las demás pestañas)"""
+    
+    notas_manuales = st.text_area(
+        "Notas de la reunión *",
+        placeholder="""Ejemplo:
+
+**Punto 1 - Aprobación del acta anterior:**
+Se presentó el acta No. 9. El Dr. Pérez solicitó corregir la fecha del proyecto X. Se aprobó por unanimidad con la corrección.
+
+**Punto 2 - Presentación de proyectos:**
+La Dra. García presentó "Sistema de IA para análisis de datos". Presupuesto: $50,000. 
+
+Discusión sobre:
+- Viabilidad técnica
+- Cronograma 
+- Recursos necesarios
+
+Decisión: Aprobar condicionado a cronograma detallado en próxima reunión.
+
+**Punto 3 - Tareas asignadas:**
+- Dr. Pérez: Revisar propuesta técnica → 15/03/2024
+- Dra. García: Cronograma detallado → 10/03/2024
+- Ing. Martínez: Evaluar costos → 12/03/2024
+
+Próxima reunión: 20/03/2024
+""",
+        height=450,
+        key="notas_text"
+    )
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        if st.button("✅ Usar estas notas", type="primary", use_container_width=True):
+            if notas_manuales and len(notas_manuales.strip()) >= 50:
+                st.session_state.transcription = notas_manuales
+                st.session_state.transcription_display = notas_manuales
+                st.session_state.using_manual_notes = True
+                st.session_state.segments = []
+                cancel_refinement(st.session_state.meeting_id)
+                st.session_state.pop("refinement", None)
+                checkpoint_transcription()
+                # Las pestañas de análisis y acta dependen del contenido:
+                # aquí sí hace falta re-ejecutar la app completa
+                st.session_state._notes_saved = True
+                st.rerun()
+            else:
+                st.error("⚠️ Escribe al menos 50 caracteres")
+        
+        if st.session_state.pop("_notes_saved", False):
+            st.success("✅ ¡Notas guardadas!")
+            st.balloons()
+            st.info("👉 Continúa en 'Análisis'")
+
+
+def checkpoint_meeting_info(meeting_info):
+    """Guarda la información de la reunión si cambió y tiene contenido"""
+    
+    has_content = any(
+        meeting_info.get(field) for field in ("numero_acta", "comite", "asistentes", "agenda")
+    )
+    if not has_content:
+        return
+    
+    if st.session_state.get("_checkpointed_meeting_info") == meeting_info:
+        return
+    
+    if save_checkpoint(st.session_state.meeting_id, "meeting_info", meeting_info):
+        # Copia para detectar cambios futuros en la lista de asistentes
+        st.session_state._checkpointed_meeting_info = {
+            **meeting_info, "asistentes": list(meeting_info.get("asistentes", []))
+        }
+
+
+def checkpoint_transcription():
+    """Guarda el contenido (transcripción o notas) de la reunión actual"""
+    
+    audio = st.session_state.get("audio_upload")
+    save_checkpoint(st.session_state.meeting_id, "transcription", {
+        "transcription": st.session_state.transcription,
+        "transcription_display": st.session_state.transcription_display,
+        "using_manual_notes": st.session_state.get("using_manual_notes", False),
+        "segments": st.session_state.get("segments", []),
+        "audio_sha256": audio["sha256"] if audio else None
+    })
+    
+    # Los segmentos también quedan junto a la grabación archivada
+    if audio and audio.get("archive") and st.session_state.get("segments"):
+        save_segments(audio["sha256"], st.session_state.segments)
+
+
+def restore_meeting(meeting_id):
+    """Restaura una reunión desde su último checkpoint"""
+    
+    state = load_checkpoint(meeting_id)
+    if not state:
+        st.sidebar.error("❌ No se pudo restaurar la reunión")
+        return
+    
+    cancel_refinement(st.session_state.meeting_id)
+    
+    # Limpiar resultados de la reunión anterior
+    for key in ("transcription", "transcription_display", "using_manual_notes",
+                "segments", "analysis", "analysis_stats", "transcription_seconds",
+                "refinement", "analysis_basis", "_reanalysis_check", "transcription_model", "quality_report",
+                "audio_start"):
+        st.session_state.pop(key, None)
+    
+    st.session_state.meeting_id = meeting_id
+    
+    info = state.get("meeting_info")
+    if info:
+        st.session_state.info_numero_acta = info.get("numero_acta", "")
+        st.session_state.info_comite = info.get("comite", "")
+        st.session_state.info_area_convoca = info.get("area_convoca", "")
+        st.session_state.info_lugar = info.get("lugar", "")
+        st.session_state.info_notas_por = info.get("notas_por", "")
+        st.session_state.info_agenda = info.get("agenda", "")
+        st.session_state.asistentes = list(info.get("asistentes", []))
+        try:
+            st.session_state.info_fecha = datetime.strptime(info["fecha"], "%d/%m/%Y").date()
+            st.session_state.info_hora_inicio = datetime.strptime(info["hora_inicio"], "%H:%M").time()
+            st.session_state.info_hora_fin = datetime.strptime(info["hora_fin"], "%H:%M").time()
+        except (KeyError, ValueError):
+            pass
+        st.session_state._checkpointed_meeting_info = info
+    
+    content = state.get("transcription")
+    if content:
+        st.session_state.transcription = content.get("transcription", "")
+        st.session_state.transcription_display = content.get("transcription_display", "")
+        st.session_state.using_manual_notes = content.get("using_manual_notes", False)
+        st.session_state.segments = content.get("segments", [])
+        if st.session_state.using_manual_notes:
+            st.session_state.notas_text = st.session_state.transcription
+    
+    # El audio de la reunión anterior no debe usarse con la restaurada
+    current = st.session_state.pop("audio_upload", None)
+    if current and current["file_id"] is not None:
+        remove_file(current["path"])
+    st.session_state.uploader_generation = st.session_state.get("uploader_generation", 0) + 1
+    
+    # La grabación archivada sirve para reproducir y re-decodificar sin volver a subirla
+    if content and content.get("audio_sha256"):
+        archive = get_archived_audio(content["audio_sha256"])
+        if archive:
+            st.session_state.audio_upload = archived_audio_upload(archive)
+    
+    if state.get("analysis"):
+        st.session_state.analysis = state["analysis"]
+
+
+def upload_dir():
+    """
+    Directorio temporal de los audios subidos en esta sesión
+    
+    TemporaryDirectory se borra con todo su contenido cuando el objeto se
+    libera: al terminar la sesión (Streamlit descarta su session_state) o
+    al cerrar el proceso.
+    """
+    if "_upload_dir" not in st.session_state:
+        st.session_state._upload_dir = tempfile.TemporaryDirectory(prefix="actas_upload_")
+    return st.session_state._upload_dir.name
+
+
+def archived_audio_upload(archive):
+    """Audio de la sesión respaldado solo por la grabación archivada (sin original)"""
+    return {
+        "file_id": None,
+        "name": Path(archive["path"]).name,
+        "path": archive["path"],
+        "sha256": archive["sha256"],
+        "preview": archive["path"],
+        "archive": archive
+    }
+
+
+def release_uploaded_audio():
+    """
+    Elimina la copia en disco del audio cuando se quita del selector
+    
+    Si la grabación quedó archivada, sigue disponible para reproducir y
+    re-decodificar; un refinado en curso (que lee el original) se cancela.
+    """
+    current = st.session_state.get("audio_upload")
+    if not current or current["file_id"] is None:
+        return
+    
+    job = get_refinement(st.session_state.meeting_id)
+    if job is not None and not job.finished:
+        cancel_refinement(st.session_state.meeting_id)
+        st.session_state.pop("refinement", None)
+    
+    remove_file(current["path"])
+    if current.get("archive"):
+        st.session_state.audio_upload = archived_audio_upload(current["archive"])
+    else:
+        st.session_state.pop("audio_upload")
+
+
+def prepare_uploaded_audio(uploaded_file):
+    """
+    Copia el audio subido a disco por bloques y lo archiva en Opus
+    
+    Se hace una sola vez por archivo; el temporal del archivo anterior se
+    elimina al subir uno nuevo o al quitarlo del selector (ver
+    release_uploaded_audio), y los de toda la sesión al terminar ésta (ver
+    upload_dir). La versión archivada (direccionada por su hash) sirve
+    también de vista previa y no se elimina nunca.
+    """
+    current = st.session_state.get("audio_upload")
+    if current and current["file_id"] == uploaded_file.file_id:
+        return current
+    
+    if current:
+        cancel_refinement(st.session_state.meeting_id)
+        st.session_state.pop("refinement", None)
+        if current["file_id"] is not None:
+            remove_file(current["path"])
+    
+    with st.spinner("📦 Archivando audio..."):
+        path, sha256 = spool_upload(uploaded_file, directory=upload_dir())
+        archive = ingest_audio(path, sha256)
+    
+    st.session_state.audio_upload = {
+        "file_id": uploaded_file.file_id,
+        "name": uploaded_file.name,
+        "path": path,
+        "sha256": sha256,
+        "preview": archive["path"] if archive else None,
+        "archive": archive
+    }
+    return st.session_state.audio_upload
+
+
+@contextmanager
+def progress_bar(label, describe):
+    """
+    Barra de progreso que se actualiza en el lugar mientras corre un modelo
+    
+    Entrega un callback (done, total) para run_job; la barra se quita al
+    terminar.
+    """
+    bar = st.progress(0.0, text=label)
+    tracker = ProgressTracker()
+    
+    def report(done, total):
+        tracker.update(done, total)
+        bar.progress(tracker.fraction, text=f"{label} {describe(tracker)}")
+    
+    try:
+        yield throttled(report)
+    finally:
+        bar.empty()
+
+
+def describe_audio_progress(tracker):
+    """Texto de avance de Whisper: audio procesado, velocidad y tiempo restante"""
+    text = f"{format_timestamp(tracker.done)} / {format_timestamp(tracker.total)} de audio"
+    if tracker.rate:
+        text += f" • {tracker.rate:.1f}× tiempo real"
+    if tracker.eta is not None:
+        text += f" • quedan ~{format_timestamp(tracker.eta)}"
+    return text
+
+
+def describe_token_progress(tracker):
+    """Texto de avance del análisis: tokens generados, velocidad y tiempo restante"""
+    text = f"{tracker.done:,} / {tracker.total:,} tokens"
+    if tracker.rate:
+        text += f" • {tracker.rate:.1f} tokens/s"
+    if tracker.eta is not None:
+        text += f" • quedan ~{format_timestamp(tracker.eta)}"
+    return text
+
+
+def transcribe_audio_file(audio_path, model_size, show_timestamps, target_seconds=None, progressive=False):
+    """
+    Transcribe el archivo de audio ya copiado a disco
+    
+    Con model_size="automático" se elige el modelo según la duración del
+    audio y el plazo (target_seconds) antes de transcribir. En modo
+    progresivo se transcribe primero un borrador con DRAFT_MODEL y el
+    modelo elegido lo refina en segundo plano.
+    """
+    
+    if model_size == AUTO_MODEL:
+        model_size = choose_model_for_audio(audio_path, target_seconds)
+    
+    refine_model = None
+    if progressive:
+        refine_model = model_size if model_size != DRAFT_MODEL else REFINE_MODEL
+        model_size = DRAFT_MODEL
+    
+    cancel_refinement(st.session_state.meeting_id)
+    st.session_state.pop("refinement", None)
+    
+    label = f"🎤 Transcribiendo borrador ({model_size})..." if progressive else f"🎤 Transcribiendo ({model_size})..."
+    with progress_bar(label, describe_audio_progress) as report:
+        try:
+            started = time.perf_counter()
+            result = run_job(
+                "transcribe",
+                progress_callback=report,
+                audio_file_path=audio_path,
+                model_size=model_size,
+                language="es"
+            )
             
             if result:
+                segments = [{**s, "pass": model_size} for s in result.get("segments", [])]
                 st.session_state.transcription = result["text"]
+                st.session_state.transcription_seconds = time.perf_counter() - started
                 
-                if show_timestamps and result.get("segments"):
-                    st.session_state.transcription_display = get_transcription_with_timestamps(result["segments"])
+                if show_timestamps and segments:
+                    st.session_state.transcription_display = get_transcription_with_timestamps(segments)
                 else:
                     st.session_state.transcription_display = result["text"]
                 
                 st.session_state.using_manual_notes = False
-                st.success("✅ ¡Transcripción completada!")
+                st.session_state.segments = segments
+                st.session_state.transcription_model = refine_model or model_size
+                st.session_state.pop("quality_report", None)
+                checkpoint_transcription()
+                
+                if refine_model and segments:
+                    windows = plan_windows(segments, duration=probe_duration(audio_path))
+                    st.session_state.refinement = {
+                        "model": refine_model,
+                        "windows": windows,
+                        "applied": [],
+                        "show_timestamps": show_timestamps
+                    }
+                    start_refinement(st.session_state.meeting_id, audio_path, windows, refine_model)
+                    st.success(f"✅ ¡Borrador listo! Se está refinando con '{refine_model}' en segundo plano")
+                else:
+                    st.success("✅ ¡Transcripción completada!")
                 st.balloons()
                 st.info("👉 Continúa en 'Análisis'")
             else:
@@ -403,18 +877,251 @@ def transcribe_audio_file(uploaded_file, model_size, show_timestamps):
             st.error(f"❌ Error: {str(e)}")
 
 
-def analyze_meeting():
-    """Analiza el contenido con Phi-4"""
+def choose_model_for_audio(audio_path, target_seconds):
+    """Elige el modelo Whisper más grande que transcribe el audio dentro del plazo"""
+    
+    duration = probe_duration(audio_path)
+    if not duration:
+        st.warning("⚠️ No se pudo leer la duración del audio (requiere ffprobe); se usa el modelo base")
+        return "base"
+    
+    budget = target_seconds * WHISPER_SHARE
+    with st.spinner("⏱️ Midiendo la velocidad de los modelos en esta máquina..."):
+        model_size, estimate = select_whisper_model(audio_path, duration, budget)
+    
+    if estimate is None:
+        st.warning("⚠️ No se pudo calibrar; se usa el modelo más pequeño")
+    elif estimate > budget:
+        st.warning(
+            f"⚠️ Ningún modelo cabe en el plazo: se usa '{model_size}' "
+            f"(~{format_timestamp(estimate)} para {format_timestamp(duration)} de audio)"
+        )
+    else:
+        st.info(
+            f"🎯 Modelo elegido: '{model_size}' "
+            f"(~{format_timestamp(estimate)} para {format_timestamp(duration)} de audio)"
+        )
+    return model_size
+
+
+def apply_refinement():
+    """
+    Incorpora a la sesión los tramos que el refinado ya terminó
+    
+    Returns:
+        bool: True si la transcripción cambió
+    """
+    refinement = st.session_state.get("refinement")
+    job = get_refinement(st.session_state.meeting_id)
+    if not refinement or job is None:
+        return False
+    
+    pending = [i for i in sorted(job.results) if i not in refinement["applied"]]
+    if not pending:
+        return False
+    
+    segments = st.session_state.segments
+    for index in pending:
+        window = refinement["windows"][index]
+        refined = [{**s, "pass": refinement["model"]} for s in job.results[index]]
+        segments = splice_segments(segments, window["start"], window["end"], refined)
+        refinement["applied"].append(index)
+    
+    update_segments(segments, refinement["show_timestamps"])
+    return True
+
+
+def update_segments(segments, show_timestamps):
+    """Reemplaza los segmentos de la sesión y regenera el texto a partir de ellos"""
+    
+    st.session_state.segments = segments
+    st.session_state.transcription = "".join(s["text"] for s in segments).strip()
+    if show_timestamps:
+        st.session_state.transcription_display = get_transcription_with_timestamps(segments)
+    else:
+        st.session_state.transcription_display = st.session_state.transcription
+    checkpoint_transcription()
+
+
+@st.fragment(run_every=3)
+def refinement_panel():
+    """Avance del refinado en segundo plano (se actualiza solo cada pocos segundos)"""
+    
+    refinement = st.session_state.refinement
+    job = get_refinement(st.session_state.meeting_id)
+    apply_refinement()
+    
+    done, total = len(refinement["applied"]), len(refinement["windows"])
+    st.progress(done / total, text=f"✨ Refinando con '{refinement['model']}': {done}/{total} tramos")
+    show_refinement_legend(refinement)
+    
+    if job is None or (job.finished and done == len(job.results)):
+        refinement["finished"] = True
+        refinement["error"] = job.error if job else "el refinado se interrumpió"
+        # El análisis (otra pestaña) necesita la transcripción final
+        st.rerun()
+
+
+def show_refinement_status():
+    """Resultado del refinado ya terminado"""
+    
+    refinement = st.session_state.refinement
+    done, total = len(refinement["applied"]), len(refinement["windows"])
+    if done == total:
+        st.success(f"✨ Transcripción refinada con '{refinement['model']}'")
+    else:
+        st.warning(f"⚠️ Refinado incompleto ({done}/{total} tramos): {refinement.get('error')}")
+    show_refinement_legend(refinement)
+
+
+def show_refinement_legend(refinement):
+    """Tramos de la transcripción: borrador (🟡) o refinados (🟢)"""
+    
+    applied = set(refinement["applied"])
+    strip = "".join("🟢" if i in applied else "🟡" for i in range(len(refinement["windows"])))
+    st.caption(f"{strip}  🟡 borrador ({DRAFT_MODEL}) • 🟢 refinado ({refinement['model']})")
+
+
+def offer_reanalysis(compression_config, target_seconds):
+    """
+    Ofrece re-analizar solo si la transcripción (refinada o corregida) cambió
+    el texto de algún punto de la agenda desde el último análisis
+    """
+    
+    basis = st.session_state.analysis_basis
+    changed = []
+    if st.session_state.transcription != basis["text"]:
+        # La comparación se hace una vez por versión de la transcripción
+        check = st.session_state.get("_reanalysis_check")
+        if check is None or check[0] != st.session_state.transcription:
+            current = agenda_texts(st.session_state.segments, st.session_state.get('manual_notes', ''))
+            check = (st.session_state.transcription, changed_agenda_items(basis["items"], current))
+            st.session_state._reanalysis_check = check
+        changed = check[1]
+    
+    if changed:
+        items = "\n".join(f"- {item} (similitud {similarity:.0%})" for item, similarity in changed)
+        st.warning(f"✨ La transcripción mejorada cambió el texto de estos puntos:\n{items}")
+        if st.button("🔁 Re-analizar con la transcripción mejorada", use_container_width=True):
+            analyze_meeting(compression_config, target_seconds)
+    elif st.session_state.get("refinement", {}).get("finished"):
+        st.caption("✨ El refinado no cambió ningún punto de la agenda de forma apreciable: el análisis sigue vigente")
+
+
+def show_quality_review(show_timestamps):
+    """Segmentos dudosos según las métricas de Whisper y su re-decodificación"""
+    
+    report = st.session_state.get("quality_report")
+    if report:
+        share = report["seconds"] / report["audio_seconds"] if report["audio_seconds"] else 0
+        st.success(
+            f"🔧 {report['replaced']} de {report['ranges']} tramos dudosos corregidos con '{report['model']}' "
+            f"(se re-decodificó el {share:.0%} del audio)"
+        )
+    
+    flagged = flag_segments(st.session_state.segments)
+    if not flagged:
+        if not report:
+            st.caption("✅ Ningún segmento dudoso en la transcripción")
+        return
+    
+    seconds = sum(f["end"] - f["start"] for f in flagged)
+    with st.expander(f"⚠️ {len(flagged)} segmentos dudosos ({format_timestamp(seconds)} de audio)"):
+        for f in flagged[:50]:
+            reasons = ", ".join(REASONS[issue] for issue in f["issues"])
+            st.markdown(f"- `{format_timestamp(f['start'])}` {f['text'][:100]} — _{reasons}_")
+        if len(flagged) > 50:
+            st.caption(f"... y {len(flagged) - 50} más")
+    
+    audio = st.session_state.get("audio_upload")
+    if audio is None:
+        st.caption("Sube de nuevo el audio para re-decodificar estos tramos")
+        return
+    
+    model = larger_model(st.session_state.get("transcription_model", "base"))
+    if st.button(f"🔧 Re-decodificar solo esos tramos ({model})", use_container_width=True):
+        redecode_suspect_segments(audio["path"], show_timestamps)
+
+
+def redecode_suspect_segments(audio_path, show_timestamps):
+    """Re-decodifica los tramos dudosos y reemplaza los que mejoran"""
+    
+    with progress_bar("🔧 Re-decodificando tramos dudosos...", describe_audio_progress) as report:
+        try:
+            segments, summary = redecode_flagged(
+                audio_path,
+                st.session_state.segments,
+                st.session_state.get("transcription_model", "base"),
+                progress_callback=report,
+                audio_duration=probe_duration(audio_path)
+            )
+        except Exception as e:
+            st.error(f"❌ Error: {str(e)}")
+            return
+    
+    update_segments(segments, show_timestamps)
+    st.session_state.quality_report = summary
+    st.rerun()
+
+
+def analyze_meeting(compression_config=None, target_seconds=None):
+    """
+    Analiza el contenido con Phi-4
+    
+    Si se da compression_config, la transcripción de audio se limpia antes
+    (las notas manuales se analizan tal cual). Si se da target_seconds, el
+    presupuesto de tokens se ajusta a lo que queda del plazo.
+    """
     
-    with st.spinner("🤖 Analizando... Esto puede tardar varios minutos"):
+    max_new_tokens = MAX_NEW_TOKENS
+    if target_seconds:
+        # Lo que queda del plazo después de transcribir (al menos su parte reservada)
+        spent = 0 if st.session_state.get('using_manual_notes') else st.session_state.get('transcription_seconds', 0)
+        budget = max(target_seconds - spent, target_seconds * (1 - WHISPER_SHARE))
+        with st.spinner("⏱️ Midiendo la velocidad del modelo de análisis..."):
+            max_new_tokens, _ = select_max_new_tokens(budget)
+    
+    with progress_bar("🤖 Analizando...", describe_token_progress) as report:
         try:
             transcription = st.session_state.transcription
             manual_notes = st.session_state.get('manual_notes', '')
             
-            analysis = analyze_with_phi4(transcription, manual_notes)
+            segments = st.session_state.get('segments', [])
+            stats = {}
+            
+            if compression_config is not None and not st.session_state.get('using_manual_notes'):
+                compressed = compress_transcript(transcription, segments, compression_config)
+                transcription = compressed["text"]
+                segments = compressed["segments"]
+                stats = {
+                    "tokens_before": compressed["tokens_before"],
+                    "tokens_after": compressed["tokens_after"],
+                    "reduction": compressed["reduction"]
+                }
+            
+            started = time.perf_counter()
+            analysis = run_job(
+                "analyze",
+                progress_callback=report,
+                transcription=transcription,
+                manual_notes=manual_notes,
+                segments=segments,
+                max_new_tokens=max_new_tokens
+            )
+            stats["seconds"] = time.perf_counter() - started
+            if target_seconds:
+                stats["max_new_tokens"] = max_new_tokens
             
             if analysis:
                 st.session_state.analysis = analysis
+                st.session_state.analysis_stats = stats
+                if st.session_state.get('segments'):
+                    # Textos por punto de la agenda sobre los que se analizó
+                    st.session_state.analysis_basis = {
+                        "text": st.session_state.transcription,
+                        "items": agenda_texts(st.session_state.segments, manual_notes)
+                    }
+                save_checkpoint(st.session_state.meeting_id, "analysis", analysis)
                 st.success("✅ ¡Análisis completado!")
                 st.balloons()
                 st.rerun()
@@ -437,8 +1144,40 @@ def display_analysis(analysis):
     
     if analysis.get("decisiones"):
         st.markdown("#### ✅ Decisiones")
-        for d in analysis["decisiones"]:
-            st.markdown(f"- {d}")
+        
+        # Con audio y tiempos se puede saltar al momento de cada decisión
+        audio = st.session_state.get("audio_upload")
+        segments = st.session_state.get("segments")
+        if audio and audio.get("archive") and segments:
+            store = SegmentStore(segments)
+            moment = st.session_state.get("audio_start")
+            if moment is None:
+                st.audio(audio["preview"], format="audio/ogg")
+            else:
+                # Solo se leen del archivo las páginas que cubren el tramo
+                data, span_start = read_span(
+                    audio["sha256"],
+                    max(0.0, moment - SPAN_LEAD_SECONDS),
+                    moment + SPAN_SECONDS
+                )
+                st.audio(data, format="audio/ogg")
+                st.caption(f"▶️ Desde {format_timestamp(span_start)} de la grabación")
+            for idx, d in enumerate(analysis["decisiones"]):
+                c1, c2 = st.columns([6, 1])
+                with c1:
+                    st.markdown(f"- {d}")
+                with c2:
+                    moment = store.find_time(d)
+                    if moment is not None:
+                        st.button(
+                            f"▶️ {format_timestamp(moment)}",
+                            key=f"jump_{idx}",
+                            on_click=jump_to_audio,
+                            args=(moment,)
+                        )
+        else:
+            for d in analysis["decisiones"]:
+                st.markdown(f"- {d}")
     
     if analysis.get("tareas"):
         st.markdown("#### 📋 Tareas")
@@ -451,37 +1190,77 @@ def display_analysis(analysis):
             st.markdown(f"- {p}")
 
 
-def generate_acta(include_content):
-    """Genera el documento Word"""
+def jump_to_audio(seconds):
+    """Posiciona el reproductor del análisis en un instante de la grabación"""
+    st.session_state.audio_start = seconds
+
+
+def generate_acta(include_content, show_timestamps=False):
+    """
+    Genera el documento Word en memoria
+    
+    Las actas ya generadas en la sesión se identifican por el hash de sus
+    entradas; si nada cambió, se sirven los mismos bytes sin regenerar.
+    """
     
     with st.spinner("📄 Generando documento..."):
         try:
             analysis = st.session_state.analysis
             meeting_info = st.session_state.meeting_info
             content = st.session_state.transcription if include_content else ""
+            segments = st.session_state.get('segments') if include_content else None
             
-            doc = generate_word_document(analysis, meeting_info, content)
+            filename = acta_filename(meeting_info)
             
-            if doc:
-                numero = meeting_info.get('numero_acta', '0')
-                fecha = meeting_info.get('fecha', 'reunion').replace('/', '-')
-                filename = f"Acta_No_{numero}_{fecha}.docx"
-                filepath = save_document(doc, filename)
+            if 'artifacts' not in st.session_state:
+                st.session_state.artifacts = new_store()
+            
+            key = artifact_key(
+                analysis,
+                meeting_info,
+                content,
+                [(s["start"], s["end"], s["text"]) for s in segments or []],
+                show_timestamps,
+                TEMPLATE_PATH
+            )
+            artifact = get_artifact(st.session_state.artifacts, key)
+            reused = artifact is not None
+            
+            if not reused:
+                doc = generate_word_document(analysis, meeting_info, content)
+                if not doc:
+                    return
                 
-                if filepath:
-                    with open(filepath, "rb") as file:
-                        st.download_button(
-                            label="📥 Descargar Acta",
-                            data=file,
-                            file_name=filename,
-                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                            type="primary",
-                            use_container_width=True
-                        )
-                    
-                    st.success("✅ ¡Acta generada!")
-                    st.balloons()
-                    os.unlink(filepath)
+                # El anexo se escribe segmento a segmento al guardar
+                annex = None
+                if content:
+                    annex = iter_annex_paragraphs(content, segments, show_timestamps)
+                
+                data = render_document_bytes(doc, annex)
+                if data is None:
+                    return
+                artifact = put_artifact(st.session_state.artifacts, key, filename, data)
+                
+                # Opciones con las que se emitió, para poder regenerarla igual
+                save_checkpoint(st.session_state.meeting_id, "acta", {
+                    "include_content": bool(include_content),
+                    "show_timestamps": bool(show_timestamps)
+                })
+            
+            st.download_button(
+                label="📥 Descargar Acta",
+                data=artifact["data"],
+                file_name=artifact["filename"],
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                type="primary",
+                use_container_width=True
+            )
+            
+            if reused:
+                st.success("✅ ¡Acta lista! (sin cambios desde la última generación)")
+            else:
+                st.success("✅ ¡Acta generada!")
+                st.balloons()
         
         except Exception as e:
             st.error(f"❌ Error: {str(e)}")
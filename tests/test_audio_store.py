@@ -0,0 +1,139 @@
+"""
+Pruebas del archivo de grabaciones (páginas Ogg y tramos servidos)
+"""
+import struct
+
+import pytest
+
+from utils import audio_store
+from utils.audio_store import (
+    OGG_CONTINUED, OGG_END_OF_STREAM, OGG_HEADER, build_page_index, ogg_crc,
+    read_span, _write_json
+)
+
+
+PRE_SKIP = 312
+SERIAL = 1234
+PAGE_SECONDS = 1
+AUDIO_PAGES = 20
+CONTINUED_PAGE = 9
+
+
+def ogg_page(header_type, granule, sequence, body):
+    """Página Ogg válida (con su CRC)"""
+    lacing = [255] * (len(body) // 255) + [len(body) % 255]
+    header = OGG_HEADER.pack(b"OggS", 0, header_type, granule, SERIAL, sequence, 0, len(lacing))
+    page = bytearray(header + bytes(lacing) + body)
+    struct.pack_into("<I", page, 22, ogg_crc(page))
+    return bytes(page)
+
+
+def synthetic_opus():
+    """Ogg Opus sintético: OpusHead, OpusTags y una página de audio por segundo"""
+    head = b"OpusHead" + bytes([1, 1]) + struct.pack("<HI", PRE_SKIP, 16000) + bytes(3)
+    pages = [ogg_page(0x02, 0, 0, head), ogg_page(0, 0, 1, b"OpusTags" + bytes(20))]
+    for i in range(AUDIO_PAGES):
+        header_type = OGG_CONTINUED if i + 2 == CONTINUED_PAGE else 0
+        if i == AUDIO_PAGES - 1:
+            header_type |= OGG_END_OF_STREAM
+        granule = PRE_SKIP + (i + 1) * PAGE_SECONDS * 48000
+        pages.append(ogg_page(header_type, granule, i + 2, bytes([i]) * 300))
+    return pages
+
+
+@pytest.fixture
+def archived(monkeypatch, tmp_path):
+    monkeypatch.setattr(audio_store, "AUDIO_DIR", tmp_path)
+    audio_store.load_page_index.clear()
+
+    pages = synthetic_opus()
+    directory = audio_store.entry_dir("abc")
+    directory.mkdir()
+    (directory / "audio.ogg").write_bytes(b"".join(pages))
+    _write_json(directory / "index.json", build_page_index(directory / "audio.ogg"))
+
+    yield "abc", pages
+    audio_store.load_page_index.clear()
+
+
+def split_pages(data):
+    pages = []
+    while data:
+        n_segments = data[OGG_HEADER.size - 1]
+        length = OGG_HEADER.size + n_segments + sum(data[OGG_HEADER.size:OGG_HEADER.size + n_segments])
+        pages.append(data[:length])
+        data = data[length:]
+    return pages
+
+
+def test_index_skips_header_pages(archived):
+    sha256, _ = archived
+    index = audio_store.load_page_index(sha256)
+
+    assert index["pre_skip"] == PRE_SKIP
+    assert index["header_pages"] == 2
+    assert len(index["pages"]) == AUDIO_PAGES + 2
+    assert audio_store.get_archived_audio(sha256)["duration"] == AUDIO_PAGES * PAGE_SECONDS
+
+
+@pytest.mark.parametrize("start, end", [(0, 3), (5.5, 7), (7.2, 10), (15, 100)])
+def test_span_is_a_valid_stream(archived, start, end):
+    sha256, original = archived
+
+    data, span_start = read_span(sha256, start, end)
+    pages = split_pages(data)
+
+    # Encabezados intactos
+    assert pages[:2] == original[:2]
+
+    shift = round(span_start * 48000)
+    assert span_start <= start
+    for sequence, page in enumerate(pages):
+        header = OGG_HEADER.unpack_from(page)
+        granule, serial, page_sequence, crc = header[3], header[4], header[5], header[6]
+        assert page_sequence == sequence
+        assert serial == SERIAL
+
+        unsigned = bytearray(page)
+        struct.pack_into("<I", unsigned, 22, 0)
+        assert crc == ogg_crc(unsigned)
+
+        if sequence >= 2:
+            # Mismo contenido y posición desplazada al inicio del tramo
+            source = next(p for p in original[2:] if p[OGG_HEADER.size + 1:] == page[OGG_HEADER.size + 1:])
+            assert granule == OGG_HEADER.unpack_from(source)[3] - shift
+            assert bool(header[2] & OGG_END_OF_STREAM) == (sequence == len(pages) - 1)
+
+    # El tramo empieza en una página que no continúa un paquete y cubre [start, end]
+    assert not OGG_HEADER.unpack_from(pages[2])[2] & OGG_CONTINUED
+    last_granule = OGG_HEADER.unpack_from(pages[-1])[3]
+    assert (last_granule - PRE_SKIP) / 48000 + span_start >= min(end, AUDIO_PAGES * PAGE_SECONDS)
+
+
+def test_ingest_uses_its_own_temporary_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(audio_store, "AUDIO_DIR", tmp_path / "audio")
+    audio_store.load_page_index.clear()
+    outputs = []
+
+    def transcode(audio_path, output_path, bitrate):
+        outputs.append(output_path)
+        with open(output_path, "wb") as f:
+            f.write(b"".join(synthetic_opus()))
+        return output_path
+
+    monkeypatch.setattr(audio_store, "make_preview_proxy", transcode)
+    original = tmp_path / "reunion.wav"
+    original.write_bytes(bytes(1000))
+
+    entry = audio_store.ingest_audio(str(original), "def")
+
+    assert entry["original_bytes"] == 1000
+    assert entry["duration"] == AUDIO_PAGES * PAGE_SECONDS
+    assert "audio.tmp" not in outputs[0]
+    assert sorted(p.name for p in audio_store.entry_dir("def").iterdir()) == ["audio.ogg", "index.json"]
+    audio_store.load_page_index.clear()
+
+
+def test_crc_matches_reference():
+    # CRC-32 sin reflejar, valor inicial 0 y sin xor final (el de Ogg)
+    assert ogg_crc(b"123456789") == 0x89A1897F
@@ -0,0 +1,54 @@
+"""
+Pruebas de la limpieza de transcripciones: se quita el ruido, no el contenido
+"""
+import pytest
+
+from utils.compression import collapse_repetitions, compress_text, remove_fillers
+
+
+@pytest.mark.parametrize("text", [
+    "No, no, no se aprueba.",
+    "Se votó: sí, sí, no.",
+    "No sé, creo que conviene esperar.",
+    "La señora Em dijo que sí.",
+    "Se aprobaron 20 20 millones.",
+    "Votaron dos, dos y uno.",
+    "Firmó María García García.",
+    "Vale, lo aprobamos.",
+    "Bueno, sí."
+])
+def test_compress_text_preserves_content(text):
+    assert compress_text(text) == text
+
+
+def test_remove_fillers_removes_consecutive_markers():
+    assert remove_fillers("Eh, o sea, este, vamos a empezar.") == "Vamos a empezar."
+    assert remove_fillers("Eh, bueno, este, vamos a empezar.") == "Bueno, vamos a empezar."
+
+
+def test_remove_fillers_recapitalizes_sentence_start():
+    assert remove_fillers("Eh, lo aprobamos. O sea, se vota mañana.") == "Lo aprobamos. Se vota mañana."
+
+
+def test_remove_fillers_keeps_replies_and_agreement():
+    assert remove_fillers("Vale, lo aprobamos.") == "Vale, lo aprobamos."
+    assert remove_fillers("Bueno, sí.") == "Bueno, sí."
+    assert remove_fillers("Lo vemos, bueno, mañana.") == "Lo vemos, mañana."
+
+
+def test_remove_fillers_removes_hesitations():
+    assert remove_fillers("El presupuesto, mmm, se revisa.") == "El presupuesto, se revisa."
+
+
+def test_collapse_repetitions_collapses_words_and_phrases():
+    assert collapse_repetitions("el el el proyecto") == "el proyecto"
+    assert collapse_repetitions("vamos a vamos a revisar") == "vamos a revisar"
+
+
+def test_collapse_repetitions_keeps_votes_and_negations():
+    assert collapse_repetitions("no no no se aprueba") == "no no no se aprueba"
+    assert collapse_repetitions("sí sí no") == "sí sí no"
+
+
+def test_collapse_repetitions_keeps_compound_surnames():
+    assert collapse_repetitions("María García García") == "María García García"
@@ -0,0 +1,106 @@
+"""
+Pruebas de la generación del acta con plantillas institucionales
+"""
+import io
+
+from docx import Document
+from docx.shared import Pt
+
+from utils.document_gen import (
+    TABLE_STYLE, generate_word_document, iter_annex_paragraphs, load_template,
+    render_document_bytes
+)
+
+
+MEETING_INFO = {
+    "numero_acta": "7",
+    "comite": "Comité de Investigación",
+    "fecha": "01/03/2025",
+    "asistentes": [{"nombre": "Ana Pérez", "cargo": "Directora"}],
+    "agenda": "1. Aprobación del acta\n2. Presupuesto"
+}
+
+ANALYSIS = {
+    "desarrollo": "Se revisó el presupuesto.",
+    "decisiones": ["Se aprueba el presupuesto"],
+    "tareas": ["Enviar informe | Ana Pérez | 15/03/2025"],
+    "proximos_pasos": ["Revisar el cronograma"]
+}
+
+
+def stripped_template(path):
+    """Plantilla como las de Word: sin estilos de lista, título ni tablas"""
+    doc = Document()
+    doc.add_paragraph("Encabezado institucional")
+    for style in list(doc.styles):
+        if style.name in ("List Number", "List Bullet", "Title", "Heading 1", TABLE_STYLE):
+            style.element.getparent().remove(style.element)
+    doc.save(path)
+
+
+def render(monkeypatch, template_path, transcription="", annex=None):
+    monkeypatch.setattr(
+        "utils.document_gen.load_template", lambda: load_template(str(template_path))
+    )
+    doc = generate_word_document(ANALYSIS, MEETING_INFO, transcription)
+    assert doc is not None
+    data = render_document_bytes(doc, annex)
+    assert data is not None
+    return Document(io.BytesIO(data))
+
+
+def paragraph_texts(doc):
+    return [p.text for p in doc.paragraphs]
+
+
+def test_renders_with_stripped_down_template(monkeypatch, tmp_path):
+    template = tmp_path / "plantilla.docx"
+    stripped_template(template)
+
+    doc = render(monkeypatch, template)
+
+    texts = paragraph_texts(doc)
+    assert "ACTA No. 7" in texts
+    assert "Se aprueba el presupuesto" in texts
+    assert doc.styles["Acta Agenda"].base_style.name == "Normal"
+    assert len(doc.tables) == 3
+
+
+def test_annex_heading_only_with_annex_paragraphs(monkeypatch, tmp_path):
+    template = tmp_path / "plantilla.docx"
+    Document().save(template)
+
+    without_annex = paragraph_texts(render(monkeypatch, template))
+    assert "ANEXO: TRANSCRIPCIÓN COMPLETA" not in without_annex
+    assert without_annex[-1] == "Revisar el cronograma"
+
+    empty_annex = paragraph_texts(render(monkeypatch, template, "texto", iter_annex_paragraphs("")))
+    assert "ANEXO: TRANSCRIPCIÓN COMPLETA" not in empty_annex
+
+    with_annex = paragraph_texts(
+        render(monkeypatch, template, "texto", iter_annex_paragraphs("Primera línea\nSegunda línea"))
+    )
+    assert "ANEXO: TRANSCRIPCIÓN COMPLETA" in with_annex
+    assert with_annex[-2:] == ["Primera línea", "Segunda línea"]
+
+
+def test_annex_defaults_to_the_transcription(monkeypatch, tmp_path):
+    template = tmp_path / "plantilla.docx"
+    Document().save(template)
+
+    texts = paragraph_texts(render(monkeypatch, template, "TRANSCRIPCION\nSegunda línea"))
+    assert "ANEXO: TRANSCRIPCIÓN COMPLETA" in texts
+    assert texts[-2:] == ["TRANSCRIPCION", "Segunda línea"]
+
+    blank = paragraph_texts(render(monkeypatch, template, "  \n "))
+    assert "ANEXO: TRANSCRIPCIÓN COMPLETA" not in blank
+
+
+def test_template_styles_are_not_overridden(monkeypatch, tmp_path):
+    template = tmp_path / "plantilla.docx"
+    base = Document()
+    base.styles["Normal"].font.size = Pt(13)
+    base.save(template)
+
+    doc = render(monkeypatch, template)
+    assert doc.styles["Normal"].font.size == Pt(13)
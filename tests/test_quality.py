@@ -0,0 +1,51 @@
+"""
+Pruebas de la revisión de calidad de la transcripción
+"""
+from utils.quality import pad_ranges, plan_ranges, segment_issues
+
+
+def segment(start, end, text=" texto", avg_logprob=-0.3, no_speech_prob=0.1):
+    return {
+        "start": start, "end": end, "text": text,
+        "avg_logprob": avg_logprob, "compression_ratio": 1.5, "no_speech_prob": no_speech_prob
+    }
+
+
+def test_confident_speech_is_not_flagged_as_silence():
+    assert segment_issues(segment(0, 2, no_speech_prob=0.8, avg_logprob=-0.4)) == []
+
+
+def test_silence_needs_high_no_speech_and_low_confidence():
+    issues = segment_issues(segment(0, 2, no_speech_prob=0.8, avg_logprob=-1.3))
+    assert "no_speech" in issues
+
+    assert "no_speech" not in segment_issues(segment(0, 2, text=" ", no_speech_prob=0.8, avg_logprob=-1.3))
+
+
+def test_ranges_are_padded_up_to_neighbours():
+    segments = [segment(0, 4.6), segment(5, 8, avg_logprob=-1.5), segment(10, 12)]
+    ranges = plan_ranges([{"start": 5, "end": 8, "issues": ["low_confidence"]}])
+
+    padded = pad_ranges(ranges, segments, padding=0.75)
+
+    assert padded[0]["start"] == 4.6
+    assert padded[0]["end"] == 8.75
+
+
+def test_padding_stays_inside_the_audio():
+    segments = [segment(0.3, 3, avg_logprob=-1.5), segment(3, 9.5, avg_logprob=-1.5)]
+    ranges = plan_ranges([{"start": 0.3, "end": 9.5, "issues": ["low_confidence"]}])
+
+    padded = pad_ranges(ranges, segments, padding=0.75, audio_end=9.8)
+
+    assert padded[0]["start"] == 0.0
+    assert padded[0]["end"] == 9.8
+
+
+def test_overlapping_neighbour_is_not_entered():
+    segments = [segment(0, 5.2), segment(5, 8, avg_logprob=-1.5), segment(7.9, 12)]
+    ranges = plan_ranges([{"start": 5, "end": 8, "issues": ["low_confidence"]}])
+
+    padded = pad_ranges(ranges, segments, padding=0.75)
+
+    assert (padded[0]["start"], padded[0]["end"]) == (5, 8)
@@ -0,0 +1,49 @@
+"""
+Pruebas del plan de tramos del refinado progresivo
+"""
+from utils.refinement import plan_windows
+
+
+def segment(start, end):
+    return {"start": start, "end": end, "text": " texto"}
+
+
+def assert_contiguous(windows, end):
+    assert windows[0]["start"] == 0
+    for previous, current in zip(windows, windows[1:]):
+        assert current["start"] == previous["end"]
+    assert windows[-1]["end"] == end
+
+
+def test_last_window_reaches_audio_end():
+    segments = [segment(0, 120), segment(120, 310), segment(310, 400)]
+
+    windows = plan_windows(segments, 300, duration=900)
+
+    assert_contiguous(windows, 900)
+    assert windows[0]["end"] == 310
+    assert all(w["end"] - w["start"] <= 300 for w in windows[1:])
+
+
+def test_long_gaps_are_split_into_windows():
+    segments = [segment(5, 60), segment(1000, 1030)]
+
+    windows = plan_windows(segments, 300, duration=1030)
+
+    assert_contiguous(windows, 1030)
+    assert all(w["end"] - w["start"] <= 300 for w in windows)
+    assert any(w["start"] <= 1000 < w["end"] for w in windows)
+
+
+def test_cuts_fall_between_segments():
+    segments = [segment(i * 50, i * 50 + 50) for i in range(20)]
+
+    windows = plan_windows(segments, 300)
+
+    ends = {s["end"] for s in segments}
+    assert all(w["end"] in ends for w in windows)
+    assert_contiguous(windows, 1000)
+
+
+def test_unknown_duration_uses_last_segment():
+    assert plan_windows([segment(10, 40)], 300, duration=None) == [{"start": 0.0, "end": 40}]
@@ -0,0 +1,74 @@
+"""
+Pruebas de la regeneración masiva de actas archivadas
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+from utils import checkpoints
+from utils.rerender import find_archived_meetings, rerender_meeting
+
+
+MEETING_INFO = {"numero_acta": "7", "fecha": "01/03/2025", "comite": "Comité de Investigación"}
+ANALYSIS = {"desarrollo": "Se revisó el presupuesto.", "decisiones": ["Se aprueba el presupuesto"]}
+
+
+@pytest.fixture
+def checkpoint_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(checkpoints, "CHECKPOINT_DIR", tmp_path)
+    return tmp_path
+
+
+def archive(meeting_id, stages):
+    for stage, data in stages.items():
+        checkpoints.save_checkpoint(meeting_id, stage, data)
+
+
+def test_only_meetings_with_an_issued_acta(checkpoint_dir):
+    archive("emitida", {"meeting_info": MEETING_INFO, "analysis": ANALYSIS, "acta": {}})
+    archive("sin_acta", {"meeting_info": MEETING_INFO, "analysis": ANALYSIS})
+    archive("sin_analisis", {"meeting_info": MEETING_INFO})
+
+    assert find_archived_meetings(checkpoint_dir) == ["emitida"]
+
+
+def test_rerenders_with_saved_options(checkpoint_dir, tmp_path):
+    archive("m1", {
+        "meeting_info": MEETING_INFO,
+        "analysis": ANALYSIS,
+        "transcription": {"transcription": "Primera línea.\nSegunda línea."},
+        "acta": {"include_content": True}
+    })
+
+    path = rerender_meeting("m1", tmp_path / "acta.docx")
+
+    texts = [p.text for p in Document(path).paragraphs]
+    assert "Segunda línea." in texts
+
+
+def test_render_errors_propagate(checkpoint_dir, tmp_path, monkeypatch):
+    archive("m1", {"meeting_info": MEETING_INFO, "analysis": ANALYSIS, "acta": {}})
+
+    def broken(doc, meeting_info):
+        raise KeyError("estilo")
+
+    monkeypatch.setattr("utils.document_gen.add_institutional_header", broken)
+    with pytest.raises(KeyError):
+        rerender_meeting("m1", tmp_path / "acta.docx")
+
+
+def test_workers_do_not_load_models():
+    code = (
+        "import sys\n"
+        "from utils.rerender import rerender_meeting\n"
+        "import utils.document_gen, utils.checkpoints\n"
+        "print(any(m in sys.modules for m in ('whisper', 'torch', 'transformers')))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=Path(__file__).resolve().parent.parent
+    )
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,51 @@
+"""
+Pruebas del ajuste de la transcripción al presupuesto de tokens
+"""
+from utils.retrieval import (
+    PASSAGE_WORDS, allocate_budget, estimate_tokens, fit_to_budget, split_passages
+)
+
+
+def words(n, word="palabra"):
+    return " ".join([word] * n)
+
+
+def test_split_passages_caps_unpunctuated_text():
+    passages = split_passages(words(1000))
+    assert len(passages) == 9
+    assert all(len(p.split()) <= PASSAGE_WORDS for p in passages)
+    assert sum(len(p.split()) for p in passages) == 1000
+
+
+def test_split_passages_keeps_short_sentences_together():
+    text = "Primera oración corta. Segunda oración corta."
+    assert split_passages(text) == [text]
+
+
+def test_fit_to_budget_truncates_instead_of_returning_empty():
+    fitted = fit_to_budget(words(1000), ["presupuesto"], 50)
+    assert fitted
+    assert estimate_tokens(fitted) <= 50
+
+
+def test_allocate_budget_gives_every_slice_a_share():
+    needs = [estimate_tokens(words(n)) for n in [3000] * 5 + [100] * 35]
+    shares = allocate_budget(needs, 6000)
+    assert all(share > 0 for share in shares)
+    assert sum(shares) <= 6000
+    assert sum(shares) > 5900
+
+
+def test_allocate_budget_keeps_texts_that_fit():
+    assert allocate_budget([100, 200], 6000) == [100, 200]
+
+
+def test_many_agenda_slices_all_get_transcript():
+    slices = [words(600, f"tema{i}") for i in range(40)]
+    needs = [estimate_tokens(s) for s in slices]
+    fitted = [
+        fit_to_budget(s, [f"tema{i}"], share)
+        for i, (s, share) in enumerate(zip(slices, allocate_budget(needs, 6000)))
+    ]
+    assert all(fitted)
+    assert sum(estimate_tokens(f) for f in fitted) <= 6000 + len(fitted)
@@ -0,0 +1,24 @@
+"""
+Pruebas del pool de réplicas
+"""
+import os
+
+import pytest
+
+from utils.workers import MAX_STARTUP_FAILURES, WorkerPool
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="requiere afinidad de CPU")
+def test_replica_that_never_starts_is_retired():
+    # Un núcleo inexistente hace morir cada réplica al fijar la afinidad
+    pool = WorkerPool(1, cores=[max(os.sched_getaffinity(0)) + 1000])
+    try:
+        future = pool.submit("transcribe", audio_file_path="audio.wav", model_size="tiny")
+        with pytest.raises(RuntimeError, match=f"{MAX_STARTUP_FAILURES} intentos"):
+            future.result(timeout=120)
+        assert pool.size == 0
+
+        with pytest.raises(RuntimeError, match="ninguna réplica"):
+            pool.submit("transcribe", audio_file_path="audio.wav").result(timeout=5)
+    finally:
+        pool.shutdown()
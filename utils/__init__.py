@@ -1,6 +1,19 @@
 # Utils package
-from .transcription import transcribe_audio
-from .analysis import analyze_with_phi4
-from .document_gen import generate_word_document
+#
+# Las funciones principales se importan al pedirlas: importar cualquier
+# módulo de utils (p. ej. document_gen en la regeneración masiva) no carga
+# Whisper, torch ni transformers.
+_EXPORTS = {
+    'transcribe_audio': '.transcription',
+    'analyze_with_phi4': '.analysis',
+    'generate_word_document': '.document_gen',
+}
 
 __all__ = ['transcribe_audio', 'analyze_with_phi4', 'generate_word_document']
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,6 +5,17 @@ import torch
 from transformers import AutoModelForCausalLM, AutoTokenizer
 import streamlit as st
 
+from .segments import build_agenda_slices, format_slice_header, parse_agenda
+from .retrieval import SECTION_QUERIES, allocate_budget, estimate_tokens, fit_to_budget
+from .progress import TokenProgressStreamer
+
+
+# Tokens máximos de transcripción en el prompt (el resto es para instrucciones)
+TRANSCRIPT_TOKEN_BUDGET = 6000
+
+# Tokens máximos a generar en el análisis
+MAX_NEW_TOKENS = 2000
+
 
 @st.cache_resource
 def load_phi4_model():
@@ -38,13 +49,18 @@ def load_phi4_model():
         return None, None
 
 
-def analyze_with_phi4(transcription, manual_notes=""):
+def analyze_with_phi4(transcription, manual_notes="", segments=None, progress_callback=None,
+                      max_new_tokens=MAX_NEW_TOKENS):
     """
     Analiza la transcripción y notas usando Phi-4
     
     Args:
         transcription: Texto de la transcripción
         manual_notes: Notas manuales (opcional)
+        segments: Segmentos de Whisper con tiempos (opcional); si la agenda
+                  se puede alinear, cada punto recibe solo su fragmento
+        progress_callback: Función (tokens generados, presupuesto) opcional
+        max_new_tokens: Máximo de tokens a generar
         
     Returns:
         dict: Análisis estructurado de la reunión
@@ -55,18 +71,28 @@ def analyze_with_phi4(transcription, manual_notes=""):
             return None
         
         # Crear el prompt para Phi-4
-        prompt = create_analysis_prompt(transcription, manual_notes)
+        agenda_slices = build_agenda_slices(segments, manual_notes) if segments else []
+        transcription, agenda_slices = fit_transcript_to_budget(
+            transcription, manual_notes, agenda_slices,
+            count_tokens=lambda text: len(tokenizer.encode(text))
+        )
+        prompt = create_analysis_prompt(transcription, manual_notes, agenda_slices)
         
         # Generar análisis
         inputs = tokenizer(prompt, return_tensors="pt", truncation=True, max_length=8000)
         
+        streamer = None
+        if progress_callback:
+            streamer = TokenProgressStreamer(max_new_tokens, progress_callback)
+        
         with torch.no_grad():
             outputs = model.generate(
                 **inputs,
-                max_new_tokens=2000,
+                max_new_tokens=max_new_tokens,
                 temperature=0.7,
                 top_p=0.9,
-                do_sample=True
+                do_sample=True,
+                streamer=streamer
             )
         
         analysis = tokenizer.decode(outputs[0], skip_special_tokens=True)
@@ -82,19 +108,75 @@ def analyze_with_phi4(transcription, manual_notes=""):
         return None
 
 
-def create_analysis_prompt(transcription, manual_notes):
+def fit_transcript_to_budget(transcription, manual_notes, agenda_slices,
+                             token_budget=TRANSCRIPT_TOKEN_BUDGET, count_tokens=None):
+    """
+    Limita la transcripción al presupuesto de tokens del prompt
+    
+    Si la transcripción cabe, no se modifica. Si no, se seleccionan con BM25
+    los fragmentos más relevantes para cada punto de la agenda y para las
+    secciones de decisiones y tareas. Con fragmentos por punto de agenda,
+    cada uno recibe un mínimo y una parte del resto proporcional a su
+    longitud (ver allocate_budget), sin que sobre presupuesto.
+    
+    Args:
+        transcription: Transcripción completa
+        manual_notes: Agenda de la reunión
+        agenda_slices: Fragmentos por punto de agenda (puede ser vacío)
+        token_budget: Máximo de tokens de transcripción
+        count_tokens: Función que cuenta tokens (default: estimación por palabras)
+        
+    Returns:
+        tuple: (transcripción, fragmentos por punto de agenda) ajustados
+    """
+    kwargs = {"count_tokens": count_tokens} if count_tokens else {}
+    section_queries = list(SECTION_QUERIES.values())
+    
+    if agenda_slices:
+        needs = [(count_tokens or estimate_tokens)(s["text"]) for s in agenda_slices]
+        shares = allocate_budget(needs, token_budget)
+        fitted = []
+        for agenda_slice, share in zip(agenda_slices, shares):
+            text = fit_to_budget(
+                agenda_slice["text"],
+                [agenda_slice["item"]] + section_queries,
+                share,
+                **kwargs
+            )
+            fitted.append({**agenda_slice, "text": text})
+        return transcription, fitted
+    
+    queries = parse_agenda(manual_notes) + section_queries
+    return fit_to_budget(transcription, queries, token_budget, **kwargs), agenda_slices
+
+
+def create_analysis_prompt(transcription, manual_notes, agenda_slices=None):
     """
     Crea el prompt para el análisis
     
     Args:
         transcription: Transcripción del audio
         manual_notes: Agenda de la reunión
+        agenda_slices: Fragmentos de la transcripción por punto de agenda
+                       (ver build_agenda_slices); reemplazan la transcripción
         
     Returns:
         str: Prompt formateado
     """
-    prompt = f"""Eres un asistente experto en análisis de reuniones institucionales. Analiza la siguiente transcripción de una reunión y genera un acta estructurada basándote en la agenda proporcionada.
-
+    prompt = """Eres un asistente experto en análisis de reuniones institucionales. Analiza la siguiente transcripción de una reunión y genera un acta estructurada basándote en la agenda proporcionada.
+"""
+    
+    if agenda_slices:
+        prompt += """
+TRANSCRIPCIÓN DE LA REUNIÓN POR PUNTO DE LA AGENDA:
+"""
+        for agenda_slice in agenda_slices:
+            prompt += f"""
+### {format_slice_header(agenda_slice)}
+{agenda_slice["text"]}
+"""
+    else:
+        prompt += f"""
 TRANSCRIPCIÓN DE LA REUNIÓN:
 {transcription}
 """
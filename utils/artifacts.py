@@ -0,0 +1,74 @@
+"""
+Módulo de almacén en memoria de documentos generados, por sesión
+
+Cada acta generada se guarda con una clave derivada de su contenido
+(análisis, información de la reunión, anexo y plantilla). Si se vuelve a
+generar con las mismas entradas, se sirven los bytes ya generados.
+"""
+import hashlib
+import json
+from collections import OrderedDict
+
+
+# Actas guardadas por sesión (las más antiguas se descartan)
+MAX_ARTIFACTS = 5
+
+
+def artifact_key(*parts):
+    """
+    Clave de contenido (SHA-256) de un conjunto de entradas serializables
+
+    Args:
+        *parts: Entradas del documento (dicts, listas, textos, flags)
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_artifact(store, key):
+    """
+    Busca un documento ya generado
+
+    Args:
+        store: Almacén de la sesión (OrderedDict)
+        key: Clave de contenido
+
+    Returns:
+        dict: {"filename", "data"} o None si no existe
+    """
+    artifact = store.get(key)
+    if artifact is not None:
+        store.move_to_end(key)
+    return artifact
+
+
+def put_artifact(store, key, filename, data, max_items=MAX_ARTIFACTS):
+    """
+    Guarda un documento generado y descarta los más antiguos
+
+    Args:
+        store: Almacén de la sesión (OrderedDict)
+        key: Clave de contenido
+        filename: Nombre de descarga
+        data: Bytes del documento
+        max_items: Máximo de documentos por sesión
+
+    Returns:
+        dict: El artefacto guardado
+    """
+    store[key] = {"filename": filename, "data": data}
+    store.move_to_end(key)
+    while len(store) > max_items:
+        store.popitem(last=False)
+    return store[key]
+
+
+def new_store():
+    """Almacén vacío para una sesión"""
+    return OrderedDict()
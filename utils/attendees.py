@@ -0,0 +1,120 @@
+"""
+Módulo para importar listas de asistentes en bloque (CSV o texto pegado)
+"""
+import csv
+import io
+
+
+# Separadores aceptados entre nombre y cargo, en orden de preferencia
+SEPARATORS = ["\t", ";", ",", "|", " - "]
+
+# Encabezados reconocidos para las columnas de nombre y cargo
+NAME_HEADERS = {"nombre", "nombre completo", "asistente", "name"}
+ROLE_HEADERS = {"cargo", "cargo/rol", "rol", "puesto", "role"}
+
+
+def split_attendee_line(line):
+    """
+    Separa una línea "Nombre, Cargo" en sus dos partes
+
+    Args:
+        line: Línea de texto
+
+    Returns:
+        dict: {"nombre", "cargo"} o None si la línea está vacía
+    """
+    line = line.strip().lstrip("-•*").strip()
+    if not line:
+        return None
+
+    for separator in SEPARATORS:
+        if separator in line:
+            nombre, cargo = line.split(separator, 1)
+            return {"nombre": nombre.strip(), "cargo": cargo.strip()}
+
+    return {"nombre": line, "cargo": ""}
+
+
+def parse_attendee_text(text):
+    """
+    Lee una lista pegada, un asistente por línea ("Nombre, Cargo")
+
+    Args:
+        text: Texto pegado
+
+    Returns:
+        list: Asistentes {"nombre", "cargo"}
+    """
+    attendees = []
+    for line in text.splitlines():
+        attendee = split_attendee_line(line)
+        if attendee and attendee["nombre"]:
+            attendees.append(attendee)
+    return attendees
+
+
+def parse_attendee_csv(data):
+    """
+    Lee un CSV de asistentes (columnas nombre y cargo, con o sin encabezado)
+
+    Args:
+        data: Bytes o texto del archivo
+
+    Returns:
+        list: Asistentes {"nombre", "cargo"}
+    """
+    if isinstance(data, bytes):
+        try:
+            data = data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            data = data.decode("latin-1")
+
+    try:
+        dialect = csv.Sniffer().sniff(data[:4096], delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+
+    rows = [row for row in csv.reader(io.StringIO(data), dialect) if any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+
+    # Columnas por encabezado si lo hay; si no, las dos primeras
+    header = [cell.strip().lower() for cell in rows[0]]
+    name_col = next((i for i, h in enumerate(header) if h in NAME_HEADERS), None)
+    role_col = next((i for i, h in enumerate(header) if h in ROLE_HEADERS), None)
+    if name_col is not None:
+        rows = rows[1:]
+    else:
+        name_col, role_col = 0, 1
+
+    attendees = []
+    for row in rows:
+        nombre = row[name_col].strip() if name_col < len(row) else ""
+        cargo = row[role_col].strip() if role_col is not None and role_col < len(row) else ""
+        if nombre:
+            attendees.append({"nombre": nombre, "cargo": cargo})
+    return attendees
+
+
+def merge_attendees(current, new):
+    """
+    Agrega asistentes nuevos omitiendo los que ya están (por nombre)
+
+    Args:
+        current: Lista actual (se modifica)
+        new: Asistentes a agregar
+
+    Returns:
+        tuple: (agregados, omitidos por duplicado)
+    """
+    seen = {a["nombre"].casefold() for a in current}
+    added = skipped = 0
+    for attendee in new:
+        key = attendee["nombre"].casefold()
+        if key in seen:
+            skipped += 1
+            continue
+        seen.add(key)
+        current.append(attendee)
+        added += 1
+    return added, skipped
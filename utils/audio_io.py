@@ -0,0 +1,164 @@
+"""
+Módulo para manejo de archivos de audio subidos sin copias completas en memoria
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import numpy as np
+import streamlit as st
+
+
+# Tamaño de bloque para copiar el audio a disco (4 MB)
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Parámetros del audio de vista previa (mono, baja frecuencia de muestreo)
+PREVIEW_SAMPLE_RATE = 16000
+PREVIEW_BITRATE = "24k"
+
+
+def spool_upload(uploaded_file, chunk_size=CHUNK_SIZE, directory=None):
+    """
+    Copia un archivo subido a un temporal en disco por bloques de tamaño fijo
+
+    Streamlit ya tiene el archivo completo en memoria (ver maxUploadSize en
+    .streamlit/config.toml); copiarlo por bloques evita una segunda copia
+    completa (getvalue()) y deja en disco la ruta que usan ffmpeg y Whisper.
+
+    Args:
+        uploaded_file: Archivo subido con Streamlit (objeto tipo archivo)
+        chunk_size: Tamaño de cada bloque en bytes
+        directory: Directorio del temporal (default: el del sistema)
+
+    Returns:
+        tuple: (ruta del temporal, hash SHA-256 del contenido)
+    """
+    suffix = os.path.splitext(uploaded_file.name)[1] or ".audio"
+    digest = hashlib.sha256()
+
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=directory) as tmp:
+        while True:
+            chunk = uploaded_file.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            tmp.write(chunk)
+        tmp_path = tmp.name
+    uploaded_file.seek(0)
+
+    return tmp_path, digest.hexdigest()
+
+
+def make_preview_proxy(audio_path, output_path=None, bitrate=PREVIEW_BITRATE):
+    """
+    Genera una versión ligera del audio para la vista previa en el navegador
+
+    Usa ffmpeg (ya requerido por Whisper) para producir Opus mono a baja
+    tasa de bits; una grabación de 3 horas queda en unos 30 MB.
+
+    Args:
+        audio_path: Ruta al audio original en disco
+        output_path: Ruta .ogg de salida (default: un temporal)
+        bitrate: Tasa de bits de Opus
+
+    Returns:
+        str: Ruta del audio de vista previa, o None si no se pudo generar
+    """
+    if shutil.which("ffmpeg") is None:
+        return None
+
+    if output_path is None:
+        fd, output_path = tempfile.mkstemp(suffix=".ogg")
+        os.close(fd)
+    output_path = str(output_path)
+
+    try:
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-i", str(audio_path),
+                "-vn", "-ac", "1", "-ar", str(PREVIEW_SAMPLE_RATE),
+                "-c:a", "libopus", "-b:a", bitrate,
+                output_path
+            ],
+            check=True,
+            capture_output=True
+        )
+        return output_path
+
+    except Exception as e:
+        st.warning(f"No se pudo generar la vista previa del audio: {str(e)}")
+        remove_file(output_path)
+        return None
+
+
+def probe_duration(audio_path):
+    """
+    Duración del audio en segundos, leída con ffprobe sin decodificarlo
+
+    Args:
+        audio_path: Ruta al audio en disco
+
+    Returns:
+        float: Duración en segundos, o None si no se pudo leer
+    """
+    if shutil.which("ffprobe") is None:
+        return None
+
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                str(audio_path)
+            ],
+            check=True,
+            capture_output=True,
+            text=True
+        )
+        return float(result.stdout.strip())
+    except Exception:
+        return None
+
+
+def load_audio_clip(audio_path, seconds, start=0, sample_rate=PREVIEW_SAMPLE_RATE):
+    """
+    Decodifica solo un tramo del audio (como whisper.load_audio)
+
+    whisper.load_audio decodifica el archivo completo; para un tramo corto
+    basta con pedirle a ffmpeg esos segundos.
+
+    Args:
+        audio_path: Ruta al audio en disco
+        seconds: Segundos a decodificar
+        start: Segundo del audio donde empieza el tramo
+        sample_rate: Frecuencia de muestreo (Whisper usa 16 kHz)
+
+    Returns:
+        numpy.ndarray: Muestras float32 mono en [-1, 1]
+    """
+    result = subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error",
+            "-ss", str(start), "-t", str(seconds),
+            "-i", str(audio_path),
+            "-f", "s16le", "-ac", "1", "-ar", str(sample_rate),
+            "-"
+        ],
+        check=True,
+        capture_output=True
+    )
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def remove_file(path):
+    """Elimina un archivo temporal si existe, ignorando errores"""
+    if not path:
+        return
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -0,0 +1,286 @@
+"""
+Módulo de archivo de grabaciones: audio compacto, direccionado por contenido
+
+Cada grabación se transcodifica una sola vez a Opus mono de 16 kHz y se
+guarda en actas_data/audio/<sha256>/ junto a sus segmentos transcritos.
+Al transcodificar se indexan las páginas Ogg del archivo (posición en
+bytes y tiempo de cada página), de modo que cualquier tramo se puede
+servir leyendo solo los bytes de ese tramo, sin decodificar nada.
+"""
+import json
+import os
+import struct
+import tempfile
+import streamlit as st
+
+from .audio_io import make_preview_proxy, remove_file
+from .checkpoints import DATA_DIR
+
+
+AUDIO_DIR = DATA_DIR / "audio"
+
+# Tasa de bits del archivo (voz mono de 16 kHz; 3 horas ≈ 43 MB)
+ARCHIVE_BITRATE = "32k"
+
+# Tramo que se sirve al saltar a un instante: un poco antes y dos minutos después
+SPAN_LEAD_SECONDS = 5
+SPAN_SECONDS = 120
+
+# Opus siempre expresa la posición (granule) en muestras de 48 kHz
+OPUS_GRANULE_RATE = 48000
+
+# Encabezado fijo de una página Ogg: "OggS", versión, tipo, granule,
+# serie, secuencia, CRC y número de segmentos
+OGG_HEADER = struct.Struct("<4sBBqIIIB")
+
+# Banderas del tipo de página
+OGG_CONTINUED = 0x01
+OGG_END_OF_STREAM = 0x04
+
+
+def _crc_table():
+    table = []
+    for byte in range(256):
+        crc = byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else crc << 1
+        table.append(crc & 0xFFFFFFFF)
+    return table
+
+
+_CRC_TABLE = _crc_table()
+
+
+def ogg_crc(data):
+    """CRC-32 de una página Ogg (polinomio 0x04C11DB7, sin reflejar)"""
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ _CRC_TABLE[((crc >> 24) & 0xFF) ^ byte]
+    return crc
+
+
+def read_ogg_pages(path):
+    """
+    Recorre las páginas de un archivo Ogg leyendo solo sus encabezados
+
+    Args:
+        path: Ruta al archivo .ogg
+
+    Yields:
+        tuple: (offset, longitud, granule, tipo)
+    """
+    with open(path, "rb") as f:
+        offset = 0
+        while True:
+            header = f.read(OGG_HEADER.size)
+            if len(header) < OGG_HEADER.size:
+                break
+            capture, _, header_type, granule, _, _, _, n_segments = OGG_HEADER.unpack(header)
+            if capture != b"OggS":
+                raise ValueError(f"Página Ogg inválida en el byte {offset}")
+            body_size = sum(f.read(n_segments))
+            length = OGG_HEADER.size + n_segments + body_size
+            yield offset, length, granule, header_type
+            f.seek(body_size, os.SEEK_CUR)
+            offset += length
+
+
+def opus_pre_skip(path):
+    """Muestras iniciales que el decodificador descarta (campo pre-skip de OpusHead)"""
+    with open(path, "rb") as f:
+        data = f.read(512)
+    position = data.find(b"OpusHead")
+    if position < 0:
+        raise ValueError("El archivo no es Ogg Opus")
+    return struct.unpack_from("<H", data, position + 10)[0]
+
+
+def build_page_index(path):
+    """
+    Índice de páginas de un archivo Ogg Opus
+
+    Args:
+        path: Ruta al archivo .ogg
+
+    Returns:
+        dict: {"pre_skip", "header_pages", "pages": [[offset, longitud, granule, tipo], ...]}
+    """
+    pages = [list(page) for page in read_ogg_pages(path)]
+
+    # Las primeras páginas (OpusHead y OpusTags) no llevan audio: granule 0
+    header_pages = 0
+    while header_pages < len(pages) and pages[header_pages][2] == 0:
+        header_pages += 1
+
+    return {"pre_skip": opus_pre_skip(path), "header_pages": header_pages, "pages": pages}
+
+
+def page_time(index, granule):
+    """Segundos de audio hasta una posición (granule) del archivo"""
+    return max(0.0, (granule - index["pre_skip"]) / OPUS_GRANULE_RATE)
+
+
+def entry_dir(sha256):
+    """Directorio de una grabación en el archivo"""
+    return AUDIO_DIR / sha256
+
+
+def _write_json(path, data):
+    """Escritura atómica de un JSON (con un temporal propio de cada escritor)"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".json.tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        remove_file(tmp_path)
+        raise
+
+
+def ingest_audio(audio_path, sha256):
+    """
+    Archiva una grabación (si no estaba ya) y devuelve su entrada
+
+    El contenido se identifica por su hash: subir el mismo archivo otra vez
+    no lo vuelve a transcodificar.
+
+    Args:
+        audio_path: Ruta al audio original en disco
+        sha256: Hash del contenido original (ver spool_upload)
+
+    Returns:
+        dict: Entrada del archivo (ver get_archived_audio), o None si no se pudo archivar
+    """
+    directory = entry_dir(sha256)
+    if (directory / "index.json").exists():
+        return get_archived_audio(sha256)
+
+    tmp_audio = None
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Temporal propio: dos sesiones pueden archivar el mismo audio a la vez
+        fd, tmp_audio = tempfile.mkstemp(dir=directory, suffix=".ogg")
+        os.close(fd)
+        if make_preview_proxy(audio_path, tmp_audio, ARCHIVE_BITRATE) is None:
+            return None
+
+        # Otra sesión terminó antes: se usa su entrada y se descarta la nuestra
+        if (directory / "index.json").exists():
+            return get_archived_audio(sha256)
+
+        index = build_page_index(tmp_audio)
+        index["original_bytes"] = os.path.getsize(audio_path)
+        os.replace(tmp_audio, directory / "audio.ogg")
+        tmp_audio = None
+
+        # El índice se escribe al final: su presencia marca una entrada completa
+        _write_json(directory / "index.json", index)
+        return get_archived_audio(sha256)
+
+    except Exception as e:
+        st.warning(f"No se pudo archivar el audio: {str(e)}")
+        return None
+
+    finally:
+        remove_file(tmp_audio)
+
+
+def get_archived_audio(sha256):
+    """
+    Entrada de una grabación archivada
+
+    Returns:
+        dict: {"sha256", "path", "duration", "bytes", "original_bytes"}, o
+              None si no está archivada
+    """
+    directory = entry_dir(sha256)
+    if not (directory / "index.json").exists():
+        return None
+
+    index = load_page_index(sha256)
+    last_granule = index["pages"][-1][2] if index["pages"] else 0
+    audio_file = directory / "audio.ogg"
+    return {
+        "sha256": sha256,
+        "path": str(audio_file),
+        "duration": page_time(index, last_granule),
+        "bytes": audio_file.stat().st_size,
+        "original_bytes": index.get("original_bytes")
+    }
+
+
+@st.cache_data(show_spinner=False)
+def load_page_index(sha256):
+    """Índice de páginas de una grabación (no cambia nunca: se cachea)"""
+    with open(entry_dir(sha256) / "index.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_span(sha256, start, end):
+    """
+    Tramo de la grabación como un Ogg Opus independiente y reproducible
+
+    Se leen solo los bytes de las páginas de encabezado y de las páginas
+    que cubren [start, end]. Las páginas del tramo se renumeran y sus
+    posiciones se desplazan para que el tramo empiece en 0.
+
+    Args:
+        sha256: Hash de la grabación
+        start: Segundo de inicio
+        end: Segundo de fin
+
+    Returns:
+        tuple: (bytes del .ogg, segundo real de inicio del tramo)
+    """
+    index = load_page_index(sha256)
+    pages = index["pages"]
+    first_audio = index["header_pages"]
+
+    # Primera página que empieza antes de start y no continúa un paquete anterior
+    first = first_audio
+    for i in range(first_audio, len(pages)):
+        previous_granule = pages[i - 1][2] if i > first_audio else index["pre_skip"]
+        if page_time(index, previous_granule) > start:
+            break
+        if not pages[i][3] & OGG_CONTINUED:
+            first = i
+
+    last = first
+    while last < len(pages) - 1 and page_time(index, pages[last][2]) < end:
+        last += 1
+
+    # Desplazamiento de posiciones: el tramo empieza en pre_skip, como un archivo nuevo
+    shift = pages[first - 1][2] - index["pre_skip"] if first > first_audio else 0
+
+    chunks = []
+    with open(entry_dir(sha256) / "audio.ogg", "rb") as f:
+        for offset, length, _, _ in pages[:first_audio]:
+            f.seek(offset)
+            chunks.append(f.read(length))
+
+        for i in range(first, last + 1):
+            offset, length, granule, header_type = pages[i]
+            f.seek(offset)
+            page = bytearray(f.read(length))
+            if granule != -1:
+                struct.pack_into("<q", page, 6, granule - shift)
+            page[5] = header_type | OGG_END_OF_STREAM if i == last else header_type & ~OGG_END_OF_STREAM
+            struct.pack_into("<I", page, 18, first_audio + i - first)
+            struct.pack_into("<I", page, 22, 0)
+            struct.pack_into("<I", page, 22, ogg_crc(page))
+            chunks.append(bytes(page))
+
+    return b"".join(chunks), shift / OPUS_GRANULE_RATE
+
+
+def save_segments(sha256, segments):
+    """Guarda los segmentos transcritos junto a su grabación"""
+    directory = entry_dir(sha256)
+    if not directory.exists():
+        return
+    try:
+        _write_json(directory / "segments.json", segments)
+    except Exception as e:
+        st.warning(f"No se pudieron archivar los segmentos: {str(e)}")
+
@@ -0,0 +1,278 @@
+"""
+Módulo para elegir modelos según el plazo de entrega deseado
+
+Mide en esta máquina el factor de tiempo real (RTF: segundos de cómputo
+por segundo de audio) de cada modelo Whisper con una muestra corta del
+audio, y la velocidad de generación del modelo de análisis. Con eso y la
+duración de la grabación se elige el modelo Whisper más grande y el
+presupuesto de tokens más amplio que cumplen el plazo. Las mediciones se
+guardan en disco y solo se repiten si cambia la máquina.
+"""
+import json
+import os
+import platform
+import time
+import torch
+import streamlit as st
+
+from .analysis import MAX_NEW_TOKENS, TRANSCRIPT_TOKEN_BUDGET
+from .checkpoints import DATA_DIR
+from .workers import WORKERS, THREADS_PER_WORKER, available_cores, run_job
+
+
+# Opción del selector de modelo que activa la elección automática
+AUTO_MODEL = "automático"
+
+# Modelos Whisper candidatos, de menor a mayor
+WHISPER_MODELS = ["tiny", "base", "small", "medium"]
+
+# Plazo objetivo por defecto para tener el acta lista (minutos)
+TARGET_MINUTES = float(os.environ.get("ACTAS_TARGET_MINUTES", "20"))
+
+# Fracción del plazo que se planifica (el resto es margen de error)
+SAFETY_MARGIN = 0.85
+
+# Fracción del plazo reservada para transcribir cuando hay audio
+WHISPER_SHARE = 0.75
+
+# Segundos de audio de la muestra de calibración
+CALIBRATION_CLIP_SECONDS = 30
+
+# Presupuesto de tokens del análisis: nunca menos que esto (el acta quedaría incompleta)
+MIN_NEW_TOKENS = 400
+
+# Tokens aproximados del prompt completo de análisis (transcripción + instrucciones)
+PROMPT_TOKENS = TRANSCRIPT_TOKEN_BUDGET + 1000
+
+CALIBRATION_PATH = DATA_DIR / "calibration.json"
+
+
+def machine_fingerprint():
+    """
+    Identifica la configuración de cómputo a la que corresponden las mediciones
+
+    Returns:
+        str: Equipo, núcleos, dispositivo y modo réplicas
+    """
+    device = torch.cuda.get_device_name(0) if torch.cuda.is_available() else "cpu"
+    return f"{platform.node()}|{len(available_cores())} núcleos|{device}|réplicas={WORKERS}x{THREADS_PER_WORKER}"
+
+
+def load_calibration():
+    """
+    Mediciones guardadas para esta máquina
+
+    Returns:
+        dict: {"whisper": {modelo: RTF}, "llm": {...}}
+    """
+    try:
+        with open(CALIBRATION_PATH, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+
+    calibration = saved.get(machine_fingerprint(), {})
+    calibration.setdefault("whisper", {})
+    calibration.setdefault("llm", {})
+    return calibration
+
+
+def save_calibration(calibration):
+    """Guarda las mediciones de esta máquina (escritura atómica)"""
+    try:
+        with open(CALIBRATION_PATH, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+
+    saved[machine_fingerprint()] = calibration
+
+    try:
+        CALIBRATION_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = CALIBRATION_PATH.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(saved, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, CALIBRATION_PATH)
+    except Exception as e:
+        st.warning(f"No se pudo guardar la calibración: {str(e)}")
+
+
+def measure_whisper_rtf(model_size, audio_path, clip_seconds=CALIBRATION_CLIP_SECONDS,
+                        language="es", progress_callback=None):
+    """
+    Mide el RTF de un modelo Whisper transcribiendo el inicio del audio
+
+    La carga del modelo no se cuenta: se hace una vez y queda en caché.
+
+    Args:
+        model_size: Tamaño del modelo Whisper
+        audio_path: Ruta al audio en disco
+        clip_seconds: Segundos de audio a transcribir
+        language: Idioma del audio
+        progress_callback: No se usa (lo agrega el pool de réplicas)
+
+    Returns:
+        float: Segundos de cómputo por segundo de audio, o None si falló
+    """
+    from .audio_io import load_audio_clip, PREVIEW_SAMPLE_RATE
+    from .transcription import load_whisper_model
+
+    model = load_whisper_model(model_size)
+    if model is None:
+        return None
+
+    clip = load_audio_clip(audio_path, clip_seconds)
+    duration = len(clip) / PREVIEW_SAMPLE_RATE
+    if duration < 1:
+        return None
+
+    started = time.perf_counter()
+    model.transcribe(clip, language=language, fp16=torch.cuda.is_available())
+    return (time.perf_counter() - started) / duration
+
+
+def measure_llm_speed(prompt_tokens=512, new_tokens=32, progress_callback=None):
+    """
+    Mide la velocidad del modelo de análisis: lectura del prompt y generación
+
+    Se genera dos veces sobre el mismo prompt (1 token y 1 + new_tokens);
+    la diferencia aísla el costo por token generado.
+
+    Args:
+        prompt_tokens: Tokens del prompt de prueba
+        new_tokens: Tokens generados para medir la velocidad de generación
+        progress_callback: No se usa (lo agrega el pool de réplicas)
+
+    Returns:
+        dict: {"prefill_tokens_per_second", "decode_tokens_per_second"}, o None
+    """
+    from .analysis import load_phi4_model
+
+    model, tokenizer = load_phi4_model()
+    if model is None or tokenizer is None:
+        return None
+
+    inputs = tokenizer("acta de reunión " * prompt_tokens, return_tensors="pt",
+                       truncation=True, max_length=prompt_tokens)
+    inputs = {k: v.to(model.device) for k, v in inputs.items()}
+
+    def timed_generate(n_tokens):
+        started = time.perf_counter()
+        with torch.no_grad():
+            model.generate(**inputs, max_new_tokens=n_tokens, min_new_tokens=n_tokens, do_sample=False)
+        return time.perf_counter() - started
+
+    prefill = timed_generate(1)
+    total = timed_generate(1 + new_tokens)
+
+    return {
+        "prefill_tokens_per_second": inputs["input_ids"].shape[-1] / max(prefill, 1e-6),
+        "decode_tokens_per_second": new_tokens / max(total - prefill, 1e-6)
+    }
+
+
+def choose_whisper_model(audio_seconds, budget_seconds, rtfs, models=WHISPER_MODELS):
+    """
+    Modelo Whisper más grande cuya transcripción cabe en el plazo
+
+    Args:
+        audio_seconds: Duración de la grabación
+        budget_seconds: Plazo para transcribir
+        rtfs: RTF medido por modelo
+        models: Modelos candidatos, de menor a mayor
+
+    Returns:
+        tuple: (modelo, segundos estimados); el más pequeño si ninguno cabe
+    """
+    measured = [m for m in models if m in rtfs]
+    if not measured:
+        return models[0], None
+
+    chosen = measured[0]
+    for model_size in measured:
+        if rtfs[model_size] * audio_seconds <= budget_seconds * SAFETY_MARGIN:
+            chosen = model_size
+    return chosen, rtfs[chosen] * audio_seconds
+
+
+def choose_max_new_tokens(budget_seconds, speed, max_new_tokens=MAX_NEW_TOKENS, prompt_tokens=PROMPT_TOKENS):
+    """
+    Presupuesto de tokens a generar que cabe en el plazo del análisis
+
+    Args:
+        budget_seconds: Plazo para el análisis
+        speed: Velocidades medidas (ver measure_llm_speed)
+        max_new_tokens: Máximo absoluto
+        prompt_tokens: Tokens estimados del prompt
+
+    Returns:
+        tuple: (tokens, segundos estimados)
+    """
+    prefill_seconds = prompt_tokens / speed["prefill_tokens_per_second"]
+    available = budget_seconds * SAFETY_MARGIN - prefill_seconds
+    tokens = int(available * speed["decode_tokens_per_second"])
+    tokens = max(MIN_NEW_TOKENS, min(max_new_tokens, tokens))
+    return tokens, prefill_seconds + tokens / speed["decode_tokens_per_second"]
+
+
+def select_whisper_model(audio_path, audio_seconds, budget_seconds, models=WHISPER_MODELS):
+    """
+    Calibra lo necesario y elige el modelo Whisper para este audio
+
+    Se mide de menor a mayor y se detiene en el primer modelo que ya no
+    cabe en el plazo: los más grandes serán aún más lentos, y así la
+    calibración nunca cuesta más que un par de muestras cortas.
+
+    Args:
+        audio_path: Ruta al audio en disco
+        audio_seconds: Duración de la grabación
+        budget_seconds: Plazo para transcribir
+        models: Modelos candidatos, de menor a mayor
+
+    Returns:
+        tuple: (modelo, segundos estimados)
+    """
+    calibration = load_calibration()
+    rtfs = calibration["whisper"]
+
+    for model_size in models:
+        if model_size not in rtfs:
+            try:
+                rtf = run_job("calibrate_whisper", model_size=model_size, audio_path=audio_path)
+            except Exception as e:
+                st.warning(f"No se pudo calibrar Whisper {model_size}: {str(e)}")
+                rtf = None
+            if rtf is None:
+                break
+            rtfs[model_size] = rtf
+            save_calibration(calibration)
+        if rtfs[model_size] * audio_seconds > budget_seconds * SAFETY_MARGIN:
+            break
+
+    return choose_whisper_model(audio_seconds, budget_seconds, rtfs, models)
+
+
+def select_max_new_tokens(budget_seconds, max_new_tokens=MAX_NEW_TOKENS):
+    """
+    Calibra si hace falta y elige el presupuesto de tokens del análisis
+
+    Args:
+        budget_seconds: Plazo para el análisis
+        max_new_tokens: Máximo absoluto
+
+    Returns:
+        tuple: (tokens, segundos estimados), o (max_new_tokens, None) si no se pudo medir
+    """
+    calibration = load_calibration()
+    if not calibration["llm"]:
+        try:
+            speed = run_job("calibrate_llm")
+        except Exception as e:
+            st.warning(f"No se pudo calibrar el modelo de análisis: {str(e)}")
+            speed = None
+        if not speed:
+            return max_new_tokens, None
+        calibration["llm"] = speed
+        save_calibration(calibration)
+
+    return choose_max_new_tokens(budget_seconds, calibration["llm"], max_new_tokens)
@@ -0,0 +1,151 @@
+"""
+Módulo para checkpoints en disco del estado de cada reunión
+"""
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+import streamlit as st
+
+
+# Directorio raíz de datos persistentes (configurable por variable de entorno)
+DATA_DIR = Path(os.environ.get("ACTAS_DATA_DIR", "actas_data"))
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"
+
+# Etapas del pipeline que se guardan, en orden
+STAGES = ["meeting_info", "transcription", "analysis", "acta"]
+
+
+def new_meeting_id():
+    """
+    Genera un identificador único para una reunión
+
+    Returns:
+        str: Identificador con fecha y sufijo aleatorio
+    """
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def save_checkpoint(meeting_id, stage, data):
+    """
+    Guarda el resultado de una etapa del pipeline en disco
+
+    La escritura es atómica (archivo temporal + rename) para que un
+    reinicio a mitad de escritura nunca deje un checkpoint corrupto.
+
+    Args:
+        meeting_id: Identificador de la reunión
+        stage: Etapa del pipeline (meeting_info, transcription, analysis)
+        data: Datos serializables en JSON
+
+    Returns:
+        Path: Ruta del checkpoint guardado
+    """
+    try:
+        meeting_dir = CHECKPOINT_DIR / meeting_id
+        meeting_dir.mkdir(parents=True, exist_ok=True)
+
+        path = meeting_dir / f"{stage}.json"
+        tmp_path = path.with_suffix(".json.tmp")
+
+        payload = {
+            "stage": stage,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "data": data
+        }
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        return path
+
+    except Exception as e:
+        st.warning(f"No se pudo guardar el checkpoint: {str(e)}")
+        return None
+
+
+def load_checkpoint(meeting_id):
+    """
+    Carga el último estado guardado de una reunión
+
+    Args:
+        meeting_id: Identificador de la reunión
+
+    Returns:
+        dict: Datos por etapa (solo las etapas guardadas)
+    """
+    state = {}
+    meeting_dir = CHECKPOINT_DIR / meeting_id
+
+    for stage in STAGES:
+        path = meeting_dir / f"{stage}.json"
+        if not path.exists():
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state[stage] = json.load(f)["data"]
+        except Exception as e:
+            st.warning(f"Checkpoint '{stage}' ilegible: {str(e)}")
+
+    return state
+
+
+def list_meetings():
+    """
+    Lista las reuniones con checkpoints, de la más reciente a la más antigua
+
+    Returns:
+        list: Diccionarios con meeting_id, updated_at, etapas y datos básicos
+    """
+    meetings = []
+    if not CHECKPOINT_DIR.exists():
+        return meetings
+
+    for meeting_dir in CHECKPOINT_DIR.iterdir():
+        if not meeting_dir.is_dir():
+            continue
+
+        stage_files = [meeting_dir / f"{stage}.json" for stage in STAGES]
+        stage_files = [p for p in stage_files if p.exists()]
+        if not stage_files:
+            continue
+
+        info = {}
+        info_path = meeting_dir / "meeting_info.json"
+        if info_path.exists():
+            try:
+                with open(info_path, "r", encoding="utf-8") as f:
+                    info = json.load(f)["data"]
+            except Exception:
+                info = {}
+
+        meetings.append({
+            "meeting_id": meeting_dir.name,
+            "updated_at": max(p.stat().st_mtime for p in stage_files),
+            "stages": [p.stem for p in stage_files],
+            "numero_acta": info.get("numero_acta", ""),
+            "comite": info.get("comite", ""),
+            "fecha": info.get("fecha", "")
+        })
+
+    meetings.sort(key=lambda m: m["updated_at"], reverse=True)
+    return meetings
+
+
+def describe_meeting(meeting):
+    """
+    Etiqueta legible de una reunión para el selector de reanudación
+
+    Args:
+        meeting: Diccionario devuelto por list_meetings
+
+    Returns:
+        str: Etiqueta con número de acta, comité, fecha y última etapa
+    """
+    numero = meeting.get("numero_acta") or "s/n"
+    comite = meeting.get("comite") or "Sin comité"
+    fecha = meeting.get("fecha") or ""
+    stage = meeting["stages"][-1] if meeting.get("stages") else ""
+    updated = datetime.fromtimestamp(meeting["updated_at"]).strftime("%d/%m %H:%M")
+    return f"Acta {numero} · {comite} · {fecha} ({stage}, {updated})"
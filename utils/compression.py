@@ -0,0 +1,210 @@
+"""
+Módulo para limpiar y comprimir transcripciones antes del análisis
+"""
+import re
+
+from .retrieval import estimate_tokens
+
+
+# Configuración por defecto de la compresión
+DEFAULT_CONFIG = {
+    "remove_fillers": True,        # Muletillas: "eh", "mmm", ", este,", "o sea,"...
+    "collapse_repetitions": True,  # "el el el" → "el", "vamos a vamos a" → "vamos a"
+    "remove_loops": True,          # Segmentos repetidos en bucle por Whisper
+    "max_ngram": 6                 # Longitud máxima de frase repetida a colapsar
+}
+
+# Sonidos de duda: se eliminan siempre (no "em" ni "m": pueden ser nombres)
+HESITATIONS = r"e+h+|m{2,}h*|a+h+|u+h+|ajá|aja"
+
+# Marcadores discursivos: solo se eliminan entre pausas (comas o inicio de frase),
+# para no borrar usos con significado como "este proyecto" o "pues bien"
+DISCOURSE_MARKERS = [
+    "este", "o sea", "pues", "digamos", "a ver", "eh",
+    "¿no\\?", "¿verdad\\?", "¿sí\\?", "como que"
+]
+
+# Marcadores que también son respuestas o acuerdos ("Vale, lo aprobamos",
+# "Bueno, sí"): solo se eliminan a mitad de frase, entre dos comas
+CLAUSE_MARKERS = ["bueno", "vale"]
+
+# Palabras que nunca se colapsan al repetirse: en "no, no, no se aprueba"
+# o "sí, sí, no" cada aparición cuenta (votos, negaciones, cifras)
+PROTECTED_WORDS = {
+    "no", "sí", "si", "uno", "una", "dos", "tres", "cuatro", "cinco", "seis",
+    "siete", "ocho", "nueve", "diez", "cien", "mil"
+}
+
+_HESITATION_RE = re.compile(rf"(?<!\w)(?:{HESITATIONS})(?!\w)[,.]?\s*(\w?)", re.IGNORECASE)
+_MARKER_RE = re.compile(
+    rf"(^|[,.;:¿?!]\s*)(?:{'|'.join(DISCOURSE_MARKERS)})\s*,\s*(\w?)",
+    re.IGNORECASE
+)
+_CLAUSE_MARKER_RE = re.compile(rf"(,\s*)(?:{'|'.join(CLAUSE_MARKERS)})\s*,\s*", re.IGNORECASE)
+_TRAILING_MARKER_RE = re.compile(r",\s*(?:¿no\?|¿verdad\?|¿sí\?)", re.IGNORECASE)
+
+
+def _restore_case(before, following):
+    """Primera letra tras quitar una muletilla: en mayúscula si abre la oración"""
+    before = before.rstrip()
+    if not before or before[-1] in ".!?¿":
+        return following.upper()
+    return following
+
+
+def remove_fillers(text):
+    """
+    Elimina muletillas y sonidos de duda
+
+    Si la muletilla abría la oración, la palabra siguiente pasa a mayúscula.
+
+    Args:
+        text: Texto de la transcripción
+
+    Returns:
+        str: Texto sin muletillas
+    """
+    text = _HESITATION_RE.sub(
+        lambda m: _restore_case(m.string[:m.start()], m.group(1)), text
+    )
+
+    # Marcadores seguidos ("o sea, este, vamos") se quitan de uno en uno
+    previous = None
+    while text != previous:
+        previous = text
+        text = _MARKER_RE.sub(
+            lambda m: m.group(1) + _restore_case(m.string[:m.start()] + m.group(1), m.group(2)), text
+        )
+        text = _CLAUSE_MARKER_RE.sub(lambda m: m.group(1), text)
+    text = _TRAILING_MARKER_RE.sub(".", text)
+    return re.sub(r"\s{2,}", " ", text).strip()
+
+
+def is_protected(key):
+    """Indica si una palabra (normalizada) no debe colapsarse al repetirse"""
+    return key in PROTECTED_WORDS or any(c.isdigit() for c in key)
+
+
+def collapse_repetitions(text, max_ngram=DEFAULT_CONFIG["max_ngram"]):
+    """
+    Colapsa palabras y frases repetidas de forma consecutiva
+
+    Las repeticiones que contienen negaciones, votos o cifras (ver
+    PROTECTED_WORDS) o palabras con mayúscula (apellidos como "García
+    García") se conservan.
+
+    Args:
+        text: Texto de la transcripción
+        max_ngram: Longitud máxima (en palabras) de la frase repetida
+
+    Returns:
+        str: Texto con cada repetición consecutiva reducida a una aparición
+    """
+    words = text.split()
+    keys = [re.sub(r"[^\w]", "", w.lower()) for w in words]
+
+    out_words, out_keys = [], []
+    for word, key in zip(words, keys):
+        out_words.append(word)
+        out_keys.append(key)
+
+        # Si las últimas n palabras repiten las n anteriores, quitar la copia
+        for n in range(1, max_ngram + 1):
+            if len(out_keys) >= 2 * n and out_keys[-n:] == out_keys[-2 * n:-n] and any(out_keys[-n:]):
+                if any(is_protected(k) for k in out_keys[-n:]) or any(w[:1].isupper() for w in out_words[-n:]):
+                    continue
+                del out_words[-n:]
+                del out_keys[-n:]
+                break
+
+    return " ".join(out_words)
+
+
+def compress_segments(segments, config=None):
+    """
+    Limpia el texto de cada segmento y elimina los bucles de Whisper
+
+    Los tiempos y metadatos de los segmentos se conservan; solo cambia el
+    texto. Un segmento que repite exactamente al anterior se descarta.
+
+    Args:
+        segments: Segmentos de Whisper
+        config: Opciones (ver DEFAULT_CONFIG)
+
+    Returns:
+        list: Nuevos segmentos comprimidos (los originales no se modifican)
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    compressed = []
+    previous_key = None
+
+    for segment in segments:
+        text = compress_text(segment["text"], config)
+        key = re.sub(r"[^\w]", "", text.lower())
+
+        if not key:
+            continue
+        if config["remove_loops"] and key == previous_key:
+            continue
+
+        compressed.append({**segment, "text": " " + text})
+        previous_key = key
+
+    return compressed
+
+
+def compress_text(text, config=None):
+    """
+    Aplica la limpieza configurada a un texto
+
+    Args:
+        text: Texto a limpiar
+        config: Opciones (ver DEFAULT_CONFIG)
+
+    Returns:
+        str: Texto limpio
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+
+    if config["remove_fillers"]:
+        text = remove_fillers(text)
+    if config["collapse_repetitions"]:
+        text = collapse_repetitions(text, config["max_ngram"])
+    if config["remove_loops"]:
+        # Oraciones idénticas consecutivas dentro del mismo texto
+        text = re.sub(r"([^.!?]{10,}[.!?])(\s*\1)+", r"\1", text)
+
+    return text.strip()
+
+
+def compress_transcript(transcription, segments=None, config=None, count_tokens=estimate_tokens):
+    """
+    Comprime la transcripción y reporta la reducción de tokens
+
+    Args:
+        transcription: Texto completo de la transcripción
+        segments: Segmentos de Whisper (opcional); si se dan, el texto se
+                  reconstruye a partir de los segmentos comprimidos
+        config: Opciones (ver DEFAULT_CONFIG)
+        count_tokens: Función que cuenta tokens de un texto
+
+    Returns:
+        dict: text, segments, tokens_before, tokens_after y reduction (0-1)
+    """
+    if segments:
+        compressed_segments = compress_segments(segments, config)
+        text = "".join(s["text"] for s in compressed_segments).strip()
+    else:
+        compressed_segments = []
+        text = compress_text(transcription, config)
+
+    tokens_before = count_tokens(transcription)
+    tokens_after = count_tokens(text)
+
+    return {
+        "text": text,
+        "segments": compressed_segments,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "reduction": 1 - tokens_after / tokens_before if tokens_before else 0.0
+    }
@@ -1,12 +1,164 @@
 """
 Módulo para generación de documentos Word (actas)
 """
+import copy
+import io
+import itertools
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape
 from docx import Document
-from docx.shared import Pt, RGBColor, Inches
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import Pt, RGBColor, Inches, Length
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from datetime import datetime
 import streamlit as st
 
+from .segments import format_timestamp
+
+
+# Plantilla institucional opcional (.docx); sin ella se usa la plantilla por defecto
+TEMPLATE_PATH = os.environ.get("ACTAS_TEMPLATE", "")
+
+# Color institucional de títulos y encabezados de tabla
+COLOR_INSTITUCIONAL = RGBColor(31, 78, 121)
+
+# Estilo de las tablas
+TABLE_STYLE = "Light Grid Accent 1"
+
+# Marcador del lugar donde save_document inserta los párrafos del anexo
+ANNEX_BOOKMARK = "actas_anexo"
+ANNEX_BOOKMARK_ID = 9999
+
+# Estilos del acta: nombre en la plantilla → (tipo, estilo base, formato)
+ACTA_STYLES = {
+    "Acta Título": (WD_STYLE_TYPE.PARAGRAPH, "Title", {
+        "size": Pt(16), "bold": True, "alignment": WD_PARAGRAPH_ALIGNMENT.CENTER
+    }),
+    "Acta Comité": (WD_STYLE_TYPE.PARAGRAPH, "Normal", {
+        "size": Pt(12), "bold": True, "alignment": WD_PARAGRAPH_ALIGNMENT.CENTER
+    }),
+    "Acta Sección": (WD_STYLE_TYPE.PARAGRAPH, "Heading 1", {
+        "size": Pt(14), "color": COLOR_INSTITUCIONAL
+    }),
+    "Acta Texto": (WD_STYLE_TYPE.PARAGRAPH, "Normal", {
+        "alignment": WD_PARAGRAPH_ALIGNMENT.JUSTIFY, "space_after": Pt(12), "line_spacing": 1.15
+    }),
+    "Acta Agenda": (WD_STYLE_TYPE.PARAGRAPH, "List Number", {
+        "left_indent": Inches(0.25)
+    }),
+    "Acta Viñeta": (WD_STYLE_TYPE.PARAGRAPH, "List Bullet", {
+        "left_indent": Inches(0.25)
+    }),
+    "Acta Etiqueta": (WD_STYLE_TYPE.PARAGRAPH, "Normal", {
+        "bold": True
+    }),
+    "Acta Encabezado Tabla": (WD_STYLE_TYPE.PARAGRAPH, "Normal", {
+        "bold": True, "color": COLOR_INSTITUCIONAL
+    }),
+    "Acta Anexo": (WD_STYLE_TYPE.PARAGRAPH, "Normal", {
+        "size": Pt(9), "color": RGBColor(89, 89, 89), "line_spacing": 1.0
+    }),
+}
+
+
+def ensure_acta_styles(doc):
+    """
+    Agrega a un documento los estilos del acta que le falten
+
+    Una plantilla institucional puede definir cualquiera de los estilos de
+    ACTA_STYLES con su propio formato; solo se crean los que no existan.
+    Una plantilla de Word solo guarda los estilos que usa: si falta el
+    estilo base ("List Number", "Title", ...), se hereda de Normal.
+
+    Args:
+        doc: Documento de python-docx (la plantilla)
+    """
+    styles = doc.styles
+    existing = {style.name for style in styles}
+
+    for name, (style_type, base, fmt) in ACTA_STYLES.items():
+        if name in existing:
+            continue
+
+        style = styles.add_style(name, style_type)
+        if base not in existing:
+            base = "Normal"
+        if base in existing:
+            style.base_style = styles[base]
+        style.quick_style = True
+
+        if "size" in fmt:
+            style.font.size = fmt["size"]
+        if "bold" in fmt:
+            style.font.bold = fmt["bold"]
+        if "color" in fmt:
+            style.font.color.rgb = fmt["color"]
+
+        paragraph_format = style.paragraph_format
+        for attr in ("alignment", "space_after", "line_spacing", "left_indent"):
+            if attr in fmt:
+                setattr(paragraph_format, attr, fmt[attr])
+
+
+def build_default_template():
+    """
+    Crea la plantilla por defecto: márgenes institucionales y estilos del acta
+
+    Returns:
+        Document: Plantilla vacía con estilos
+    """
+    doc = Document()
+
+    for section in doc.sections:
+        section.top_margin = Inches(1)
+        section.bottom_margin = Inches(1)
+        section.left_margin = Inches(1.25)
+        section.right_margin = Inches(1.25)
+
+    # Texto base del acta: 11 pt (tablas, listas y párrafos heredan de Normal)
+    doc.styles["Normal"].font.size = Pt(11)
+
+    ensure_acta_styles(doc)
+    return doc
+
+
+@st.cache_resource
+def load_template(template_path=TEMPLATE_PATH):
+    """
+    Carga y analiza la plantilla una sola vez por proceso
+
+    El documento devuelto es compartido: nunca se modifica, cada acta
+    trabaja sobre una copia (ver new_document_from_template).
+
+    Args:
+        template_path: Ruta a una plantilla .docx institucional (opcional)
+
+    Returns:
+        Document: Plantilla analizada con los estilos del acta
+    """
+    if template_path:
+        doc = Document(template_path)
+        ensure_acta_styles(doc)
+        return doc
+    return build_default_template()
+
+
+def new_document_from_template():
+    """
+    Documento nuevo a partir de la plantilla en memoria
+
+    Copiar el árbol XML ya analizado es más barato que volver a leer el
+    paquete .docx, y el costo no depende del tamaño del acta.
+
+    Returns:
+        Document: Documento listo para llenar
+    """
+    return copy.deepcopy(load_template())
+
 
 def generate_word_document(analysis, meeting_info, transcription=""):
     """
@@ -18,78 +170,136 @@ def generate_word_document(analysis, meeting_info, transcription=""):
         transcription: Transcripción completa (opcional)
         
     Returns:
-        Document: Objeto documento de python-docx
+        Document: Objeto documento de python-docx, o None si hubo un error
     """
     try:
-        doc = Document()
-        
-        # Configurar márgenes
-        sections = doc.sections
-        for section in sections:
-            section.top_margin = Inches(1)
-            section.bottom_margin = Inches(1)
-            section.left_margin = Inches(1.25)
-            section.right_margin = Inches(1.25)
-        
-        # ENCABEZADO INSTITUCIONAL
-        add_institutional_header(doc, meeting_info)
-        
-        # ASISTENTES
-        if meeting_info.get("asistentes"):
-            add_asistentes_section(doc, meeting_info["asistentes"])
-        
-        # AGENDA
-        if meeting_info.get("agenda"):
-            add_agenda_section(doc, meeting_info["agenda"])
-        
-        # DESARROLLO DE LA REUNIÓN
-        if analysis.get("desarrollo"):
-            add_desarrollo_section(doc, analysis["desarrollo"])
-        
-        # DECISIONES TOMADAS
-        if analysis.get("decisiones"):
-            add_list_section(doc, "DECISIONES TOMADAS", analysis["decisiones"])
-        
-        # TAREAS Y RESPONSABLES
-        if analysis.get("tareas"):
-            add_table_section(doc, "TAREAS Y RESPONSABLES", analysis["tareas"])
-        
-        # PRÓXIMOS PASOS
-        if analysis.get("proximos_pasos"):
-            add_list_section(doc, "PRÓXIMOS PASOS", analysis["proximos_pasos"])
-        
-        # ANEXO: Transcripción completa (opcional)
-        if transcription:
-            add_transcription_section(doc, transcription)
-        
-        return doc
-        
+        return build_word_document(analysis, meeting_info, transcription)
     except Exception as e:
         st.error(f"Error al generar documento: {str(e)}")
         return None
 
 
+def build_word_document(analysis, meeting_info, transcription=""):
+    """
+    Arma el acta como generate_word_document, pero sin capturar errores
+    (para la regeneración masiva, que los reporta por reunión)
+    
+    Returns:
+        Document: Objeto documento de python-docx
+    """
+    doc = new_document_from_template()
+    
+    # ENCABEZADO INSTITUCIONAL
+    add_institutional_header(doc, meeting_info)
+    
+    # ASISTENTES
+    if meeting_info.get("asistentes"):
+        add_asistentes_section(doc, meeting_info["asistentes"])
+    
+    # AGENDA
+    if meeting_info.get("agenda"):
+        add_agenda_section(doc, meeting_info["agenda"])
+    
+    # DESARROLLO DE LA REUNIÓN
+    if analysis.get("desarrollo"):
+        add_desarrollo_section(doc, analysis["desarrollo"])
+    
+    # DECISIONES TOMADAS
+    if analysis.get("decisiones"):
+        add_list_section(doc, "DECISIONES TOMADAS", analysis["decisiones"])
+    
+    # TAREAS Y RESPONSABLES
+    if analysis.get("tareas"):
+        add_table_section(doc, "TAREAS Y RESPONSABLES", analysis["tareas"])
+    
+    # PRÓXIMOS PASOS
+    if analysis.get("proximos_pasos"):
+        add_list_section(doc, "PRÓXIMOS PASOS", analysis["proximos_pasos"])
+    
+    # ANEXO: Transcripción completa (opcional)
+    if transcription:
+        add_transcription_section(doc, transcription)
+    
+    return doc
+
+
+def apply_table_style(doc, table):
+    """Aplica TABLE_STYLE a una tabla si la plantilla lo define"""
+    if TABLE_STYLE in {style.name for style in doc.styles}:
+        table.style = TABLE_STYLE
+
+
+def set_cell_text(cell, text, style=None):
+    """Escribe texto en una celda usando un estilo de párrafo de la plantilla"""
+    paragraph = cell.paragraphs[0]
+    if style is not None:
+        paragraph.style = style
+    paragraph.add_run(text)
+
+
+# Caracteres de control no permitidos en XML
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def add_table_rows(table, rows):
+    """
+    Agrega muchas filas a una tabla en una sola pasada de XML
+    
+    En lugar de table.add_row() y cell.text por celda (varios objetos de
+    python-docx por celda), se arma el XML de todas las filas como texto,
+    se analiza una sola vez y se anexa a la tabla. Todas las celdas de una
+    columna comparten las mismas propiedades (ancho de la primera fila).
+    
+    Args:
+        table: Tabla de python-docx con la fila de encabezados ya creada
+        rows: Iterable de filas; cada fila es una secuencia de textos
+    """
+    # Propiedades de celda compartidas por columna, tomadas del encabezado
+    cell_props = []
+    for tc in table.rows[0]._tr.tc_lst:
+        width = tc.width
+        if width is not None:
+            cell_props.append(f'<w:tcPr><w:tcW w:w="{Length(width).twips}" w:type="dxa"/></w:tcPr>')
+        else:
+            cell_props.append("")
+    
+    parts = []
+    for row in rows:
+        parts.append("<w:tr>")
+        for props, value in zip(cell_props, row):
+            text = escape(_INVALID_XML_CHARS.sub("", str(value or "")))
+            if text:
+                parts.append(
+                    f'<w:tc>{props}<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p></w:tc>'
+                )
+            else:
+                parts.append(f"<w:tc>{props}<w:p/></w:tc>")
+        parts.append("</w:tr>")
+    
+    if not parts:
+        return
+    
+    fragment = parse_xml(f'<w:tbl {nsdecls("w")}>{"".join(parts)}</w:tbl>')
+    table._tbl.extend(list(fragment))
+
+
+def add_section_heading(doc, title):
+    """Agrega el título de una sección del acta"""
+    doc.add_paragraph(title, style="Acta Sección")
+
+
 def add_institutional_header(doc, meeting_info):
     """Agrega el encabezado institucional del acta"""
-    # Título principal
-    title = doc.add_heading(f"ACTA No. {meeting_info.get('numero_acta', '___')}", level=0)
-    title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    title_run = title.runs[0]
-    title_run.font.size = Pt(16)
-    title_run.font.bold = True
-    
-    # Nombre del comité
-    comite = doc.add_paragraph(meeting_info.get("comite", ""))
-    comite.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    comite_run = comite.runs[0]
-    comite_run.font.size = Pt(12)
-    comite_run.font.bold = True
+    # Título principal y nombre del comité
+    doc.add_paragraph(f"ACTA No. {meeting_info.get('numero_acta', '___')}", style="Acta Título")
+    doc.add_paragraph(meeting_info.get("comite", ""), style="Acta Comité")
     
     doc.add_paragraph()  # Espacio
     
     # Información en tabla
     table = doc.add_table(rows=7, cols=2)
-    table.style = 'Light Grid Accent 1'
+    apply_table_style(doc, table)
+    label_style = doc.styles["Acta Etiqueta"]
     
     # Datos
     data = [
@@ -102,68 +312,39 @@ def add_institutional_header(doc, meeting_info):
         ("", "")  # Fila vacía
     ]
     
-    for idx, (label, value) in enumerate(data):
-        row = table.rows[idx]
-        cell_label = row.cells[0]
-        cell_value = row.cells[1]
-        
-        cell_label.text = label
-        cell_value.text = value
-        
-        # Formato
-        for cell in [cell_label, cell_value]:
-            for paragraph in cell.paragraphs:
-                for run in paragraph.runs:
-                    run.font.size = Pt(11)
-                    if cell == cell_label and label:
-                        run.font.bold = True
+    for row, (label, value) in zip(table.rows, data):
+        cell_label, cell_value = row.cells
+        set_cell_text(cell_label, label, label_style)
+        set_cell_text(cell_value, value)
     
     doc.add_paragraph()  # Espacio
 
 
 def add_asistentes_section(doc, asistentes):
     """Agrega la sección de asistentes"""
-    heading = doc.add_heading("ASISTENTES", level=1)
-    heading_format = heading.runs[0].font
-    heading_format.color.rgb = RGBColor(31, 78, 121)
-    heading_format.size = Pt(14)
+    add_section_heading(doc, "ASISTENTES")
     
     # Tabla de asistentes
     table = doc.add_table(rows=1, cols=2)
-    table.style = 'Light Grid Accent 1'
+    apply_table_style(doc, table)
+    header_style = doc.styles["Acta Encabezado Tabla"]
     
     # Encabezados
     header_cells = table.rows[0].cells
-    header_cells[0].text = "Nombre"
-    header_cells[1].text = "Cargo"
-    
-    for cell in header_cells:
-        for paragraph in cell.paragraphs:
-            for run in paragraph.runs:
-                run.font.bold = True
-                run.font.color.rgb = RGBColor(31, 78, 121)
-                run.font.size = Pt(11)
+    set_cell_text(header_cells[0], "Nombre", header_style)
+    set_cell_text(header_cells[1], "Cargo", header_style)
     
     # Agregar asistentes
-    for asistente in asistentes:
-        row_cells = table.add_row().cells
-        row_cells[0].text = asistente.get("nombre", "")
-        row_cells[1].text = asistente.get("cargo", "")
-        
-        for cell in row_cells:
-            for paragraph in cell.paragraphs:
-                for run in paragraph.runs:
-                    run.font.size = Pt(11)
+    add_table_rows(table, (
+        (asistente.get("nombre", ""), asistente.get("cargo", "")) for asistente in asistentes
+    ))
     
     doc.add_paragraph()  # Espacio
 
 
 def add_agenda_section(doc, agenda_text):
     """Agrega la sección de agenda"""
-    heading = doc.add_heading("AGENDA", level=1)
-    heading_format = heading.runs[0].font
-    heading_format.color.rgb = RGBColor(31, 78, 121)
-    heading_format.size = Pt(14)
+    add_section_heading(doc, "AGENDA")
     
     # Dividir agenda en líneas
     agenda_lines = agenda_text.strip().split('\n')
@@ -171,124 +352,253 @@ def add_agenda_section(doc, agenda_text):
     for line in agenda_lines:
         line = line.strip()
         if line:
-            para = doc.add_paragraph(line, style='List Number')
-            para.paragraph_format.left_indent = Inches(0.25)
-            for run in para.runs:
-                run.font.size = Pt(11)
+            doc.add_paragraph(line, style="Acta Agenda")
     
     doc.add_paragraph()  # Espacio
 
 
 def add_desarrollo_section(doc, desarrollo_text):
     """Agrega la sección de desarrollo de la reunión"""
-    heading = doc.add_heading("DESARROLLO DE LA REUNIÓN", level=1)
-    heading_format = heading.runs[0].font
-    heading_format.color.rgb = RGBColor(31, 78, 121)
-    heading_format.size = Pt(14)
+    add_section_heading(doc, "DESARROLLO DE LA REUNIÓN")
     
-    para = doc.add_paragraph(desarrollo_text)
-    para_format = para.paragraph_format
-    para_format.space_after = Pt(12)
-    para_format.line_spacing = 1.15
-    para_format.alignment = WD_PARAGRAPH_ALIGNMENT.JUSTIFY
-    
-    for run in para.runs:
-        run.font.size = Pt(11)
+    doc.add_paragraph(desarrollo_text, style="Acta Texto")
     
     doc.add_paragraph()  # Espacio
 
 
 def add_list_section(doc, title, items):
     """Agrega una sección con lista de items"""
-    # Título de sección
-    heading = doc.add_heading(title, level=1)
-    heading_format = heading.runs[0].font
-    heading_format.color.rgb = RGBColor(31, 78, 121)
+    add_section_heading(doc, title)
     
-    # Items
     for item in items:
-        para = doc.add_paragraph(item, style='List Bullet')
-        para.paragraph_format.left_indent = Inches(0.25)
+        doc.add_paragraph(item, style="Acta Viñeta")
+
+
+def split_task(task):
+    """
+    Separa una tarea en formato "Tarea | Responsable | Fecha"
+    
+    Returns:
+        tuple: (tarea, responsable, fecha límite) con valores por defecto
+    """
+    parts = task.split('|')
+    if len(parts) >= 3:
+        return parts[0].strip(), parts[1].strip(), parts[2].strip()
+    elif len(parts) == 2:
+        return parts[0].strip(), parts[1].strip(), "Por definir"
+    return task, "Por asignar", "Por definir"
 
 
 def add_table_section(doc, title, tasks):
     """Agrega una sección con tabla de tareas"""
-    # Título de sección
-    heading = doc.add_heading(title, level=1)
-    heading_format = heading.runs[0].font
-    heading_format.color.rgb = RGBColor(31, 78, 121)
+    add_section_heading(doc, title)
     
     # Crear tabla
     table = doc.add_table(rows=1, cols=3)
-    table.style = 'Light Grid Accent 1'
+    apply_table_style(doc, table)
+    header_style = doc.styles["Acta Encabezado Tabla"]
     
     # Encabezados
-    header_cells = table.rows[0].cells
     headers = ['Tarea', 'Responsable', 'Fecha Límite']
-    
-    for i, header in enumerate(headers):
-        cell = header_cells[i]
-        cell.text = header
-        # Negrita para encabezados
-        for paragraph in cell.paragraphs:
-            for run in paragraph.runs:
-                run.font.bold = True
-                run.font.color.rgb = RGBColor(31, 78, 121)
+    for cell, header in zip(table.rows[0].cells, headers):
+        set_cell_text(cell, header, header_style)
     
     # Agregar tareas
-    for task in tasks:
-        row_cells = table.add_row().cells
-        
-        # Intentar parsear tarea en formato "Tarea | Responsable | Fecha"
-        parts = task.split('|')
-        if len(parts) >= 3:
-            row_cells[0].text = parts[0].strip()
-            row_cells[1].text = parts[1].strip()
-            row_cells[2].text = parts[2].strip()
-        elif len(parts) == 2:
-            row_cells[0].text = parts[0].strip()
-            row_cells[1].text = parts[1].strip()
-            row_cells[2].text = "Por definir"
-        else:
-            row_cells[0].text = task
-            row_cells[1].text = "Por asignar"
-            row_cells[2].text = "Por definir"
+    add_table_rows(table, (split_task(task) for task in tasks))
     
     doc.add_paragraph()  # Espacio
 
 
 def add_transcription_section(doc, transcription):
-    """Agrega la transcripción completa como anexo"""
+    """
+    Agrega el anexo con la transcripción completa
+    
+    El contenido no se construye aquí: se deja un párrafo marcador que
+    save_document reemplaza, al escribir el archivo, por un párrafo por
+    segmento generado bajo demanda (ver iter_annex_paragraphs). Así el
+    documento en memoria no crece con la duración de la reunión. La
+    transcripción se guarda en el documento para cuando save_document no
+    recibe otros párrafos del anexo.
+    
+    Args:
+        doc: Documento del acta
+        transcription: Contenido del anexo
+    """
+    doc.annex_transcription = transcription
     doc.add_page_break()
     
-    # Título
-    heading = doc.add_heading("ANEXO: TRANSCRIPCIÓN COMPLETA", level=1)
-    heading_format = heading.runs[0].font
-    heading_format.color.rgb = RGBColor(31, 78, 121)
+    add_section_heading(doc, "ANEXO: TRANSCRIPCIÓN COMPLETA")
+    
+    doc.element.body._insert_p(parse_xml(
+        f'<w:p {nsdecls("w")}><w:bookmarkStart w:id="{ANNEX_BOOKMARK_ID}" w:name="{ANNEX_BOOKMARK}"/>'
+        f'<w:bookmarkEnd w:id="{ANNEX_BOOKMARK_ID}"/></w:p>'
+    ))
+
+
+def iter_annex_paragraphs(transcription="", segments=None, show_timestamps=False):
+    """
+    Genera los párrafos del anexo uno a uno
     
-    # Transcripción
-    para = doc.add_paragraph(transcription)
-    para_format = para.paragraph_format
-    para_format.line_spacing = 1.0
-    run = para.runs[0]
-    run.font.size = Pt(9)
-    run.font.color.rgb = RGBColor(89, 89, 89)
+    Args:
+        transcription: Texto completo (se usa si no hay segmentos, p. ej. notas)
+        segments: Segmentos de Whisper con tiempos (opcional)
+        show_timestamps: Anteponer el rango de tiempo de cada segmento
+        
+    Yields:
+        tuple: (etiqueta de tiempo o None, texto del párrafo)
+    """
+    if segments:
+        for segment in segments:
+            text = segment["text"].strip()
+            if not text:
+                continue
+            label = None
+            if show_timestamps:
+                label = f"[{format_timestamp(segment['start'])} - {format_timestamp(segment['end'])}]"
+            yield label, text
+    else:
+        for line in (transcription or "").splitlines():
+            line = line.strip()
+            if line:
+                yield None, line
+
+
+def annex_paragraph_xml(style_id, label, text):
+    """XML de un párrafo del anexo con estilo de la plantilla y tiempo en negrita"""
+    runs = ""
+    if label:
+        runs += f'<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">{escape(label)} </w:t></w:r>'
+    text = escape(_INVALID_XML_CHARS.sub("", text))
+    runs += f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>'
+    return f'<w:p><w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>{runs}</w:p>'
 
 
-def save_document(doc, filename="acta_reunion.docx"):
+def split_at_annex(document_xml):
+    """
+    Divide el XML del cuerpo en lo anterior y lo posterior al marcador del anexo
+    
+    Returns:
+        tuple: (antes, después) en bytes, o None si no hay marcador
+    """
+    marker = f'w:name="{ANNEX_BOOKMARK}"'.encode()
+    position = document_xml.find(marker)
+    if position < 0:
+        return None
+    start = document_xml.rfind(b"<w:p>", 0, position)
+    end = document_xml.find(b"</w:p>", position) + len(b"</w:p>")
+    return document_xml[:start], document_xml[end:]
+
+
+def remove_annex_section(doc):
+    """Quita del documento el marcador del anexo con su título y salto de página"""
+    for start in doc.element.body.iter(qn("w:bookmarkStart")):
+        if start.get(qn("w:name")) != ANNEX_BOOKMARK:
+            continue
+        marker = start.getparent()
+        heading = marker.getprevious()
+        page_break = heading.getprevious() if heading is not None else None
+        for element in (marker, heading, page_break):
+            if element is not None:
+                element.getparent().remove(element)
+        return
+
+
+def acta_filename(meeting_info):
+    """
+    Nombre de archivo del acta a partir de su número y fecha
+
+    Args:
+        meeting_info: Diccionario con información de la reunión
+
+    Returns:
+        str: Nombre del .docx
+    """
+    numero = meeting_info.get('numero_acta', '0')
+    fecha = meeting_info.get('fecha', 'reunion').replace('/', '-')
+    return f"Acta_No_{numero}_{fecha}.docx"
+
+
+def save_document(doc, filename="acta_reunion.docx", annex=None):
     """
     Guarda el documento en disco
     
+    Si se da annex, los párrafos del anexo se escriben en streaming dentro
+    de word/document.xml a medida que el iterador los produce, en lugar de
+    agregarlos antes al documento en memoria. Sin annex se usan las líneas
+    de la transcripción dada a generate_word_document; si no hay ningún
+    párrafo se quita la sección del anexo (salto de página y título).
+    
     Args:
         doc: Documento de python-docx
-        filename: Nombre del archivo
+        filename: Nombre del archivo o un objeto tipo archivo (p. ej. BytesIO)
+        annex: Iterable de párrafos del anexo (ver iter_annex_paragraphs)
         
     Returns:
-        str: Ruta del archivo guardado
+        str: Ruta del archivo guardado (o el mismo objeto tipo archivo), o
+             None si hubo un error
     """
     try:
-        doc.save(filename)
-        return filename
+        return write_document(doc, filename, annex)
     except Exception as e:
         st.error(f"Error al guardar documento: {str(e)}")
         return None
+
+
+def write_document(doc, filename="acta_reunion.docx", annex=None):
+    """
+    Guarda el documento como save_document, pero sin capturar errores
+    
+    Returns:
+        str: Ruta del archivo guardado (o el mismo objeto tipo archivo)
+    """
+    if annex is None:
+        annex = iter_annex_paragraphs(getattr(doc, "annex_transcription", ""))
+    
+    annex = iter(annex)
+    first = next(annex, None)
+    if first is None:
+        remove_annex_section(doc)
+        doc.save(filename)
+        return filename
+    
+    base = io.BytesIO()
+    doc.save(base)
+    style_id = doc.styles["Acta Anexo"].style_id
+    
+    with zipfile.ZipFile(base) as source, \
+            zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            data = source.read(item)
+            parts = split_at_annex(data) if item.filename == "word/document.xml" else None
+            
+            if parts is None:
+                target.writestr(item, data)
+                continue
+            
+            head, tail = parts
+            info = zipfile.ZipInfo(item.filename, date_time=item.date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with target.open(info, "w") as out:
+                out.write(head)
+                for label, text in itertools.chain([first], annex):
+                    out.write(annex_paragraph_xml(style_id, label, text).encode("utf-8"))
+                out.write(tail)
+    
+    return filename
+
+
+def render_document_bytes(doc, annex=None):
+    """
+    Genera el archivo .docx directamente en memoria, sin tocar el disco
+    
+    Args:
+        doc: Documento de python-docx
+        annex: Iterable de párrafos del anexo (opcional)
+        
+    Returns:
+        bytes: Contenido del .docx, o None si hubo un error
+    """
+    buffer = io.BytesIO()
+    if save_document(doc, buffer, annex) is None:
+        return None
+    return buffer.getvalue()
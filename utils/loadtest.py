@@ -0,0 +1,371 @@
+"""
+Prueba de carga de la app con sesiones concurrentes simuladas
+
+Cada sesión recorre las cuatro pestañas con Streamlit AppTest (sin
+navegador): carga la página, agrega un asistente, registra el contenido
+(transcripción o notas), analiza y genera el acta. Se mide la latencia
+de cada acción con 1, 2, 4, ... sesiones simultáneas, el crecimiento de
+memoria y el punto en que el rendimiento deja de crecer.
+
+AppTest no es seguro entre hilos, así que cada sesión corre en su propio
+proceso. Los trabajos de los modelos se reenvían al proceso principal,
+que los atiende con un único backend compartido (modelos simulados o un
+WorkerPool con ACTAS_WORKERS réplicas), igual que en el servidor real
+donde todas las sesiones comparten los modelos.
+
+    # Con modelos simulados (mide la app, no los modelos)
+    python -m utils.loadtest --stub --sessions 1 2 4 8 16
+
+    # Con los modelos reales
+    python -m utils.loadtest --audio muestra.wav --sessions 1 2 4
+"""
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+# Acciones medidas, en el orden en que las ejecuta cada sesión
+ACTIONS = ["load", "add_attendee", "transcribe", "analyze", "generate"]
+
+# Si el rendimiento sube menos que esto al duplicar sesiones, se considera saturado
+SATURATION_GAIN = 0.10
+
+NOTES = (
+    "Punto 1 - Aprobación del acta anterior: se presentó el acta No. 9 y se "
+    "aprobó por unanimidad. Punto 2 - Proyectos: la Dra. García presentó el "
+    "sistema de IA. Decisión: aprobar condicionado al cronograma. Tareas: "
+    "Dr. Pérez revisa la propuesta antes del 15/03/2024."
+)
+
+
+def stub_job(kind, kwargs, transcribe_delay, analyze_delay):
+    """
+    Resultado fijo de Whisper o Phi con una demora configurable
+
+    Args:
+        kind: "transcribe" o "analyze"
+        kwargs: Argumentos del trabajo (ignorados)
+        transcribe_delay: Segundos que tarda la transcripción simulada
+        analyze_delay: Segundos que tarda el análisis simulado
+    """
+    if kind == "transcribe":
+        time.sleep(transcribe_delay)
+        segments = [
+            {"start": i * 10.0, "end": i * 10.0 + 10.0, "text": f" Frase {i} de la reunión."}
+            for i in range(30)
+        ]
+        return {"text": "".join(s["text"] for s in segments), "segments": segments, "language": "es"}
+
+    time.sleep(analyze_delay)
+    return {
+        "desarrollo": "La reunión se desarrolló según la agenda.",
+        "decisiones": ["Se aprueba el acta anterior"],
+        "tareas": ["Revisar propuesta | Dr. Pérez | 15/03/2024"],
+        "proximos_pasos": ["Próxima reunión el 20/03/2024"]
+    }
+
+
+def start_broker(requests, replies, backend):
+    """
+    Atiende en el proceso principal los trabajos de todas las sesiones
+
+    Args:
+        requests: Cola de pedidos (session_id, kind, kwargs)
+        replies: Colas de respuesta por session_id
+        backend: Función (kind, kwargs) que ejecuta el trabajo
+    """
+    def handle(session_id, kind, kwargs):
+        try:
+            replies[session_id].put((True, backend(kind, kwargs)))
+        except Exception as e:
+            replies[session_id].put((False, f"{type(e).__name__}: {e}"))
+
+    def loop():
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            threading.Thread(target=handle, args=request, daemon=True).start()
+
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+    return thread
+
+
+def current_memory_mb():
+    """Memoria residente del proceso principal y sus sesiones, en MB"""
+    try:
+        import psutil
+        main = psutil.Process()
+        processes = [main] + main.children(recursive=True)
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return total / 1024 / 1024
+    except ImportError:
+        usage = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                 + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+        return usage / 1024
+
+
+def click(at, label, timeout):
+    """Pulsa el primer botón cuyo texto contiene label"""
+    for button in at.button:
+        if label in button.label:
+            button.click().run(timeout=timeout)
+            return
+    raise RuntimeError(f"Botón no encontrado: {label}")
+
+
+def session_process(session_id, audio_path, model_size, timeout, requests, reply, results):
+    """
+    Proceso de una sesión: reenvía los trabajos de los modelos al principal
+    y recorre la app
+
+    Args:
+        session_id: Número de la sesión simulada
+        audio_path: Audio a transcribir (None = usar notas manuales)
+        model_size: Modelo Whisper para la transcripción
+        timeout: Máximo de segundos por acción
+        requests: Cola de pedidos al proceso principal
+        reply: Cola de respuestas para esta sesión
+        results: Cola donde se publican (session_id, timings, error)
+    """
+    from utils import workers
+
+    def forward(kind, kwargs):
+        kwargs.pop("progress_callback", None)
+        requests.put((session_id, kind, kwargs))
+        ok, value = reply.get()
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+    workers.WORKERS = 0
+    workers._run = forward
+
+    timings = {}
+    try:
+        run_session(session_id, audio_path, model_size, timeout, timings)
+        results.put((session_id, timings, None))
+    except Exception as e:
+        results.put((session_id, timings, str(e)))
+
+
+def run_session(session_id, audio_path, model_size, timeout, timings):
+    """
+    Recorre la app de principio a fin como una secretaria
+
+    Args:
+        session_id: Número de la sesión simulada
+        audio_path: Audio a transcribir (None = usar notas manuales)
+        model_size: Modelo Whisper para la transcripción
+        timeout: Máximo de segundos por acción
+        timings: Diccionario donde se anotan los segundos por acción
+    """
+    from streamlit.testing.v1 import AppTest
+    from utils.workers import run_job
+
+    def timed(action, fn):
+        started = time.perf_counter()
+        fn()
+        timings[action] = time.perf_counter() - started
+        if at.exception:
+            raise RuntimeError(f"{action}: {at.exception[0].value}")
+
+    at = AppTest.from_file(str(APP_PATH), default_timeout=timeout)
+    timed("load", lambda: at.run(timeout=timeout))
+
+    def add_attendee():
+        at.text_input(key="info_numero_acta").set_value(str(session_id))
+        at.text_input(key="info_comite").set_value("Comité de prueba")
+        at.text_area(key="info_agenda").set_value("1. Aprobación del acta\n2. Proyectos")
+        at.text_input(key="input_nombre").set_value(f"Asistente {session_id}")
+        at.text_input(key="input_cargo").set_value("Miembro")
+        click(at, "Agregar", timeout)
+    timed("add_attendee", add_attendee)
+
+    def transcribe():
+        # AppTest no simula subidas de archivos: se ejecuta el mismo trabajo
+        # que el botón "Transcribir" y se deja el resultado en la sesión
+        if audio_path:
+            result = run_job("transcribe", audio_file_path=audio_path,
+                             model_size=model_size, language="es")
+            at.session_state["transcription"] = result["text"]
+            at.session_state["transcription_display"] = result["text"]
+            at.session_state["segments"] = result["segments"]
+            at.session_state["using_manual_notes"] = False
+            at.run(timeout=timeout)
+        else:
+            at.radio[0].set_value("✍️ Escribir notas manualmente")
+            at.run(timeout=timeout)
+            at.text_area(key="notas_text").set_value(NOTES)
+            at.run(timeout=timeout)
+            click(at, "Usar estas notas", timeout)
+    timed("transcribe", transcribe)
+
+    timed("analyze", lambda: click(at, "Analizar", timeout))
+    timed("generate", lambda: click(at, "Generar Acta", timeout))
+
+
+def percentile(values, pct):
+    """Percentil pct (0-100) de una lista de valores"""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def run_level(n_sessions, audio_path, model_size, timeout, manager, requests, replies):
+    """
+    Ejecuta n sesiones simultáneas y recoge latencias, errores y memoria
+
+    Returns:
+        dict: Latencias por acción, errores, duración, rendimiento y memoria
+    """
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    timings = {action: [] for action in ACTIONS}
+    errors = []
+    peak_memory = 0.0
+
+    memory_before = current_memory_mb()
+    started = time.perf_counter()
+
+    processes = []
+    for session_id in range(n_sessions):
+        replies[session_id] = replies.get(session_id) or manager.Queue()
+        process = ctx.Process(
+            target=session_process,
+            args=(session_id, audio_path, model_size, timeout,
+                  requests, replies[session_id], results)
+        )
+        process.start()
+        processes.append(process)
+
+    for _ in range(n_sessions):
+        while True:
+            peak_memory = max(peak_memory, current_memory_mb())
+            try:
+                session_id, session_timings, error = results.get(timeout=1)
+                break
+            except queue.Empty:
+                continue
+        for action, seconds in session_timings.items():
+            timings[action].append(seconds)
+        if error:
+            errors.append(f"sesión {session_id}: {error}")
+
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    completed = n_sessions - len(errors)
+    return {
+        "sessions": n_sessions,
+        "timings": timings,
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": completed * 60 / elapsed if elapsed else 0.0,
+        "memory_before": memory_before,
+        "memory_peak": peak_memory
+    }
+
+
+def print_report(levels):
+    """Imprime la tabla de latencias y el punto de saturación"""
+    for level in levels:
+        print(f"\n=== {level['sessions']} sesiones simultáneas "
+              f"({level['elapsed']:.1f} s, {level['throughput']:.1f} sesiones/min) ===")
+        print(f"{'acción':<14}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for action in ACTIONS:
+            values = level["timings"][action]
+            print(f"{action:<14}"
+                  f"{percentile(values, 50):>8.2f}s"
+                  f"{percentile(values, 95):>8.2f}s"
+                  f"{percentile(values, 99):>8.2f}s")
+        print(f"memoria: {level['memory_before']:.0f} MB → pico {level['memory_peak']:.0f} MB "
+              f"(+{level['memory_peak'] - level['memory_before']:.0f} MB)")
+        for error in level["errors"]:
+            print(f"  ❌ {error}")
+
+    saturation = None
+    for previous, current in zip(levels, levels[1:]):
+        if current["throughput"] < previous["throughput"] * (1 + SATURATION_GAIN):
+            saturation = previous["sessions"]
+            break
+
+    print()
+    if saturation:
+        print(f"Saturación: el rendimiento deja de crecer a partir de ~{saturation} sesiones simultáneas")
+    else:
+        print("Sin saturación en los niveles probados")
+
+
+def main():
+    """Punto de entrada de la prueba de carga"""
+    parser = argparse.ArgumentParser(description="Prueba de carga de la app de actas")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Niveles de sesiones simultáneas a probar")
+    parser.add_argument("--audio", help="Audio a transcribir (sin esto se usan notas manuales)")
+    parser.add_argument("--model", default="base", help="Modelo Whisper (default: base)")
+    parser.add_argument("--stub", action="store_true", help="Simular los modelos")
+    parser.add_argument("--stub-transcribe", type=float, default=2.0,
+                        help="Segundos de la transcripción simulada")
+    parser.add_argument("--stub-analyze", type=float, default=2.0,
+                        help="Segundos del análisis simulado")
+    parser.add_argument("--timeout", type=float, default=3600, help="Máximo de segundos por acción")
+    args = parser.parse_args()
+
+    # Checkpoints de las sesiones simuladas en un directorio temporal
+    os.environ.setdefault("ACTAS_DATA_DIR", tempfile.mkdtemp(prefix="actas_load_"))
+    sys.path.insert(0, str(APP_PATH.parent))
+
+    from utils import workers
+
+    pool = None
+    if args.stub:
+        def backend(kind, kwargs):
+            return stub_job(kind, kwargs, args.stub_transcribe, args.stub_analyze)
+    else:
+        # Modelos compartidos por todas las sesiones, como en el servidor
+        pool = workers.WorkerPool(max(1, workers.WORKERS), workers.THREADS_PER_WORKER)
+
+        def backend(kind, kwargs):
+            return pool.submit(kind, **kwargs).result()
+
+    manager = mp.get_context("spawn").Manager()
+    requests = manager.Queue()
+    replies = {}
+    start_broker(requests, replies, backend)
+
+    try:
+        levels = []
+        for n_sessions in args.sessions:
+            print(f"Ejecutando {n_sessions} sesiones...", flush=True)
+            levels.append(run_level(n_sessions, args.audio, args.model, args.timeout,
+                                    manager, requests, replies))
+        print_report(levels)
+    finally:
+        requests.put(None)
+        if pool:
+            pool.shutdown()
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Módulo para seguimiento de progreso y tiempo estimado de los modelos
+"""
+import threading
+import time
+
+
+class ProgressTracker:
+    """
+    Progreso de un trabajo con velocidad y tiempo restante estimado
+
+    Las unidades las define quien reporta: segundos de audio procesados
+    para Whisper, tokens generados para el análisis.
+    """
+
+    def __init__(self, total=0):
+        self.total = total
+        self.done = 0
+        self.started = time.perf_counter()
+
+    def update(self, done, total=None):
+        """Registra el avance acumulado"""
+        self.done = done
+        if total:
+            self.total = total
+
+    @property
+    def elapsed(self):
+        """Segundos desde el inicio"""
+        return time.perf_counter() - self.started
+
+    @property
+    def fraction(self):
+        """Fracción completada entre 0 y 1"""
+        if not self.total:
+            return 0.0
+        return min(1.0, self.done / self.total)
+
+    @property
+    def rate(self):
+        """Unidades procesadas por segundo"""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """Segundos restantes estimados, o None si aún no hay velocidad"""
+        if not self.rate or not self.total:
+            return None
+        return max(0.0, (self.total - self.done) / self.rate)
+
+
+def throttled(callback, interval=0.25):
+    """
+    Limita la frecuencia de un callback de progreso
+
+    Siempre deja pasar la última actualización (done >= total).
+
+    Args:
+        callback: Función (done, total)
+        interval: Segundos mínimos entre llamadas
+
+    Returns:
+        function: Callback con la misma firma
+    """
+    last = [0.0]
+
+    def wrapper(done, total):
+        now = time.perf_counter()
+        if now - last[0] >= interval or (total and done >= total):
+            last[0] = now
+            callback(done, total)
+
+    return wrapper
+
+
+class TokenProgressStreamer:
+    """
+    Streamer de transformers que cuenta los tokens generados
+
+    generate() llama a put() primero con el prompt y luego con cada nuevo
+    token; solo se cuentan los nuevos.
+    """
+
+    def __init__(self, max_new_tokens, callback):
+        self.max_new_tokens = max_new_tokens
+        self.callback = callback
+        self.generated = 0
+        self._prompt_seen = False
+
+    def put(self, value):
+        if not self._prompt_seen:
+            self._prompt_seen = True
+            return
+        self.generated += value.shape[-1] if value.dim() > 1 else value.numel()
+        self.callback(self.generated, self.max_new_tokens)
+
+    def end(self):
+        self.callback(self.max_new_tokens, self.max_new_tokens)
+
+
+# Callback de progreso de Whisper por hilo (varias sesiones transcriben a la vez)
+_whisper_progress = threading.local()
+
+
+def set_whisper_progress(callback):
+    """Define el callback de progreso de Whisper para el hilo actual"""
+    _whisper_progress.callback = callback
+
+
+def install_whisper_progress_hook(transcribe_module, frames_per_second):
+    """
+    Intercepta la barra tqdm del bucle de decodificación de Whisper
+
+    whisper.transcribe avanza una barra tqdm en frames de audio procesados.
+    Se reemplaza la referencia a tqdm solo dentro de ese módulo por una
+    subclase que, además, informa al callback del hilo actual. La barra
+    sigue deshabilitada en consola como antes.
+
+    Args:
+        transcribe_module: Módulo whisper.transcribe
+        frames_per_second: Frames de espectrograma por segundo de audio
+    """
+    import tqdm as tqdm_module
+
+    if getattr(transcribe_module, "_actas_progress_hook", False):
+        return
+
+    class ProgressTqdm(tqdm_module.tqdm):
+        def update(self, n=1):
+            callback = getattr(_whisper_progress, "callback", None)
+            if callback and n:
+                self._actas_done = getattr(self, "_actas_done", 0) + n
+                callback(self._actas_done / frames_per_second, (self.total or 0) / frames_per_second)
+            return super().update(n)
+
+    class TqdmNamespace:
+        tqdm = ProgressTqdm
+
+    transcribe_module.tqdm = TqdmNamespace
+    transcribe_module._actas_progress_hook = True
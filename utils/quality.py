@@ -0,0 +1,251 @@
+"""
+Módulo de revisión de calidad de la transcripción
+
+Whisper deja en cada segmento su confianza (avg_logprob), qué tan
+repetitivo es el texto (compression_ratio) y la probabilidad de que no
+haya habla (no_speech_prob). Con esos datos se marcan los segmentos
+dudosos y se vuelven a decodificar solo esos tramos, con un modelo más
+grande y una decodificación más cuidadosa, en lugar de repetir la
+transcripción completa.
+"""
+from .segments import splice_segments
+from .workers import run_job
+
+
+# Umbrales (los mismos que usa Whisper para reintentar una ventana)
+LOGPROB_THRESHOLD = -1.0
+COMPRESSION_RATIO_THRESHOLD = 2.4
+NO_SPEECH_THRESHOLD = 0.6
+
+# Segmentos dudosos separados por menos de esto se re-decodifican juntos (segundos)
+MERGE_GAP = 2.0
+
+# Margen de audio a cada lado de un tramo al re-decodificarlo (segundos): los
+# bordes de segmento de Whisper suelen cortar la primera o la última sílaba
+RANGE_PADDING = 0.75
+
+# Modelos Whisper de menor a mayor (para elegir el siguiente más grande)
+MODEL_ORDER = ["tiny", "base", "small", "medium"]
+
+# Decodificación más cuidadosa: búsqueda en haz, reintentos con temperatura
+# y sin arrastrar el texto anterior (la causa habitual de los bucles)
+REDECODE_OPTIONS = {
+    "beam_size": 5,
+    "best_of": 5,
+    "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+    "condition_on_previous_text": False
+}
+
+REASONS = {
+    "low_confidence": "baja confianza",
+    "repetition": "texto repetitivo",
+    "no_speech": "posible texto inventado en silencio"
+}
+
+
+def segment_issues(segment):
+    """
+    Problemas de un segmento según sus métricas de Whisper
+
+    Args:
+        segment: Segmento de Whisper
+
+    Returns:
+        list: Claves de REASONS (vacía si el segmento está bien)
+    """
+    issues = []
+    if segment.get("avg_logprob", 0.0) < LOGPROB_THRESHOLD:
+        issues.append("low_confidence")
+    if segment.get("compression_ratio", 0.0) > COMPRESSION_RATIO_THRESHOLD:
+        issues.append("repetition")
+    # Como en Whisper: probable silencio solo si además la confianza es baja
+    # (no_speech_prob alto con buena confianza es habla real en voz baja)
+    if (segment.get("no_speech_prob", 0.0) > NO_SPEECH_THRESHOLD
+            and segment.get("avg_logprob", 0.0) < LOGPROB_THRESHOLD
+            and segment.get("text", "").strip()):
+        issues.append("no_speech")
+    return issues
+
+
+def flag_segments(segments):
+    """
+    Segmentos dudosos de una transcripción
+
+    Los segmentos ya revisados (re-decodificados o que no mejoraron al
+    re-decodificarlos) no se vuelven a marcar.
+
+    Args:
+        segments: Segmentos de Whisper
+
+    Returns:
+        list: Diccionarios {"index", "start", "end", "text", "issues"}
+    """
+    flagged = []
+    for index, segment in enumerate(segments):
+        if segment.get("reviewed"):
+            continue
+        issues = segment_issues(segment)
+        if issues:
+            flagged.append({
+                "index": index,
+                "start": segment["start"],
+                "end": segment["end"],
+                "text": segment.get("text", "").strip(),
+                "issues": issues
+            })
+    return flagged
+
+
+def plan_ranges(flagged, merge_gap=MERGE_GAP):
+    """
+    Une segmentos dudosos cercanos en tramos a re-decodificar
+
+    Los tramos empiezan y terminan en bordes de segmento, de modo que al
+    reemplazarlos no se corta ninguna frase correcta.
+
+    Args:
+        flagged: Segmentos dudosos (ver flag_segments)
+        merge_gap: Separación máxima para unir dos segmentos en un tramo
+
+    Returns:
+        list: Tramos {"start", "end", "issues"}
+    """
+    ranges = []
+    for segment in flagged:
+        if ranges and segment["start"] - ranges[-1]["end"] <= merge_gap:
+            ranges[-1]["end"] = max(ranges[-1]["end"], segment["end"])
+            ranges[-1]["issues"].update(segment["issues"])
+        else:
+            ranges.append({"start": segment["start"], "end": segment["end"], "issues": set(segment["issues"])})
+    return ranges
+
+
+def pad_ranges(ranges, segments, padding=RANGE_PADDING, audio_end=None):
+    """
+    Amplía cada tramo unos segundos a cada lado
+
+    El margen nunca entra en un segmento vecino que no se re-decodifica ni
+    sale del audio.
+
+    Args:
+        ranges: Tramos a re-decodificar (ver plan_ranges)
+        segments: Segmentos de la transcripción ordenados por tiempo
+        padding: Margen a cada lado en segundos
+        audio_end: Duración del audio (por defecto, el fin del último segmento)
+
+    Returns:
+        list: Tramos {"start", "end", "issues"} ampliados
+    """
+    if audio_end is None:
+        audio_end = segments[-1]["end"] if segments else 0.0
+
+    padded = []
+    for audio_range in ranges:
+        start, end = audio_range["start"], audio_range["end"]
+        previous_end = max((s["end"] for s in segments if s["start"] < start), default=0.0)
+        next_start = min((s["start"] for s in segments if s["end"] > end), default=audio_end)
+        padded.append({
+            **audio_range,
+            "start": max(start - padding, min(previous_end, start), 0.0),
+            "end": max(min(end + padding, max(next_start, end), audio_end), end)
+        })
+    return padded
+
+
+def larger_model(model_size):
+    """Siguiente modelo más grande (el mismo si ya es el mayor disponible)"""
+    if model_size not in MODEL_ORDER:
+        return model_size
+    position = MODEL_ORDER.index(model_size)
+    return MODEL_ORDER[min(position + 1, len(MODEL_ORDER) - 1)]
+
+
+def range_score(segments):
+    """Confianza media de un tramo ponderada por duración"""
+    total = sum(s["end"] - s["start"] for s in segments)
+    if not total:
+        return None
+    return sum(s.get("avg_logprob", 0.0) * (s["end"] - s["start"]) for s in segments) / total
+
+
+def is_improvement(original, replacement, issues):
+    """
+    Decide si la re-decodificación mejora el tramo
+
+    Un tramo vacío solo se acepta si el problema era texto en silencio.
+    En otro caso no puede tener más segmentos dudosos que el original, y
+    debe tener menos o una confianza media no peor.
+    """
+    if not replacement:
+        return issues <= {"no_speech"}
+
+    flagged_before = sum(1 for s in original if segment_issues(s))
+    flagged_after = sum(1 for s in replacement if segment_issues(s))
+    if flagged_after > flagged_before:
+        return False
+
+    before, after = range_score(original), range_score(replacement)
+    return before is None or after is None or after >= before or flagged_after < flagged_before
+
+
+def redecode_flagged(audio_path, segments, model_size, language="es", progress_callback=None,
+                     audio_duration=None):
+    """
+    Re-decodifica los tramos dudosos y los reemplaza si mejoran
+
+    Args:
+        audio_path: Ruta al audio en disco
+        segments: Segmentos de Whisper de la transcripción
+        model_size: Modelo con el que se transcribió
+        language: Idioma del audio
+        progress_callback: Función (segundos re-decodificados, total) opcional
+        audio_duration: Duración del audio (ver probe_duration), para no
+                        ampliar el último tramo más allá del final
+
+    Returns:
+        tuple: (segmentos corregidos, resumen {"flagged", "ranges", "replaced",
+               "seconds", "audio_seconds", "model"})
+    """
+    flagged = flag_segments(segments)
+    ranges = pad_ranges(plan_ranges(flagged), segments, audio_end=audio_duration)
+    model = larger_model(model_size)
+    total = sum(r["end"] - r["start"] for r in ranges)
+
+    summary = {
+        "flagged": len(flagged),
+        "ranges": len(ranges),
+        "replaced": 0,
+        "seconds": total,
+        "audio_seconds": segments[-1]["end"] if segments else 0.0,
+        "model": model
+    }
+
+    done = 0.0
+    for audio_range in ranges:
+        result = run_job(
+            "transcribe_range",
+            audio_file_path=audio_path,
+            start=audio_range["start"],
+            end=audio_range["end"],
+            model_size=model,
+            language=language,
+            **REDECODE_OPTIONS
+        )
+
+        if result is not None:
+            original = [
+                s for s in segments
+                if audio_range["start"] <= (s["start"] + s["end"]) / 2 < audio_range["end"]
+            ]
+            replacement = [{**s, "pass": model, "redecoded": True, "reviewed": True} for s in result["segments"]]
+            if is_improvement(original, replacement, audio_range["issues"]):
+                summary["replaced"] += 1
+            else:
+                replacement = [{**s, "reviewed": True} for s in original]
+            segments = splice_segments(segments, audio_range["start"], audio_range["end"], replacement)
+
+        done += audio_range["end"] - audio_range["start"]
+        if progress_callback:
+            progress_callback(done, total)
+
+    return segments, summary
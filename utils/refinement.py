@@ -0,0 +1,192 @@
+"""
+Módulo de transcripción progresiva: borrador rápido y refinado en segundo plano
+
+Primero se transcribe con un modelo pequeño para poder revisar y analizar
+de inmediato. Después un modelo más grande vuelve a transcribir el audio
+por tramos en un hilo de fondo; cada tramo terminado reemplaza al borrador
+en la sesión. Al final se comparan, punto por punto de la agenda, los
+textos usados en el análisis con los refinados.
+"""
+import difflib
+import os
+import threading
+import streamlit as st
+
+from .segments import build_agenda_slices, normalize_text
+from .workers import run_job
+
+
+# Modelo del borrador
+DRAFT_MODEL = "tiny"
+
+# Modelo del refinado si el elegido es el mismo del borrador
+REFINE_MODEL = os.environ.get("ACTAS_REFINE_MODEL", "small")
+
+# Duración aproximada de cada tramo que se refina (segundos)
+WINDOW_SECONDS = 300
+
+# Similitud por debajo de la cual un punto de la agenda cambió de verdad
+CHANGE_THRESHOLD = 0.85
+
+
+def plan_windows(segments, window_seconds=WINDOW_SECONDS, duration=None):
+    """
+    Divide el audio en tramos consecutivos de unos window_seconds
+
+    Los cortes caen entre segmentos (en pausas del habla), nunca a mitad de
+    una frase. Los tramos cubren todo el audio, de 0 a su duración: un
+    silencio largo del borrador (o habla que no detectó) se parte en tramos
+    fijos, y el último tramo llega hasta el final aunque el borrador
+    termine antes.
+
+    Args:
+        segments: Segmentos del borrador ordenados por tiempo
+        window_seconds: Duración aproximada de cada tramo
+        duration: Duración del audio en segundos (ver probe_duration); si
+                  no se conoce, se usa el fin del último segmento
+
+    Returns:
+        list: Tramos {"start", "end"}
+    """
+    audio_end = max(duration or 0, segments[-1]["end"] if segments else 0)
+    windows = []
+    start = 0.0
+
+    def cover_gap(until):
+        nonlocal start
+        while until - start > window_seconds:
+            windows.append({"start": start, "end": start + window_seconds})
+            start += window_seconds
+
+    for segment in segments:
+        cover_gap(segment["start"])
+        if segment["end"] - start >= window_seconds:
+            windows.append({"start": start, "end": segment["end"]})
+            start = segment["end"]
+
+    cover_gap(audio_end)
+    if audio_end > start:
+        windows.append({"start": start, "end": audio_end})
+    return windows
+
+
+class RefinementJob:
+    """
+    Re-transcripción por tramos en un hilo de fondo
+
+    El hilo no toca session_state: deja cada tramo terminado en results y
+    la sesión los recoge en su siguiente ejecución.
+    """
+
+    def __init__(self, audio_path, windows, model_size, language="es"):
+        self.audio_path = audio_path
+        self.windows = windows
+        self.model_size = model_size
+        self.language = language
+        self.results = {}
+        self.error = None
+        self.finished = False
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            for index, window in enumerate(self.windows):
+                if self._cancelled.is_set():
+                    break
+                result = run_job(
+                    "transcribe_range",
+                    audio_file_path=self.audio_path,
+                    start=window["start"],
+                    end=window["end"],
+                    model_size=self.model_size,
+                    language=self.language
+                )
+                if result is None:
+                    self.error = f"falló el tramo {index + 1}"
+                    break
+                self.results[index] = result["segments"]
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.finished = True
+
+    def cancel(self):
+        """Detiene el refinado al terminar el tramo en curso"""
+        self._cancelled.set()
+
+
+@st.cache_resource
+def get_refinement_jobs():
+    """Refinados en curso de todas las sesiones, por identificador de reunión"""
+    return {}
+
+
+def start_refinement(key, audio_path, windows, model_size, language="es"):
+    """
+    Arranca el refinado de una reunión (cancela el anterior si lo había)
+
+    Returns:
+        RefinementJob: Trabajo en segundo plano
+    """
+    cancel_refinement(key)
+    job = RefinementJob(audio_path, windows, model_size, language)
+    get_refinement_jobs()[key] = job
+    return job
+
+
+def get_refinement(key):
+    """Refinado de una reunión, o None"""
+    return get_refinement_jobs().get(key)
+
+
+def cancel_refinement(key):
+    """Cancela y olvida el refinado de una reunión"""
+    job = get_refinement_jobs().pop(key, None)
+    if job is not None:
+        job.cancel()
+
+
+def agenda_texts(segments, agenda_text):
+    """
+    Texto de la transcripción por punto de la agenda
+
+    Sin agenda alineable, todo el texto cuenta como un solo punto.
+
+    Returns:
+        dict: Punto de la agenda → texto
+    """
+    slices = build_agenda_slices(segments, agenda_text) if agenda_text else []
+    if slices:
+        return {s["item"]: s["text"] for s in slices}
+    return {"Transcripción completa": " ".join(s["text"].strip() for s in segments)}
+
+
+def text_similarity(a, b):
+    """Similitud entre 0 y 1 de dos textos, palabra por palabra"""
+    words_a = normalize_text(a).split()
+    words_b = normalize_text(b).split()
+    if not words_a and not words_b:
+        return 1.0
+    return difflib.SequenceMatcher(None, words_a, words_b).ratio()
+
+
+def changed_agenda_items(before, after, threshold=CHANGE_THRESHOLD):
+    """
+    Puntos de la agenda cuyo texto cambió de forma apreciable
+
+    Args:
+        before: Textos por punto usados en el análisis (ver agenda_texts)
+        after: Textos por punto con la transcripción actual
+        threshold: Similitud mínima para considerar que no cambió
+
+    Returns:
+        list: Tuplas (punto, similitud) de los puntos que cambiaron
+    """
+    changed = []
+    for item in dict.fromkeys(list(before) + list(after)):
+        similarity = text_similarity(before.get(item, ""), after.get(item, ""))
+        if similarity < threshold:
+            changed.append((item, similarity))
+    return changed
@@ -0,0 +1,176 @@
+"""
+Regeneración masiva de actas archivadas con el formato actual
+
+Lee las entradas guardadas de cada reunión (checkpoints de información,
+contenido, análisis y opciones del acta), vuelve a generar el .docx con
+la plantilla vigente en un pool de procesos y reporta avance y fallas.
+No ejecuta Whisper ni el modelo de análisis.
+
+    python -m utils.rerender --output actas_reemitidas/
+    python -m utils.rerender --output salida/ --template nueva_plantilla.docx --workers 8
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+
+def find_archived_meetings(checkpoint_dir):
+    """
+    Reuniones con acta emitida: información, análisis y opciones del acta guardados
+
+    Args:
+        checkpoint_dir: Directorio de checkpoints
+
+    Returns:
+        list: Identificadores de reunión ordenados
+    """
+    checkpoint_dir = Path(checkpoint_dir)
+    if not checkpoint_dir.exists():
+        return []
+    return sorted(
+        d.name for d in checkpoint_dir.iterdir()
+        if all((d / f"{stage}.json").exists() for stage in ("meeting_info", "analysis", "acta"))
+    )
+
+
+def rerender_meeting(meeting_id, output_path, annex_override=None, timestamps_override=None):
+    """
+    Regenera el acta de una reunión (se ejecuta en un proceso del pool)
+
+    Los errores no se capturan: llegan al proceso principal, que los
+    reporta por reunión. Solo se importan los módulos del documento y de
+    los checkpoints, sin cargar los modelos.
+
+    Args:
+        meeting_id: Identificador de la reunión
+        output_path: Ruta del .docx a escribir
+        annex_override: Forzar (True/False) la inclusión del anexo
+        timestamps_override: Forzar (True/False) los tiempos en el anexo
+
+    Returns:
+        str: Ruta escrita
+    """
+    from .checkpoints import load_checkpoint
+    from .document_gen import build_word_document, write_document, iter_annex_paragraphs
+
+    state = load_checkpoint(meeting_id)
+    meeting_info = state.get("meeting_info")
+    analysis = state.get("analysis")
+    if not meeting_info or not analysis:
+        raise ValueError("faltan información o análisis")
+
+    options = state.get("acta") or {}
+    include_content = options.get("include_content", False) if annex_override is None else annex_override
+    show_timestamps = options.get("show_timestamps", False) if timestamps_override is None else timestamps_override
+
+    content = state.get("transcription") or {}
+    transcription = content.get("transcription", "") if include_content else ""
+    segments = content.get("segments") if include_content else None
+
+    doc = build_word_document(analysis, meeting_info, transcription)
+    annex = iter_annex_paragraphs(transcription, segments, show_timestamps) if transcription else None
+    return write_document(doc, str(output_path), annex)
+
+
+def plan_outputs(meeting_ids, output_dir):
+    """
+    Nombre de salida de cada acta, igual al de la app; si dos actas
+    coinciden en número y fecha se agrega el identificador de la reunión
+
+    Returns:
+        dict: meeting_id → ruta de salida
+    """
+    from .checkpoints import load_checkpoint
+    from .document_gen import acta_filename
+
+    names = {}
+    for meeting_id in meeting_ids:
+        info = load_checkpoint(meeting_id).get("meeting_info", {})
+        names[meeting_id] = acta_filename(info)
+
+    counts = {}
+    for name in names.values():
+        counts[name] = counts.get(name, 0) + 1
+
+    outputs = {}
+    for meeting_id, name in names.items():
+        if counts[name] > 1:
+            name = f"{Path(name).stem}_{meeting_id}.docx"
+        outputs[meeting_id] = Path(output_dir) / name
+    return outputs
+
+
+def main():
+    """Punto de entrada de la regeneración masiva"""
+    parser = argparse.ArgumentParser(description="Regenera en bloque las actas archivadas")
+    parser.add_argument("--output", required=True, help="Directorio de salida de los .docx")
+    parser.add_argument("--data-dir", help="Directorio de datos (default: ACTAS_DATA_DIR o actas_data)")
+    parser.add_argument("--template", help="Plantilla .docx a usar (default: ACTAS_TEMPLATE)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procesos en paralelo")
+    parser.add_argument("--meetings", nargs="*", help="Solo estas reuniones (identificadores)")
+    annex = parser.add_mutually_exclusive_group()
+    annex.add_argument("--annex", dest="annex", action="store_true", default=None,
+                       help="Incluir el anexo en todas las actas")
+    annex.add_argument("--no-annex", dest="annex", action="store_false",
+                       help="Omitir el anexo en todas las actas")
+    timestamps = parser.add_mutually_exclusive_group()
+    timestamps.add_argument("--timestamps", dest="timestamps", action="store_true", default=None,
+                            help="Mostrar tiempos en el anexo")
+    timestamps.add_argument("--no-timestamps", dest="timestamps", action="store_false",
+                            help="Ocultar tiempos en el anexo")
+    args = parser.parse_args()
+
+    # Configuración heredada por los procesos del pool (se leen al importar)
+    if args.data_dir:
+        os.environ["ACTAS_DATA_DIR"] = args.data_dir
+    if args.template:
+        os.environ["ACTAS_TEMPLATE"] = str(Path(args.template).resolve())
+
+    from .checkpoints import CHECKPOINT_DIR
+
+    meeting_ids = args.meetings or find_archived_meetings(CHECKPOINT_DIR)
+    if not meeting_ids:
+        print(f"No hay actas archivadas en {CHECKPOINT_DIR}")
+        return
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    outputs = plan_outputs(meeting_ids, output_dir)
+
+    total = len(meeting_ids)
+    failures = []
+    started = time.perf_counter()
+    print(f"Regenerando {total} actas con {args.workers} procesos...")
+
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=mp.get_context("spawn")) as pool:
+        futures = {
+            pool.submit(rerender_meeting, meeting_id, outputs[meeting_id], args.annex, args.timestamps): meeting_id
+            for meeting_id in meeting_ids
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            meeting_id = futures[future]
+            try:
+                path = future.result()
+                print(f"[{done}/{total}] ✓ {Path(path).name}", flush=True)
+            except Exception as e:
+                failures.append((meeting_id, str(e)))
+                print(f"[{done}/{total}] ✗ {meeting_id}: {e}", flush=True)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n{total - len(failures)} de {total} actas regeneradas en {elapsed:.1f} s → {output_dir}")
+
+    if failures:
+        report = output_dir / "errores_regeneracion.txt"
+        with open(report, "w", encoding="utf-8") as f:
+            for meeting_id, error in failures:
+                f.write(f"{meeting_id}\t{error}\n")
+        print(f"{len(failures)} fallas (detalle en {report})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
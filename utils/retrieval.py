@@ -0,0 +1,265 @@
+"""
+Módulo de recuperación léxica (BM25) de fragmentos de la transcripción
+"""
+import math
+import re
+from collections import Counter
+
+from .segments import tokenize
+
+
+# Consultas fijas por sección del acta, además de cada punto de la agenda
+SECTION_QUERIES = {
+    "decisiones": "se aprueba aprobado decide decisión acuerda acuerdo votación unanimidad rechaza",
+    "tareas": "tarea responsable encargado fecha límite entregar compromiso revisar preparar enviar"
+}
+
+# Palabras por fragmento al dividir la transcripción
+PASSAGE_WORDS = 120
+
+# Separador entre fragmentos no contiguos en el prompt
+GAP_MARKER = "[...]"
+
+# Mínimo de tokens por punto de agenda al repartir el presupuesto (~1 fragmento)
+MIN_SHARE_TOKENS = int(PASSAGE_WORDS * 1.4)
+
+
+def estimate_tokens(text):
+    """
+    Estimación rápida de tokens para texto en español (~1.4 tokens por palabra)
+
+    Args:
+        text: Texto a medir
+
+    Returns:
+        int: Número aproximado de tokens
+    """
+    return int(len(text.split()) * 1.4) + 1
+
+
+def split_passages(text, passage_words=PASSAGE_WORDS):
+    """
+    Divide un texto en fragmentos de hasta passage_words palabras,
+    respetando los límites de oración
+
+    Las oraciones más largas que un fragmento (o el texto sin puntuación)
+    se cortan cada passage_words palabras.
+
+    Args:
+        text: Texto de la transcripción
+        passage_words: Tamaño máximo de cada fragmento en palabras
+
+    Returns:
+        list: Fragmentos en orden
+    """
+    sentences = re.split(r"(?<=[.!?])\s+|\n+", text)
+    passages = []
+    current, current_words = [], 0
+
+    for sentence in sentences:
+        words = sentence.split()
+        for start in range(0, len(words), passage_words):
+            chunk = words[start:start + passage_words]
+            if current_words + len(chunk) > passage_words:
+                passages.append(" ".join(current))
+                current, current_words = [], 0
+            current.append(" ".join(chunk))
+            current_words += len(chunk)
+
+    if current:
+        passages.append(" ".join(current))
+
+    return passages
+
+
+class BM25Index:
+    """
+    Índice BM25 en memoria sobre fragmentos de texto, sin servicios externos
+    """
+
+    def __init__(self, passages, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(tokenize(p)) for p in passages]
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+        doc_freqs = Counter()
+        for tf in self.term_freqs:
+            doc_freqs.update(tf.keys())
+
+        n = len(passages)
+        self.idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in doc_freqs.items()
+        }
+
+    def scores(self, query):
+        """
+        Puntaje BM25 de cada fragmento para una consulta
+
+        Args:
+            query: Texto de la consulta
+
+        Returns:
+            list: Puntaje por fragmento, en el orden original
+        """
+        terms = [t for t in set(tokenize(query)) if t in self.idf]
+        results = []
+
+        for tf, length in zip(self.term_freqs, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1))
+            score = 0.0
+            for term in terms:
+                freq = tf.get(term, 0)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            results.append(score)
+
+        return results
+
+    def rank(self, query):
+        """Índices de los fragmentos con puntaje positivo, del mejor al peor"""
+        scores = self.scores(query)
+        ranked = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+        return [i for i in ranked if scores[i] > 0]
+
+
+def select_passages(passages, queries, token_budget, count_tokens=estimate_tokens):
+    """
+    Selecciona los fragmentos mejor puntuados para varias consultas sin
+    exceder un presupuesto de tokens
+
+    Las consultas se atienden por turnos (el mejor fragmento de cada una,
+    luego el segundo, ...) para que ningún punto de la agenda se quede sin
+    contexto.
+
+    Args:
+        passages: Fragmentos de la transcripción
+        queries: Consultas (puntos de agenda y secciones del acta)
+        token_budget: Máximo de tokens para el conjunto seleccionado
+        count_tokens: Función que cuenta tokens de un texto
+
+    Returns:
+        list: Índices seleccionados en orden cronológico
+    """
+    index = BM25Index(passages)
+    rankings = [index.rank(q) for q in queries if q.strip()]
+
+    selected = set()
+    used = 0
+    depth = 0
+    max_depth = max((len(r) for r in rankings), default=0)
+
+    while depth < max_depth:
+        for ranking in rankings:
+            if depth >= len(ranking) or ranking[depth] in selected:
+                continue
+            idx = ranking[depth]
+            cost = count_tokens(passages[idx])
+            if used + cost <= token_budget:
+                selected.add(idx)
+                used += cost
+        depth += 1
+
+    return sorted(selected)
+
+
+def truncate_to_budget(text, token_budget, count_tokens=estimate_tokens):
+    """
+    Primeras palabras de un texto que caben en un presupuesto de tokens
+
+    Args:
+        text: Texto a recortar
+        token_budget: Máximo de tokens permitido
+        count_tokens: Función que cuenta tokens de un texto
+
+    Returns:
+        str: El texto recortado (vacío si no cabe ni una palabra)
+    """
+    words = text.split()
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(" ".join(words[:middle])) <= token_budget:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low])
+
+
+def allocate_budget(needs, token_budget, min_share=MIN_SHARE_TOKENS):
+    """
+    Reparte un presupuesto de tokens entre varios textos
+
+    Cada texto recibe primero un mínimo (o lo que necesita, si es menos),
+    para que ninguno se quede vacío. El resto se reparte en proporción a
+    lo que a cada uno le falta; un texto nunca recibe más de lo que necesita.
+
+    Args:
+        needs: Tokens de cada texto completo
+        token_budget: Presupuesto total
+        min_share: Mínimo por texto (se reduce si no alcanza para todos)
+
+    Returns:
+        list: Tokens asignados a cada texto
+    """
+    if not needs:
+        return []
+
+    floor = min(min_share, token_budget // len(needs))
+    shares = [min(need, floor) for need in needs]
+
+    remaining = token_budget - sum(shares)
+    missing = [need - share for need, share in zip(needs, shares)]
+    total_missing = sum(missing)
+    if total_missing <= remaining:
+        return list(needs)
+
+    return [share + int(remaining * m / total_missing) for share, m in zip(shares, missing)]
+
+
+def fit_to_budget(text, queries, token_budget, count_tokens=estimate_tokens):
+    """
+    Reduce un texto a sus fragmentos más relevantes si excede el presupuesto
+
+    Args:
+        text: Texto de la transcripción (o de un punto de la agenda)
+        queries: Consultas de relevancia
+        token_budget: Máximo de tokens permitido
+        count_tokens: Función que cuenta tokens de un texto
+
+    Returns:
+        str: El texto original si cabe; si no, los fragmentos seleccionados
+             en orden cronológico, separados por GAP_MARKER donde hay saltos
+    """
+    if count_tokens(text) <= token_budget:
+        return text
+
+    passages = split_passages(text)
+    selected = select_passages(passages, queries, token_budget, count_tokens)
+
+    # Sin coincidencias léxicas: conservar el inicio dentro del presupuesto
+    if not selected:
+        used = 0
+        for idx, passage in enumerate(passages):
+            cost = count_tokens(passage)
+            if used + cost > token_budget:
+                # El fragmento que no cabe entero se recorta
+                truncated = truncate_to_budget(passage, token_budget - used, count_tokens)
+                if truncated:
+                    passages[idx] = truncated
+                    selected.append(idx)
+                break
+            used += cost
+            selected.append(idx)
+
+    parts = []
+    previous = None
+    for idx in selected:
+        if previous is not None and idx != previous + 1:
+            parts.append(GAP_MARKER)
+        parts.append(passages[idx])
+        previous = idx
+
+    return "\n".join(parts)
@@ -0,0 +1,287 @@
+"""
+Módulo para consultar los segmentos de la transcripción por intervalos de tiempo
+"""
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+
+
+# Palabras vacías en español que no aportan al emparejar agenda y transcripción
+STOPWORDS = {
+    "a", "al", "ante", "con", "de", "del", "el", "en", "entre", "es", "la", "las",
+    "lo", "los", "para", "por", "que", "se", "sin", "sobre", "su", "sus", "un",
+    "una", "uno", "unos", "unas", "y", "o", "u", "e", "le", "les", "como", "mas",
+    "pero", "este", "esta", "esto", "ese", "esa", "eso", "punto", "tema"
+}
+
+
+def normalize_text(text):
+    """
+    Normaliza texto para comparación: minúsculas y sin tildes
+
+    Args:
+        text: Texto original
+
+    Returns:
+        str: Texto normalizado
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    """
+    Divide un texto en palabras clave normalizadas (sin palabras vacías)
+
+    Args:
+        text: Texto original
+
+    Returns:
+        list: Palabras clave
+    """
+    words = re.findall(r"[a-z0-9ñ]+", normalize_text(text))
+    return [w for w in words if len(w) > 2 and w not in STOPWORDS]
+
+
+def parse_agenda(agenda_text):
+    """
+    Extrae los puntos de la agenda (una línea por punto, sin numeración)
+
+    Args:
+        agenda_text: Agenda tal como la escribe el usuario
+
+    Returns:
+        list: Puntos de la agenda
+    """
+    items = []
+    for line in (agenda_text or "").split("\n"):
+        line = re.sub(r"^\s*(\d+[.)-]?|[-•*])\s*", "", line).strip()
+        if line:
+            items.append(line)
+    return items
+
+
+class SegmentStore:
+    """
+    Segmentos de Whisper ordenados por inicio con índice de intervalos
+
+    Las consultas por rango usan búsqueda binaria sobre los inicios y sobre
+    el máximo acumulado de los finales, de modo que "qué se dijo entre
+    00:42 y 01:05" cuesta O(log n + k).
+    """
+
+    def __init__(self, segments):
+        self.segments = sorted(segments or [], key=lambda s: (s["start"], s["end"]))
+        self._starts = [s["start"] for s in self.segments]
+
+        # Máximo acumulado de los finales: no decreciente, permite bisect
+        self._max_ends = []
+        max_end = float("-inf")
+        for segment in self.segments:
+            max_end = max(max_end, segment["end"])
+            self._max_ends.append(max_end)
+
+    def __len__(self):
+        return len(self.segments)
+
+    @property
+    def duration(self):
+        """Duración cubierta por la transcripción en segundos"""
+        return self._max_ends[-1] if self._max_ends else 0.0
+
+    def query(self, start, end):
+        """
+        Segmentos que se solapan con el intervalo [start, end)
+
+        Args:
+            start: Inicio en segundos
+            end: Fin en segundos
+
+        Returns:
+            list: Segmentos en orden temporal
+        """
+        first = bisect_right(self._max_ends, start)
+        last = bisect_left(self._starts, end)
+        return [s for s in self.segments[first:last] if s["end"] > start]
+
+    def text_between(self, start, end):
+        """
+        Texto dicho entre dos instantes
+
+        Args:
+            start: Inicio en segundos
+            end: Fin en segundos
+
+        Returns:
+            str: Texto de los segmentos del intervalo
+        """
+        return " ".join(s["text"].strip() for s in self.query(start, end))
+
+    def find_time(self, text, start=0.0, end=None):
+        """
+        Instante en que mejor se menciona un texto (decisión, tarea, etc.)
+
+        Args:
+            text: Texto a ubicar
+            start: Inicio del rango de búsqueda en segundos
+            end: Fin del rango de búsqueda (default: toda la transcripción)
+
+        Returns:
+            float: Inicio del segmento más parecido, o None si no hay coincidencias
+        """
+        keywords = set(tokenize(text))
+        if not keywords:
+            return None
+
+        end = self.duration + 1 if end is None else end
+        best_time, best_score = None, 0
+        for segment in self.query(start, end):
+            score = len(keywords & set(tokenize(segment["text"])))
+            if score > best_score:
+                best_time, best_score = segment["start"], score
+
+        return best_time
+
+
+def detect_agenda_boundaries(store, agenda_items, window=3):
+    """
+    Detecta en qué momento de la grabación empieza cada punto de la agenda
+
+    Recorre los puntos en orden y, para cada uno, busca a partir del punto
+    anterior la primera ventana de segmentos cuyo vocabulario se parece lo
+    suficiente al del punto. Los puntos que no se detectan quedan sin rango.
+
+    Args:
+        store: SegmentStore de la transcripción
+        agenda_items: Puntos de la agenda (ver parse_agenda)
+        window: Número de segmentos consecutivos comparados con cada punto
+
+    Returns:
+        list: Diccionarios con item, start y end (None si no se detectó)
+    """
+    segments = store.segments
+    segment_words = [set(tokenize(s["text"])) for s in segments]
+
+    boundaries = []
+    position = 0
+    for item in agenda_items:
+        keywords = set(tokenize(item))
+        scores = []
+        for idx in range(position, len(segments)):
+            words = set().union(*segment_words[idx:idx + window])
+            scores.append(len(keywords & words))
+
+        best = max(scores) if scores else 0
+        if best == 0:
+            boundaries.append({"item": item, "start": None, "end": None})
+            continue
+
+        # Primera ventana con al menos la mitad del mejor puntaje
+        threshold = max(1, (best + 1) // 2)
+        offset = next(i for i, score in enumerate(scores) if score >= threshold)
+        position += offset
+
+        # Dentro de la ventana, el punto empieza en el primer segmento que coincide
+        while not keywords & segment_words[position]:
+            position += 1
+
+        boundaries.append({"item": item, "start": segments[position]["start"], "end": None})
+        position += 1
+
+    # Cada punto detectado termina donde empieza el siguiente detectado
+    detected = [b for b in boundaries if b["start"] is not None]
+    for current, following in zip(detected, detected[1:]):
+        current["end"] = following["start"]
+    if detected:
+        detected[-1]["end"] = store.duration
+
+    return boundaries
+
+
+def build_agenda_slices(segments, agenda_text):
+    """
+    Divide la transcripción en fragmentos de tiempo por punto de la agenda
+
+    Args:
+        segments: Segmentos de Whisper
+        agenda_text: Agenda de la reunión
+
+    Returns:
+        list: Diccionarios con item, start, end y text; una lista vacía si
+              no se pudo alinear ningún punto
+    """
+    store = SegmentStore(segments)
+    items = parse_agenda(agenda_text)
+    if not store or not items:
+        return []
+
+    boundaries = [b for b in detect_agenda_boundaries(store, items) if b["start"] is not None]
+    if not boundaries:
+        return []
+
+    slices = []
+
+    # Lo dicho antes del primer punto (apertura, verificación de quórum...)
+    if boundaries[0]["start"] > 0:
+        opening = store.text_between(0, boundaries[0]["start"])
+        if opening:
+            slices.append({"item": "Apertura", "start": 0.0,
+                           "end": boundaries[0]["start"], "text": opening})
+
+    for boundary in boundaries:
+        slices.append({
+            **boundary,
+            "text": store.text_between(boundary["start"], boundary["end"])
+        })
+
+    return slices
+
+
+def format_slice_header(agenda_slice):
+    """Encabezado legible de un fragmento: punto de agenda y rango de tiempo"""
+    start = format_timestamp(agenda_slice["start"])
+    end = format_timestamp(agenda_slice["end"])
+    return f"{agenda_slice['item']} [{start} - {end}]"
+
+
+def splice_segments(segments, start, end, replacement):
+    """
+    Reemplaza los segmentos de un tramo por otros (p. ej. re-transcritos)
+
+    Un segmento pertenece al tramo si su punto medio cae en [start, end).
+
+    Args:
+        segments: Segmentos ordenados por tiempo
+        start: Inicio del tramo en segundos
+        end: Fin del tramo en segundos
+        replacement: Segmentos nuevos del tramo
+
+    Returns:
+        list: Segmentos con el tramo reemplazado, ordenados por tiempo
+    """
+    def midpoint(segment):
+        return (segment["start"] + segment["end"]) / 2
+
+    before = [s for s in segments if midpoint(s) < start]
+    after = [s for s in segments if midpoint(s) >= end]
+    return before + sorted(replacement, key=lambda s: s["start"]) + after
+
+
+def format_timestamp(seconds):
+    """
+    Convierte segundos a formato HH:MM:SS
+    
+    Args:
+        seconds: Tiempo en segundos
+        
+    Returns:
+        str: Timestamp formateado
+    """
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    else:
+        return f"{minutes:02d}:{secs:02d}"
@@ -0,0 +1,94 @@
+"""
+Benchmark de construcción de tablas grandes del acta
+
+Compara la construcción fila por fila (table.add_row().cells + cell.text)
+con add_table_rows, que arma todas las filas en una sola pasada de XML,
+y verifica que el tiempo crezca linealmente con el número de filas.
+
+    python -m utils.table_benchmark
+    python -m utils.table_benchmark --rows 1000 5000 10000 --repeat 5
+"""
+import argparse
+import math
+import time
+
+from docx import Document
+
+from .document_gen import add_table_rows
+
+
+# Exponente de escala (tiempo ∝ filas^k) a partir del cual no se considera lineal
+LINEARITY_TOLERANCE = 1.2
+
+
+def sample_rows(n_rows):
+    """Filas de asistentes de prueba"""
+    return [(f"Dr. Asistente Número {i}", f"Cargo del asistente {i}") for i in range(n_rows)]
+
+
+def build_row_by_row(table, rows):
+    """Construcción clásica: una llamada a add_row() por fila"""
+    for nombre, cargo in rows:
+        cells = table.add_row().cells
+        cells[0].text = nombre
+        cells[1].text = cargo
+
+
+def build_bulk(table, rows):
+    """Construcción en bloque con add_table_rows"""
+    add_table_rows(table, rows)
+
+
+def measure(builder, rows, repeat):
+    """
+    Mejor tiempo (segundos) de repeat ejecuciones
+
+    Solo se mide la construcción de las filas; el documento y la fila de
+    encabezados se crean fuera de la medición.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        table = Document().add_table(rows=1, cols=2)
+        started = time.perf_counter()
+        builder(table, rows)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    """Ejecuta el benchmark e imprime tiempos y costo por fila"""
+    parser = argparse.ArgumentParser(description="Benchmark de tablas del acta")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 500, 1000, 2000, 5000],
+                        help="Tamaños de tabla a probar")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por tamaño")
+    parser.add_argument("--max-row-by-row", type=int, default=5000,
+                        help="Tamaño máximo para la construcción fila por fila (es lenta)")
+    args = parser.parse_args()
+
+    print(f"{'filas':>8} {'fila a fila':>14} {'en bloque':>12} {'µs/fila bloque':>16} {'aceleración':>12}")
+
+    sizes = sorted(args.rows)
+    bulk_times = []
+    for n_rows in sizes:
+        rows = sample_rows(n_rows)
+        bulk = measure(build_bulk, rows, args.repeat)
+        bulk_times.append(bulk)
+
+        if n_rows <= args.max_row_by_row:
+            classic = measure(build_row_by_row, rows, args.repeat)
+            classic_text = f"{classic * 1000:11.1f} ms"
+            speedup = f"{classic / bulk:11.1f}×"
+        else:
+            classic_text, speedup = f"{'-':>14}", f"{'-':>12}"
+
+        print(f"{n_rows:>8} {classic_text} {bulk * 1000:9.1f} ms {bulk / n_rows * 1e6:16.1f} {speedup}")
+
+    if len(sizes) > 1:
+        # Pendiente en escala log-log entre el menor y el mayor tamaño
+        exponent = math.log(bulk_times[-1] / bulk_times[0]) / math.log(sizes[-1] / sizes[0])
+        verdict = "lineal" if exponent <= LINEARITY_TOLERANCE else "NO lineal"
+        print(f"\nEscala en bloque: tiempo ∝ filas^{exponent:.2f} ({verdict})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,23 @@
 """
 Módulo para transcripción de audio usando Whisper
 """
+import importlib
 import whisper
 import torch
 import streamlit as st
 from pathlib import Path
 
+from .audio_io import load_audio_clip
+from .progress import install_whisper_progress_hook, set_whisper_progress
+from .segments import format_timestamp
+
+
+# Reportar el avance del bucle de decodificación (segundos de audio procesados)
+install_whisper_progress_hook(
+    importlib.import_module("whisper.transcribe"),
+    whisper.audio.FRAMES_PER_SECOND
+)
+
 
 @st.cache_resource
 def load_whisper_model(model_size="base"):
@@ -27,7 +39,7 @@ def load_whisper_model(model_size="base"):
         return None
 
 
-def transcribe_audio(audio_file_path, model_size="base", language="es"):
+def transcribe_audio(audio_file_path, model_size="base", language="es", progress_callback=None):
     """
     Transcribe un archivo de audio usando Whisper
     
@@ -35,6 +47,7 @@ def transcribe_audio(audio_file_path, model_size="base", language="es"):
         audio_file_path: Ruta al archivo de audio
         model_size: Tamaño del modelo Whisper
         language: Idioma del audio (default: español)
+        progress_callback: Función (segundos procesados, duración total) opcional
         
     Returns:
         dict: Diccionario con la transcripción y metadatos
@@ -46,11 +59,15 @@ def transcribe_audio(audio_file_path, model_size="base", language="es"):
             return None
         
         # Transcribir
-        result = model.transcribe(
-            str(audio_file_path),
-            language=language,
-            fp16=torch.cuda.is_available()
-        )
+        set_whisper_progress(progress_callback)
+        try:
+            result = model.transcribe(
+                str(audio_file_path),
+                language=language,
+                fp16=torch.cuda.is_available()
+            )
+        finally:
+            set_whisper_progress(None)
         
         return {
             "text": result["text"],
@@ -63,6 +80,66 @@ def transcribe_audio(audio_file_path, model_size="base", language="es"):
         return None
 
 
+def transcribe_audio_range(audio_file_path, start, end, model_size="base", language="es",
+                           progress_callback=None, **decode_options):
+    """
+    Transcribe solo un tramo del audio
+
+    Se decodifica únicamente el tramo pedido; los tiempos de los segmentos
+    devueltos son relativos al audio completo.
+
+    Args:
+        audio_file_path: Ruta al archivo de audio
+        start: Segundo de inicio del tramo
+        end: Segundo de fin del tramo
+        model_size: Tamaño del modelo Whisper
+        language: Idioma del audio (default: español)
+        progress_callback: Función (segundos procesados, duración del tramo) opcional
+        **decode_options: Opciones de decodificación de Whisper (temperature, beam_size, ...)
+
+    Returns:
+        dict: Diccionario con el texto y los segmentos del tramo
+    """
+    try:
+        model = load_whisper_model(model_size)
+        if model is None:
+            return None
+
+        clip = load_audio_clip(audio_file_path, end - start, start=start)
+
+        set_whisper_progress(progress_callback)
+        try:
+            result = model.transcribe(
+                clip,
+                language=language,
+                fp16=torch.cuda.is_available(),
+                **decode_options
+            )
+        finally:
+            set_whisper_progress(None)
+
+        segments = []
+        for segment in result.get("segments", []):
+            segment = {**segment, "start": segment["start"] + start, "end": segment["end"] + start}
+            if segment.get("words"):
+                segment["words"] = [
+                    {**word, "start": word["start"] + start, "end": word["end"] + start}
+                    for word in segment["words"]
+                ]
+            segments.append(segment)
+
+        return {
+            "text": result["text"],
+            "segments": segments,
+            "start": start,
+            "end": end
+        }
+
+    except Exception as e:
+        st.error(f"Error en transcripción del tramo {format_timestamp(start)}: {str(e)}")
+        return None
+
+
 def get_transcription_with_timestamps(segments):
     """
     Formatea la transcripción con timestamps
@@ -81,23 +158,3 @@ def get_transcription_with_timestamps(segments):
         formatted_text += f"[{start_time} - {end_time}] {text}\n"
     
     return formatted_text
-
-
-def format_timestamp(seconds):
-    """
-    Convierte segundos a formato HH:MM:SS
-    
-    Args:
-        seconds: Tiempo en segundos
-        
-    Returns:
-        str: Timestamp formateado
-    """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    
-    if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-    else:
-        return f"{minutes:02d}:{secs:02d}"
@@ -0,0 +1,490 @@
+"""
+Módulo de pool de procesos con réplicas de los modelos fijadas a núcleos de CPU
+
+Con ACTAS_WORKERS=N (N > 0) la app arranca N procesos, cada uno con su
+propia copia de Whisper/Phi, fijado a un subconjunto de núcleos y con un
+número de hilos de torch ajustado a ese subconjunto. Los trabajos esperan
+en una cola del proceso principal y se entregan, por un canal propio de
+cada réplica, a la primera réplica libre. Con ACTAS_WORKERS=0 (default) todo corre en el proceso de
+Streamlit como antes.
+
+Para encontrar el N con mejor rendimiento en una máquina:
+
+    python -m utils.workers --audio muestra.wav --model base
+"""
+import argparse
+import collections
+import itertools
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from multiprocessing.connection import wait
+import streamlit as st
+
+from .progress import throttled
+
+
+# Réplicas a arrancar (0 = sin pool, todo en el proceso de Streamlit)
+WORKERS = int(os.environ.get("ACTAS_WORKERS", "0"))
+
+# Hilos de torch por réplica (0 = uno por núcleo asignado)
+THREADS_PER_WORKER = int(os.environ.get("ACTAS_THREADS_PER_WORKER", "0"))
+
+# Muertes seguidas de una réplica sin llegar a empezar un trabajo (núcleos
+# inválidos, falta de memoria al arrancar...) tras las que se deja de reemplazarla
+MAX_STARTUP_FAILURES = 3
+
+
+def available_cores():
+    """Núcleos de CPU que este proceso puede usar"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_core_sets(n_replicas, cores=None):
+    """
+    Reparte los núcleos disponibles en conjuntos contiguos, uno por réplica
+
+    Args:
+        n_replicas: Número de réplicas
+        cores: Núcleos disponibles (default: afinidad del proceso actual)
+
+    Returns:
+        list: Lista de listas de núcleos; ninguna réplica queda sin núcleo
+    """
+    cores = cores if cores is not None else available_cores()
+    n_replicas = max(1, min(n_replicas, len(cores)))
+    size, extra = divmod(len(cores), n_replicas)
+
+    core_sets = []
+    position = 0
+    for i in range(n_replicas):
+        count = size + (1 if i < extra else 0)
+        core_sets.append(cores[position:position + count])
+        position += count
+    return core_sets
+
+
+def _run(kind, kwargs):
+    """Ejecuta un trabajo en el proceso actual"""
+    if kind == "transcribe":
+        from .transcription import transcribe_audio
+        return transcribe_audio(**kwargs)
+    if kind == "transcribe_range":
+        from .transcription import transcribe_audio_range
+        return transcribe_audio_range(**kwargs)
+    if kind == "analyze":
+        from .analysis import analyze_with_phi4
+        return analyze_with_phi4(**kwargs)
+    if kind == "calibrate_whisper":
+        from .calibration import measure_whisper_rtf
+        return measure_whisper_rtf(**kwargs)
+    if kind == "calibrate_llm":
+        from .calibration import measure_llm_speed
+        return measure_llm_speed(**kwargs)
+    raise ValueError(f"Tipo de trabajo desconocido: {kind}")
+
+
+def _worker_main(core_set, threads, conn):
+    """
+    Bucle de una réplica: fija núcleos e hilos y procesa trabajos de su canal
+
+    Args:
+        core_set: Núcleos asignados a esta réplica
+        threads: Hilos de torch para operaciones internas
+        conn: Canal con el proceso principal. Recibe trabajos (job_id, kind,
+              kwargs) y envía (job_id, ok, valor); ok=None indica inicio del
+              trabajo (valor None) o avance (done, total)
+    """
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, core_set)
+
+    import torch
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+
+        job_id, kind, kwargs = job
+        conn.send((job_id, None, None))
+
+        # El avance viaja por el mismo canal que el resultado (ok=None)
+        def report(done, total, job_id=job_id):
+            conn.send((job_id, None, (done, total)))
+        kwargs = {**kwargs, "progress_callback": throttled(report)}
+
+        try:
+            conn.send((job_id, True, _run(kind, kwargs)))
+        except Exception as e:
+            conn.send((job_id, False, f"{type(e).__name__}: {e}"))
+
+
+class WorkerPool:
+    """
+    Pool de réplicas de los modelos, cada una fijada a su conjunto de núcleos
+
+    Cada réplica tiene su propio canal (Pipe) con el proceso principal, así
+    que una réplica que muere (falta de memoria, fallo del proceso) no deja
+    bloqueado a nadie más: el despachador lo detecta, hace fallar el trabajo
+    que estaba ejecutando y arranca otra réplica con los mismos núcleos. Una
+    réplica que muere MAX_STARTUP_FAILURES veces seguidas sin empezar ningún
+    trabajo se retira en lugar de reemplazarse sin fin.
+    """
+
+    def __init__(self, n_replicas, threads_per_worker=0, cores=None):
+        self._ctx = mp.get_context("spawn")
+        self.core_sets = plan_core_sets(n_replicas, cores)
+        self.threads_per_worker = threads_per_worker
+        self._pending = collections.deque()
+        self._futures = {}
+        self._progress = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._stopping = False
+
+        self._replicas = [self._start_replica(core_set) for core_set in self.core_sets]
+
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def _start_replica(self, core_set, failures=0):
+        """
+        Arranca un proceso de réplica fijado a core_set
+
+        Args:
+            core_set: Núcleos de la réplica
+            failures: Muertes seguidas sin empezar un trabajo de las réplicas
+                      anteriores en estos núcleos
+        """
+        conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(core_set, self.threads_per_worker or len(core_set), child_conn),
+            daemon=True
+        )
+        process.start()
+        # Solo el hijo conserva su extremo: si muere, el canal da EOF
+        child_conn.close()
+        return {
+            "process": process, "conn": conn, "core_set": core_set,
+            "job": None, "started": False, "failures": failures
+        }
+
+    @property
+    def size(self):
+        """Número de réplicas activas"""
+        return len(self._replicas)
+
+    @property
+    def processes(self):
+        """Procesos de las réplicas"""
+        return [replica["process"] for replica in self._replicas]
+
+    def submit(self, kind, **kwargs):
+        """
+        Encola un trabajo para la primera réplica libre
+
+        Args:
+            kind: "transcribe", "transcribe_range", "analyze" o "calibrate_whisper"/"calibrate_llm"
+            **kwargs: Argumentos de la función del trabajo
+
+        Returns:
+            Future: Resultado del trabajo
+        """
+        future = Future()
+        with self._lock:
+            job_id = next(self._ids)
+            self._futures[job_id] = future
+            self._pending.append((job_id, kind, kwargs))
+            if self._replicas:
+                self._assign()
+            else:
+                self._fail_pending("No queda ninguna réplica del pool en funcionamiento")
+        future.job_id = job_id
+        return future
+
+    def progress(self, future):
+        """
+        Último avance reportado por un trabajo en curso
+
+        Args:
+            future: Future devuelto por submit
+
+        Returns:
+            tuple: (done, total), o None si aún no hay reporte
+        """
+        return self._progress.get(future.job_id)
+
+    def _assign(self):
+        """Entrega trabajos pendientes a las réplicas libres (con el lock tomado)"""
+        for replica in self._replicas:
+            if not self._pending:
+                return
+            if replica["job"] is not None:
+                continue
+            job = self._pending.popleft()
+            replica["job"], replica["started"] = job, False
+            try:
+                replica["conn"].send(job)
+            except OSError:
+                # Réplica caída: el trabajo vuelve a la cola y check_replicas la reemplaza
+                replica["job"] = None
+                self._pending.appendleft(job)
+
+    def _finish(self, job_id, ok, value):
+        """Completa el Future de un trabajo (con el lock tomado)"""
+        future = self._futures.pop(job_id, None)
+        self._progress.pop(job_id, None)
+        if future is None:
+            return
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(RuntimeError(value))
+
+    def _fail_pending(self, message):
+        """Hace fallar todos los trabajos en cola (con el lock tomado)"""
+        while self._pending:
+            self._finish(self._pending.popleft()[0], False, message)
+
+    def _replace(self, replica):
+        """
+        Reemplaza una réplica caída (con el lock tomado)
+
+        Si ya había empezado su trabajo, éste falla (repetirlo podría volver
+        a tumbar la réplica); si no, vuelve al principio de la cola. Tras
+        MAX_STARTUP_FAILURES muertes seguidas sin empezar ningún trabajo la
+        réplica se retira y su trabajo falla; sin réplicas, fallan todos.
+        """
+        index = next((i for i, r in enumerate(self._replicas) if r is replica), None)
+        if index is None or self._stopping:
+            return
+
+        process = replica["process"]
+        process.join(timeout=5)
+        failures = 0 if replica["started"] else replica["failures"] + 1
+
+        if failures >= MAX_STARTUP_FAILURES:
+            del self._replicas[index]
+            message = (
+                f"La réplica de los núcleos {replica['core_set']} no logra arrancar "
+                f"({failures} intentos, código {process.exitcode})"
+            )
+            if replica["job"] is not None:
+                self._finish(replica["job"][0], False, message)
+            if not self._replicas:
+                self._fail_pending(message)
+            self._assign()
+            return
+
+        if replica["job"] is not None:
+            job_id = replica["job"][0]
+            if replica["started"]:
+                self._finish(
+                    job_id, False,
+                    f"La réplica {index} terminó inesperadamente (código {process.exitcode})"
+                )
+            else:
+                self._pending.appendleft(replica["job"])
+
+        self._replicas[index] = self._start_replica(replica["core_set"], failures)
+        self._assign()
+
+    def check_replicas(self):
+        """
+        Reemplaza las réplicas cuyo proceso ya no está vivo
+
+        Sin esto, el Future de un trabajo cuya réplica murió nunca se
+        completaría y la sesión que lo espera quedaría colgada.
+        """
+        with self._lock:
+            for replica in list(self._replicas):
+                if not replica["process"].is_alive():
+                    self._replace(replica)
+
+    def _dispatch(self):
+        """Recibe avances y resultados de las réplicas y los entrega a sus Future"""
+        while not self._stopping:
+            replicas = list(self._replicas)
+            ready = wait([replica["conn"] for replica in replicas], timeout=1.0)
+            if not ready:
+                self.check_replicas()
+                continue
+
+            for replica in replicas:
+                if replica["conn"] not in ready:
+                    continue
+                try:
+                    job_id, ok, value = replica["conn"].recv()
+                except (EOFError, OSError):
+                    with self._lock:
+                        self._replace(replica)
+                    continue
+
+                with self._lock:
+                    if ok is None and value is None:
+                        replica["started"], replica["failures"] = True, 0
+                    elif ok is None:
+                        self._progress[job_id] = value
+                    else:
+                        replica["job"] = None
+                        self._finish(job_id, ok, value)
+                        self._assign()
+
+    def shutdown(self):
+        """Detiene las réplicas y el despachador"""
+        with self._lock:
+            self._stopping = True
+            for replica in self._replicas:
+                try:
+                    replica["conn"].send(None)
+                except OSError:
+                    pass
+        for replica in self._replicas:
+            replica["process"].join(timeout=30)
+        self._dispatcher.join(timeout=5)
+
+
+@st.cache_resource
+def get_worker_pool():
+    """
+    Pool compartido por todas las sesiones de la app
+
+    Returns:
+        WorkerPool: Pool, o None si ACTAS_WORKERS=0
+    """
+    if WORKERS <= 0:
+        return None
+    return WorkerPool(WORKERS, THREADS_PER_WORKER)
+
+
+def run_job(kind, progress_callback=None, **kwargs):
+    """
+    Ejecuta un trabajo en el pool si está activo, o en este proceso si no
+
+    El callback de progreso siempre se invoca desde el hilo que llama a
+    run_job (el de la sesión de Streamlit), también cuando el trabajo corre
+    en una réplica del pool.
+
+    Args:
+        kind: "transcribe", "transcribe_range", "analyze", "calibrate_whisper" o "calibrate_llm"
+        progress_callback: Función (done, total) opcional
+        **kwargs: Argumentos del trabajo
+
+    Returns:
+        Resultado de transcribe_audio o analyze_with_phi4
+    """
+    pool = get_worker_pool()
+    if pool is None:
+        if progress_callback:
+            kwargs["progress_callback"] = progress_callback
+        return _run(kind, kwargs)
+
+    future = pool.submit(kind, **kwargs)
+    while True:
+        try:
+            return future.result(timeout=0.5)
+        except FutureTimeout:
+            pool.check_replicas()
+            progress = pool.progress(future)
+            if progress_callback and progress:
+                progress_callback(*progress)
+
+
+def measure_throughput(n_replicas, kind, kwargs, jobs_per_replica=2, threads_per_worker=0):
+    """
+    Mide trabajos por hora con n réplicas
+
+    Cada réplica procesa primero un trabajo de calentamiento (carga del
+    modelo) que no se cuenta en la medición.
+
+    Args:
+        n_replicas: Número de réplicas
+        kind: "transcribe" o "analyze"
+        kwargs: Argumentos del trabajo de prueba
+        jobs_per_replica: Trabajos medidos por réplica
+        threads_per_worker: Hilos por réplica (0 = uno por núcleo)
+
+    Returns:
+        float: Trabajos por hora
+    """
+    pool = WorkerPool(n_replicas, threads_per_worker)
+    try:
+        warmup = [pool.submit(kind, **kwargs) for _ in range(pool.size)]
+        for future in warmup:
+            future.result()
+
+        total = pool.size * jobs_per_replica
+        started = time.perf_counter()
+        futures = [pool.submit(kind, **kwargs) for _ in range(total)]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - started
+
+        return total * 3600 / elapsed
+    finally:
+        pool.shutdown()
+
+
+def find_optimal_replicas(kind, kwargs, candidates=None, jobs_per_replica=2):
+    """
+    Prueba distintos números de réplicas y devuelve el de mayor rendimiento
+
+    Args:
+        kind: "transcribe" o "analyze"
+        kwargs: Argumentos del trabajo de prueba
+        candidates: Números de réplicas a probar (default: 1, 2, 4, ... ≤ núcleos)
+        jobs_per_replica: Trabajos medidos por réplica
+
+    Returns:
+        tuple: (mejor N, {N: trabajos por hora})
+    """
+    n_cores = len(available_cores())
+    if candidates is None:
+        candidates = [2 ** i for i in range(n_cores.bit_length()) if 2 ** i <= n_cores]
+
+    results = {}
+    for n in candidates:
+        results[n] = measure_throughput(n, kind, kwargs, jobs_per_replica)
+        print(f"  {n:>3} réplicas × {n_cores // n:>3} núcleos: {results[n]:8.1f} trabajos/hora")
+
+    best = max(results, key=results.get)
+    return best, results
+
+
+def main():
+    """Herramienta de dimensionamiento del pool de réplicas"""
+    parser = argparse.ArgumentParser(
+        description="Encuentra el número de réplicas con mejor rendimiento en esta máquina"
+    )
+    parser.add_argument("--audio", help="Audio de prueba para medir transcripción")
+    parser.add_argument("--model", default="base", help="Modelo Whisper (default: base)")
+    parser.add_argument("--text", help="Archivo de texto para medir análisis en lugar de transcripción")
+    parser.add_argument("--replicas", type=int, nargs="*", help="Números de réplicas a probar")
+    parser.add_argument("--jobs", type=int, default=2, help="Trabajos medidos por réplica")
+    args = parser.parse_args()
+
+    if args.text:
+        with open(args.text, "r", encoding="utf-8") as f:
+            kind, kwargs = "analyze", {"transcription": f.read()}
+    elif args.audio:
+        kind, kwargs = "transcribe", {"audio_file_path": args.audio, "model_size": args.model}
+    else:
+        parser.error("Indica --audio o --text")
+
+    print(f"Núcleos disponibles: {len(available_cores())}")
+    best, _ = find_optimal_replicas(kind, kwargs, args.replicas, args.jobs)
+    print(f"\nRecomendado: ACTAS_WORKERS={best}")
+
+
+if __name__ == "__main__":
+    main()